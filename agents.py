@@ -0,0 +1,135 @@
+# the players of the games behind one interface: the game loop sends a move request to the agent of the
+# current turn, and the agent answers it by calling the request's answer function with the move,
+# right away (human, computer) or later (batching, remote), so new strategies and transports need no change
+# in the games' I/O functions or loops
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+class Agent(ABC):
+    """
+    a player: receives move requests and answers every request by calling its answer function with the move
+    """
+    is_human = False
+
+    @abstractmethod
+    def request_move(self, game: dict[str, any], answer) -> None:
+        """
+        :param game: dictionary of the played game, it's the agent's turn
+        :param answer: function of one argument, the move, called once when the move is selected
+        """
+
+    def flush(self) -> None:
+        """
+        answer the pending requests, called when the game loop has no move to apply
+        """
+
+
+class HumanAgent(Agent):
+    """
+    a human at the console, the move is read by the game's input function
+    """
+    is_human = True
+
+    def __init__(self, input_location):
+        """
+        :param input_location: the game's input function of one argument, the game, e.g. tic_tac_toe.input_square
+        """
+        self.input_location = input_location
+
+    def request_move(self, game: dict[str, any], answer) -> None:
+        answer(self.input_location(game))
+
+
+class ComputerAgent(Agent):
+    """
+    a computer player, answers every request right away
+    """
+
+    def __init__(self, select_location):
+        """
+        :param select_location: the strategy's function of one argument, the game, e.g. memory.get_computer_location
+        or functools.partial(tic_tac_toe.get_computer_location, strategy='ai')
+        """
+        self.select_location = select_location
+
+    def request_move(self, game: dict[str, any], answer) -> None:
+        answer(self.select_location(game))
+
+
+class BatchingAgent(Agent):
+    """
+    a computer player of many games: collects the requests and selects all their moves together on flush,
+    on an executor (e.g. a process pool) if given, so the searches scale apart from the games' loop
+    """
+
+    def __init__(self, select_location, executor=None, batch_size: int = None):
+        """
+        :param select_location: the strategy's function, see ComputerAgent, picklable for a process pool
+        (a module's function or a partial of it)
+        :param executor: a concurrent.futures executor that selects the moves in parallel,
+        None - one after the other in this thread. in a process pool the search runs on a copy of the game,
+        so the game's generator isn't advanced and the search tree isn't kept for the next move
+        :param batch_size: number of pending requests that triggers a flush, None - only the game loop flushes
+        """
+        self.select_location = select_location
+        self.executor = executor
+        self.batch_size = batch_size
+        self.pending: list[tuple[dict[str, any], any]] = []
+
+    def request_move(self, game: dict[str, any], answer) -> None:
+        self.pending.append((game, answer))
+        if self.batch_size is not None and len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        games = [game for game, _ in pending]
+        if self.executor is None:
+            locations = map(self.select_location, games)
+        else:
+            locations = self.executor.map(self.select_location, games)
+        for (_, answer), location in zip(pending, locations):
+            answer(location)
+
+
+class RemoteAgent(Agent):
+    """
+    a player behind a transport, e.g. a network connection: the requests wait till their moves are submitted
+    """
+
+    def __init__(self):
+        # the waiting requests' answer functions, by the game's id
+        self.waiting: dict[int, any] = {}
+        # the requests not sent to the transport yet, as (game's id, game)
+        self.requests: deque = deque()
+
+    def request_move(self, game: dict[str, any], answer) -> None:
+        self.waiting[id(game)] = answer
+        self.requests.append((id(game), game))
+
+    def submit(self, game_id: int, location: tuple[int, int] | list[int]) -> None:
+        """
+        answer a waiting request with the move received from the transport
+        :param game_id: the id of the request's game
+        :param location: the received move
+        :raise KeyError: if there is no waiting request of the game
+        """
+        self.waiting.pop(game_id)(location)
+
+
+def get_move(agent: Agent, game: dict[str, any]) -> tuple[int, int] | list[int] | str | None:
+    """
+    request a move and wait for it, for the interactive loops that play one game
+    :param agent: the agent of the current turn
+    :param game: dictionary of the played game
+    :return: the agent's move, None if the agent has no answer yet, e.g. a RemoteAgent whose move wasn't submitted,
+    the request is still waiting then
+    """
+    moves = []
+    agent.request_move(game, moves.append)
+    if not moves:
+        agent.flush()
+    return moves[0] if moves else None
@@ -0,0 +1,118 @@
+import numpy as np
+
+# boards up to this number of cells check wins in a table of all the cells' masks (2 ** cells entries)
+WIN_TABLE_MAX_CELLS = 16
+
+def build_lines(n: int) -> np.ndarray:
+    """
+    build the winning lines of a nxn board: every row, every column and both diagonals
+    :param n: diameter for the game's size nxn
+    :return: an int8 array in shape (cells, lines), 1 if the cell is on the line
+    """
+    lines = np.zeros((n * n, 2 * n + 2), dtype=np.int8)
+    for i in range(n):
+        lines[i * n:(i + 1) * n, i] = 1
+        lines[i::n, n + i] = 1
+        lines[i * n + i, 2 * n] = 1
+        lines[i * n + n - 1 - i, 2 * n + 1] = 1
+    return lines
+
+
+def build_win_table(n: int) -> np.ndarray:
+    """
+    :param n: diameter for the game's size nxn
+    :return: a bool array of 2 ** (n * n) entries, True if the mask of the player's cells holds a full line
+    """
+    cells = n * n
+    masks = np.arange(1 << cells, dtype=np.int64)
+    table = np.zeros(1 << cells, dtype=bool)
+    for line in build_lines(n).T:
+        line_mask = int((line.astype(np.int64) << np.arange(cells)).sum())
+        table |= masks & line_mask == line_mask
+    return table
+
+
+def play_tic_tac_toe_batch(games: int, n: int, rng: np.random.Generator) -> dict[str, any]:
+    """
+    play random VS random tic-tac-toe games together, every step plays one move on all the boards that are not over
+    :param games: number of boards to play
+    :param n: diameter for the game's size nxn
+    :param rng: numpy random generator
+    :return: the games' results, in the same format as simulate.run_games
+    """
+    cells = n * n
+    # a random order of all the cells of every board, so every step plays a uniform random legal move
+    boards = rng.permuted(np.tile(np.arange(cells, dtype=np.intp), (games, 1)), axis=1)
+    is_active = np.ones(games, dtype=bool)
+    wins = {'X': 0, 'O': 0}
+    moves = 0
+    if cells <= WIN_TABLE_MAX_CELLS:
+        win_table = build_win_table(n)
+        # the mask of the cells every player owns on every board
+        masks = np.zeros((2, games), dtype=np.int32)
+        bits = (1 << np.arange(cells)).astype(np.int32)
+    else:
+        lines = build_lines(n)
+        # the number of cells every player owns on every line of every board
+        counts = np.zeros((2, games, lines.shape[1]), dtype=np.int16)
+    for step in range(cells):
+        if cells <= WIN_TABLE_MAX_CELLS:
+            player_masks = masks[step % 2]
+            player_masks |= bits[boards[:, step]]
+            is_win = win_table[player_masks] & is_active
+        else:
+            player_counts = counts[step % 2]
+            player_counts += lines[boards[:, step]] * is_active[:, None]
+            is_win = (player_counts == n).any(axis=1) & is_active
+        moves += int(is_active.sum())
+        wins['XO'[step % 2]] += int(is_win.sum())
+        is_active &= ~is_win
+        if not is_active.any():
+            break
+    ties = int(is_active.sum())
+    return {'games': games, 'wins': wins, 'ties': ties, 'moves': moves}
+
+
+def play_memory_batch(games: int, pairs: int, players: int, rng: np.random.Generator) -> dict[str, any]:
+    """
+    play random memory games together, every step plays one turn (flipping 2 cards) on all the boards that are not over
+    :param games: number of boards to play
+    :param pairs: number of pairs of cards on every board
+    :param players: number of players in every game
+    :param rng: numpy random generator
+    :return: the games' results, in the same format as simulate.run_games
+    """
+    # the ids of the cards which are not matched yet, in the first 2 * left[board] columns of every board,
+    # the positions of the cards don't matter to random players, so a matched pair is removed by swapping in the last cards
+    cards = rng.permuted(np.tile(np.repeat(np.arange(pairs, dtype=np.int32), 2), (games, 1)), axis=1)
+    scores = np.zeros((games, players), dtype=np.int32)
+    turns = np.zeros(games, dtype=np.int32)
+    left = np.full(games, pairs, dtype=np.int32)
+    active = np.arange(games)
+    moves = 0
+    while active.size:
+        remaining = 2 * left[active]
+        first = (rng.random(active.size) * remaining).astype(np.intp)
+        second = (rng.random(active.size) * (remaining - 1)).astype(np.intp)
+        second += second >= first
+        moves += 2 * active.size
+        is_match = cards[active, first] == cards[active, second]
+
+        boards = active[is_match]
+        low = np.minimum(first, second)[is_match]
+        high = np.maximum(first, second)[is_match]
+        last = remaining[is_match] - 1
+        cards[boards, high] = cards[boards, last]
+        cards[boards, low] = cards[boards, last - 1]
+        scores[boards, turns[boards]] += 1
+        left[boards] -= 1
+
+        missed_boards = active[~is_match]
+        turns[missed_boards] = (turns[missed_boards] + 1) % players
+        active = active[left[active] > 0]
+
+    best = scores.max(axis=1)
+    is_tie = (scores == best[:, None]).sum(axis=1) > 1
+    winners = np.bincount(scores[~is_tie].argmax(axis=1), minlength=players)
+    wins = {str(player + 1): int(count) for player, count in enumerate(winners) if count}
+    return {'games': games, 'wins': wins, 'ties': int(is_tie.sum()), 'moves': moves}
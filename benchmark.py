@@ -0,0 +1,320 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from time import perf_counter
+
+import engine
+import memory
+import tic_tac_toe
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+DEFAULT_SIZES = (3, 5, 11, 25, 51, 101)
+DEFAULT_THRESHOLD = 0.25
+MIN_TIME = 0.05
+REPEAT = 3
+SEED = 2024
+
+
+def record_game(game_type: str, size: int) -> list[tuple[int, int]]:
+    """
+    :param game_type: engine.TIC_TAC_TOE or engine.MEMORY
+    :param size: tic-tac-toe - the board's diameter, memory - the number of pairs of cards
+    :return: the moves of a seeded random game, the same in every run
+    """
+    game = engine.create_game(game_type, size, ('random', 'random'), record=True, rng=SEED)
+    engine.play_game(game)
+    return [location for _, location in game['history']]
+
+
+def new_tic_tac_toe_game(n: int) -> dict[str, any]:
+    """
+    :param n: the board's diameter
+    :return: a headless tic-tac-toe game of the benchmarks' seed
+    """
+    return engine.create_game(engine.TIC_TAC_TOE, n, (engine.HUMAN, engine.HUMAN), rng=SEED)
+
+
+def new_memory_game(pairs: int) -> dict[str, any]:
+    """
+    :param pairs: the number of pairs of cards
+    :return: a headless memory game of the benchmarks' seed
+    """
+    return engine.create_game(engine.MEMORY, pairs, (engine.HUMAN, engine.HUMAN), rng=SEED)
+
+
+def played_tic_tac_toe_game(n: int) -> dict[str, any]:
+    """
+    :param n: the board's diameter
+    :return: a game with all the moves of the recorded game but the last, so no line is full
+    """
+    game = new_tic_tac_toe_game(n)
+    for location in record_game(engine.TIC_TAC_TOE, n)[:-1]:
+        engine.apply_move(game, location)
+    return game
+
+
+def bench_tic_tac_toe_init_game(n: int):
+    return lambda: tic_tac_toe.init_game(n, {}, False, SEED)
+
+
+def bench_tic_tac_toe_possible_moves(n: int):
+    return lambda: tic_tac_toe.possible_moves(n)
+
+
+def bench_tic_tac_toe_init_board(n: int):
+    return lambda: tic_tac_toe.init_board(n)
+
+
+def bench_tic_tac_toe_check_win(n: int):
+    game = played_tic_tac_toe_game(n)
+    return lambda: tic_tac_toe.check_win(game)
+
+
+def bench_tic_tac_toe_check_win_rows(n: int):
+    game = played_tic_tac_toe_game(n)
+    return lambda: tic_tac_toe.check_win_rows(game)
+
+
+def bench_tic_tac_toe_check_win_columns(n: int):
+    game = played_tic_tac_toe_game(n)
+    return lambda: tic_tac_toe.check_win_columns(game)
+
+
+def bench_tic_tac_toe_check_win_diagonals(n: int):
+    game = played_tic_tac_toe_game(n)
+    return lambda: tic_tac_toe.check_win_diagonals(game)
+
+
+def bench_tic_tac_toe_get_random_location(n: int):
+    game = new_tic_tac_toe_game(n)
+    return lambda: tic_tac_toe.get_random_location(game)
+
+
+def bench_tic_tac_toe_scripted_game(n: int):
+    moves = record_game(engine.TIC_TAC_TOE, n)
+
+    def play():
+        game = new_tic_tac_toe_game(n)
+        for location in moves:
+            engine.apply_move(game, location)
+    return play
+
+
+def bench_memory_init_game(pairs: int):
+    labels = memory.generate_labels(pairs)
+    rows_dimension, cols_dimension = memory.get_board_layout(pairs)
+    return lambda: memory.init_game({}, False, labels, rows_dimension, cols_dimension, SEED)
+
+
+def bench_memory_possible_moves(pairs: int):
+    rows_dimension, cols_dimension = memory.get_board_layout(pairs)
+    return lambda: memory.possible_moves(rows_dimension, cols_dimension)
+
+
+def bench_memory_init_board(pairs: int):
+    labels = memory.generate_labels(pairs)
+    cards = memory.init_cards(labels, SEED)
+    return lambda: memory.init_board(cards, labels)
+
+
+def bench_memory_get_random_location(pairs: int):
+    game = new_memory_game(pairs)
+    return lambda: memory.get_random_location(game)
+
+
+def bench_memory_turn(pairs: int):
+    """
+    a turn without a match: flip 2 cards, compare them and flip them back
+    """
+    game = new_memory_game(pairs)
+    ids = game['board']['ids']
+    first = (0, 0)
+    second = next(location for location in game['moves']
+                  if ids[memory.card_index(game, location)] != ids[memory.card_index(game, first)])
+
+    def play():
+        memory.flip_card(game, first)
+        memory.flip_card(game, second)
+        memory.check_match(game, first, second)
+        memory.flip_card(game, first)
+        memory.flip_card(game, second)
+    return play
+
+
+def bench_memory_set_match(pairs: int):
+    game = new_memory_game(pairs)
+    ids = game['board']['ids']
+    first = (0, 0)
+    second = next(location for location in game['moves'] if location != first and
+                  ids[memory.card_index(game, location)] == ids[memory.card_index(game, first)])
+    is_matched, player = game['board']['is_matched'], game['players'][game['turn']]
+
+    def unmatch():
+        # the pair is available again before every timed call, else set_match has nothing to match
+        is_matched[memory.card_index(game, first)] = is_matched[memory.card_index(game, second)] = False
+        player['score'] = 0
+        game['moves'].add(first)
+        game['moves'].add(second)
+    return lambda: memory.set_match(game, first, second), unmatch
+
+
+def bench_memory_scripted_game(pairs: int):
+    moves = record_game(engine.MEMORY, pairs)
+
+    def play():
+        game = new_memory_game(pairs)
+        for location in moves:
+            engine.apply_move(game, location)
+    return play
+
+
+# every benchmark creates its state for the size, and returns the timed function,
+# or a tuple of the timed function and a reset function, called before every call outside the timed region
+BENCHMARKS = {
+    'tic_tac_toe.init_game': bench_tic_tac_toe_init_game,
+    'tic_tac_toe.possible_moves': bench_tic_tac_toe_possible_moves,
+    'tic_tac_toe.init_board': bench_tic_tac_toe_init_board,
+    'tic_tac_toe.check_win': bench_tic_tac_toe_check_win,
+    'tic_tac_toe.check_win_rows': bench_tic_tac_toe_check_win_rows,
+    'tic_tac_toe.check_win_columns': bench_tic_tac_toe_check_win_columns,
+    'tic_tac_toe.check_win_diagonals': bench_tic_tac_toe_check_win_diagonals,
+    'tic_tac_toe.get_random_location': bench_tic_tac_toe_get_random_location,
+    'tic_tac_toe.scripted_game': bench_tic_tac_toe_scripted_game,
+    'memory.init_game': bench_memory_init_game,
+    'memory.possible_moves': bench_memory_possible_moves,
+    'memory.init_board': bench_memory_init_board,
+    'memory.get_random_location': bench_memory_get_random_location,
+    'memory.flip_card+check_match': bench_memory_turn,
+    'memory.set_match': bench_memory_set_match,
+    'memory.scripted_game': bench_memory_scripted_game,
+}
+
+
+def split_benchmark(timed) -> tuple[any, any]:
+    """
+    :param timed: a benchmark's result, the timed function or a tuple of the timed function and its reset function
+    :return: a tuple of the timed function and the reset function, None if the function needs no reset
+    """
+    return timed if isinstance(timed, tuple) else (timed, None)
+
+
+def measure(function, min_time: float = MIN_TIME, repeat: int = REPEAT, reset=None) -> float:
+    """
+    :param function: the timed function, without arguments
+    :param min_time: the minimum duration of every timing
+    :param repeat: number of timings
+    :param reset: function called before every call of the timed function, it's not timed,
+    the calls are timed one by one then
+    :return: the best time of one call, in seconds
+    """
+    if reset is not None:
+        timings = []
+        for _ in range(repeat):
+            total, calls = 0.0, 0
+            while total < min_time:
+                reset()
+                start = perf_counter()
+                function()
+                total += perf_counter() - start
+                calls += 1
+            timings.append(total / calls)
+        return min(timings)
+    timer = timeit.Timer(function)
+    number, seconds = timer.autorange()
+    number = max(1, int(number * min_time / max(seconds, 1e-9)))
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run_benchmarks(sizes: tuple[int, ...], pattern: str = '') -> dict[str, float]:
+    """
+    :param sizes: the boards' sizes: tic-tac-toe - the diameter, memory - the number of pairs
+    :param pattern: run only the benchmarks with this text in their name
+    :return: the time of one call of every benchmark, by 'name[size]'
+    """
+    results = {}
+    for name, benchmark in BENCHMARKS.items():
+        if pattern not in name:
+            continue
+        for size in sizes:
+            key = f"{name}[{size}]"
+            function, reset = split_benchmark(benchmark(size))
+            results[key] = measure(function, reset=reset)
+            print(f"{key:45} {format_time(results[key]):>12}", flush=True)
+    return results
+
+
+def format_time(seconds: float) -> str:
+    """
+    :param seconds: a duration
+    :return: the duration in the best unit
+    """
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """
+    :param results: the current times
+    :param baseline: the baseline times
+    :param threshold: the allowed slowdown, 0.25 - 25% slower than the baseline
+    :return: the names of the benchmarks which are slower than the allowed slowdown
+    """
+    regressions = []
+    for key, seconds in results.items():
+        if key not in baseline:
+            continue
+        change = seconds / baseline[key] - 1
+        if change > threshold:
+            regressions.append(key)
+            print(f"REGRESSION {key}: {format_time(baseline[key])} -> {format_time(seconds)} ({change:+.0%})")
+    return regressions
+
+
+def parse_arguments(arguments: list[str] = None) -> argparse.Namespace:
+    """
+    :param arguments: the command line arguments, sys.argv by default
+    :return: the parsed benchmark options
+    """
+    parser = argparse.ArgumentParser(description="time the hot paths of both games across board sizes")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma separated sizes: tic-tac-toe - the diameter, memory - the number of pairs")
+    parser.add_argument('--filter', default='', help="run only the benchmarks with this text in their name")
+    parser.add_argument('--save', nargs='?', const=BASELINE_PATH, default=None,
+                        help="save the results as the baseline JSON")
+    parser.add_argument('--compare', nargs='?', const=BASELINE_PATH, default=None,
+                        help="compare with the baseline JSON, and fail on a regression")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="the allowed slowdown before failing, 0.25 - 25%%")
+    return parser.parse_args(arguments)
+
+
+def main(arguments: list[str] = None) -> None:
+    """
+    run the benchmarks from the command line, exit with status 1 on a regression
+    :param arguments: the command line arguments, sys.argv by default
+    """
+    options = parse_arguments(arguments)
+    sizes = tuple(int(size) for size in options.sizes.split(','))
+    results = run_benchmarks(sizes, options.filter)
+    if options.save:
+        with open(options.save, 'w') as baseline_file:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results},
+                      baseline_file, indent=2)
+        print(f"baseline saved: {options.save}")
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, options.threshold)
+        if regressions:
+            print(f"{len(regressions)} regressions over {options.threshold:.0%}")
+            sys.exit(1)
+        print(f"no regressions over {options.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
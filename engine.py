@@ -0,0 +1,291 @@
+from collections import deque
+from functools import partial
+from random import Random
+
+import agents
+import memory
+import memory_ai
+import renderer
+import tic_tac_toe
+
+TIC_TAC_TOE = tic_tac_toe.GAME_TYPE
+MEMORY = memory.GAME_TYPE
+GAME_TYPES = (TIC_TAC_TOE, MEMORY)
+PLAYING, WIN, TIE = 'playing', 'win', 'tie'
+# the status of a game stopped by an illegal move of a player's agent, the winner is the other player
+FORFEIT = 'forfeit'
+# a human player's moves are applied by the caller, the engine never selects them
+HUMAN = 'human'
+STRATEGIES = {TIC_TAC_TOE: (HUMAN, 'random', 'ai', 'mcts'), MEMORY: (HUMAN, 'random') + tuple(memory_ai.COMPUTER_LEVELS)}
+
+
+def create_game(game_type: str, size: int = 3, strategies: tuple[str, ...] = ('random', 'random'),
+                record: bool = False, rng: Random | int = None, cols_dimension: int = None,
+                k: int = None) -> dict[str, any]:
+    """
+    create a new game without any input/output, the players are computers unless their strategy is HUMAN
+    :param game_type: TIC_TAC_TOE or MEMORY
+    :param size: tic-tac-toe - the board's diameter, memory - the number of pairs of cards
+    :param strategies: the strategy of every player, by the players' turn order
+    :param record: keep every played move as (turn, location) in game['history'], for the move log
+    :param rng: the game's random generator or its seed, the same seed plays the same deal and moves
+    :param cols_dimension: tic-tac-toe only - number of columns in the board, size by default
+    :param k: tic-tac-toe only - number of cells in a row that win, by default the board's diameter
+    :return: dictionary of the new game, with the 'type', 'status', 'winner' and 'strategies' properties
+    """
+    if game_type not in GAME_TYPES:
+        raise ValueError(f"unknown game type: {game_type}")
+    for strategy in strategies:
+        if strategy not in STRATEGIES[game_type]:
+            raise ValueError(f"unknown {game_type} strategy: {strategy}")
+    if game_type == TIC_TAC_TOE:
+        game = tic_tac_toe.init_game(size, {}, False, rng, cols_dimension, k)
+        game['strategies'] = dict(zip(game['icons'], strategies))
+        game['players'] = {icon: get_player_name(strategy) for icon, strategy in game['strategies'].items()}
+        game['computer_mode'] = True
+    else:
+        game = memory.init_game({}, False, memory.generate_labels(size), *memory.get_board_layout(size), rng)
+        game['strategies'] = {str(turn): strategy for turn, strategy in enumerate(strategies, start=1)}
+        game['players'] = {turn: {'name': get_player_name(strategy), 'score': 0}
+                           for turn, strategy in game['strategies'].items()}
+        game['computer_mode'] = len(strategies) == 2
+        for turn, strategy in game['strategies'].items():
+            memory.add_computer_memory(game, turn, strategy)
+    game['renderer'] = renderer.init_renderer(renderer.HEADLESS)
+    game['type'] = game_type
+    game['status'] = PLAYING
+    game['winner'] = None
+    if record:
+        game['history'] = []
+    return game
+
+
+def get_player_name(strategy: str) -> str:
+    """
+    :param strategy: the player's strategy
+    :return: the player's name in the game
+    """
+    return 'player' if strategy == HUMAN else 'computer'
+
+
+def get_status(game: dict[str, any]) -> str:
+    """
+    :param game: dictionary of a headless game
+    :return: PLAYING, WIN, TIE or FORFEIT
+    """
+    return game['status']
+
+
+def apply_move(game: dict[str, any], location: tuple[int, int] | list[int]) -> str:
+    """
+    play one move of the current player:
+    tic-tac-toe - set the square, memory - flip one card, the turn is over after the second card
+    :param game: dictionary of a headless game
+    :param location: the played cell (row,col)
+    :return: the game's status after the move
+    :raise ValueError: if the game is over, or the cell isn't available: an occupied tic-tac-toe cell, a flipped or
+    matched memory card, or a cell out of the board. the game isn't changed then
+    """
+    if game['status'] != PLAYING:
+        raise ValueError(f"the game is over: {game['status']}")
+    if tuple(location) not in game['moves']:
+        raise ValueError(f"the cell {tuple(location)} isn't available")
+    history = game.get('history')
+    if history is not None:
+        history.append((game['turn'], tuple(location)))
+    if game['type'] == TIC_TAC_TOE:
+        tic_tac_toe.set_square(game, location)
+        if tic_tac_toe.check_win(game):
+            game['status'], game['winner'] = WIN, game['turn']
+        elif tic_tac_toe.check_tie(game):
+            game['status'] = TIE
+        else:
+            tic_tac_toe.switch_player(game)
+        return game['status']
+
+    location = tuple(location)
+    first_location = game['first_location']
+    memory.flip_card(game, location)
+    if first_location is None:
+        return game['status']
+    if memory.check_match(game, first_location, location):
+        memory.set_match(game, first_location, location)
+        if memory.check_end_of_game(game):
+            set_memory_result(game)
+    else:
+        memory.flip_card(game, first_location)
+        memory.flip_card(game, location)
+        memory.switch_player(game)
+    return game['status']
+
+
+def set_memory_result(game: dict[str, any]) -> None:
+    """
+    update the status and the winner of a memory game that is over, a shared best score is a tie
+    :param game: dictionary of a headless memory game
+    """
+    winner = memory.get_winner(game)
+    best = [turn for turn, player in game['players'].items() if player['score'] == winner['score']]
+    if len(best) > 1:
+        game['status'] = TIE
+    else:
+        game['status'], game['winner'] = WIN, best[0]
+
+
+def forfeit(game: dict[str, any], error: ValueError) -> None:
+    """
+    stop a game whose current player's agent answered an illegal move
+    :param game: dictionary of a headless game
+    :param error: the error of the illegal move, kept in game['error']
+    """
+    game['status'] = FORFEIT
+    game['winner'] = next((turn for turn in game['strategies'] if turn != game['turn']), None)
+    game['error'] = str(error)
+
+
+def get_computer_move(game: dict[str, any]) -> tuple[int, int] | list[int]:
+    """
+    :param game: dictionary of a headless game
+    :return: the next location of the current player, by its strategy
+    """
+    strategy = game['strategies'][game['turn']]
+    if game['type'] == TIC_TAC_TOE:
+        return tic_tac_toe.get_computer_location(game, strategy)
+    return memory.get_computer_location(game)
+
+
+def get_computer_agent(game_type: str, strategy: str) -> agents.ComputerAgent:
+    """
+    :param game_type: TIC_TAC_TOE or MEMORY
+    :param strategy: the computer's strategy, one of STRATEGIES of the game's type except HUMAN
+    :return: an agent that plays the strategy
+    """
+    return agents.ComputerAgent(get_select_location(game_type, strategy))
+
+
+def get_select_location(game_type: str, strategy: str):
+    """
+    :param game_type: TIC_TAC_TOE or MEMORY
+    :param strategy: the computer's strategy, memory - the level is the computer's memory in the game
+    :return: the strategy's picklable function of one argument, the game, that returns the next location
+    """
+    if game_type == TIC_TAC_TOE:
+        return partial(tic_tac_toe.get_computer_location, strategy=strategy)
+    return memory.get_computer_location
+
+
+class EventLoop:
+    """
+    plays many headless games together: it sends a move request to the agent of every game's current player,
+    applies the answered moves in their arrival order and requests the next moves, and flushes the agents
+    when no answered move is waiting, so a batching agent selects the moves of all its games at once
+    """
+
+    def __init__(self):
+        self.games: list[dict[str, any]] = []
+        # the agent of every player, by the game's index
+        self.agents: list[dict[str, agents.Agent]] = []
+        # the answered moves that weren't applied yet, as (game's index, location)
+        self.ready: deque = deque()
+        # number of moves requested and not answered yet
+        self.waiting = 0
+
+    def add_game(self, game: dict[str, any], players_agents: dict[str, agents.Agent] = None) -> int:
+        """
+        :param game: dictionary of a headless game, from create_game
+        :param players_agents: the agent of every player by its turn, by default a ComputerAgent of every player's
+        strategy. an agent may play in any number of games
+        :return: the game's index
+        :raise ValueError: if a HUMAN player has no agent
+        """
+        players_agents = dict(players_agents or {})
+        for turn, strategy in game['strategies'].items():
+            if turn not in players_agents:
+                if strategy == HUMAN:
+                    raise ValueError(f"the human player {turn} has no agent")
+                players_agents[turn] = get_computer_agent(game['type'], strategy)
+        self.games.append(game)
+        self.agents.append(players_agents)
+        index = len(self.games) - 1
+        if game['status'] == PLAYING:
+            self.request_move(index)
+        return index
+
+    def request_move(self, index: int) -> None:
+        """
+        :param index: the game's index, the game is playing
+        """
+        game = self.games[index]
+        self.waiting += 1
+        self.agents[index][game['turn']].request_move(game, lambda location: self.answer(index, location))
+
+    def answer(self, index: int, location: tuple[int, int] | list[int]) -> None:
+        """
+        :param index: the game's index
+        :param location: the move of the game's current player
+        """
+        self.waiting -= 1
+        self.ready.append((index, location))
+
+    def flush(self) -> None:
+        """
+        flush the agents of the games that wait for a move, every agent once
+        """
+        flushed = set()
+        for game, players_agents in zip(self.games, self.agents):
+            agent = players_agents[game['turn']]
+            if game['status'] == PLAYING and id(agent) not in flushed:
+                flushed.add(id(agent))
+                agent.flush()
+
+    def run(self) -> int:
+        """
+        play the games till they are over, or till the only waiting moves are of agents that answer from
+        outside the loop (e.g. a RemoteAgent), run it again after their moves are submitted.
+        an illegal move forfeits its game (see forfeit), the other games go on
+        :return: number of moves applied
+        """
+        moves = 0
+        while self.ready or self.waiting:
+            if not self.ready:
+                self.flush()
+                if not self.ready:
+                    break
+            index, location = self.ready.popleft()
+            game = self.games[index]
+            try:
+                status = apply_move(game, location)
+            except ValueError as error:
+                forfeit(game, error)
+                continue
+            if status == PLAYING:
+                self.request_move(index)
+            moves += 1
+        return moves
+
+
+def play_games(games: list[dict[str, any]], players_agents: dict[str, agents.Agent] = None) -> int:
+    """
+    play headless games together till they are over, see EventLoop
+    :param games: dictionaries of headless games
+    :param players_agents: the agents of the players by their turn in all the games, by default a ComputerAgent
+    of every player's strategy
+    :return: number of moves played
+    """
+    loop = EventLoop()
+    for game in games:
+        loop.add_game(game, players_agents)
+    return loop.run()
+
+
+def play_game(game: dict[str, any]) -> int:
+    """
+    play the game till it's over
+    :param game: dictionary of a headless game
+    :return: number of moves played
+    """
+    moves = 0
+    while game['status'] == PLAYING:
+        apply_move(game, get_computer_move(game))
+        moves += 1
+    return moves
@@ -0,0 +1,206 @@
+import functools
+import os
+import sys
+from bisect import bisect_left
+from time import perf_counter
+
+# the instrumented functions, by 'module.function'
+TARGETS = (
+    'tic_tac_toe.input_square',
+    'memory.input_card_location',
+    'tic_tac_toe.get_computer_location',
+    'memory.get_computer_location',
+    'tic_tac_toe.draw_board',
+    'memory.draw_board',
+    'tic_tac_toe.check_win',
+    'memory.flip_card',
+    'tic_tac_toe.get_random_location',
+    'memory.get_random_location',
+)
+# the upper bounds (seconds) of the timers' histogram buckets, the last bucket is +Inf
+BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0)
+METRICS_ENVIRONMENT = 'GAMES_METRICS'
+PROFILE_ENVIRONMENT = 'GAMES_PROFILE'
+
+# the instrumentation's state: the timers and counters, the replaced functions and the outputs
+_state: dict[str, any] = {
+    'enabled': False,
+    'timers': {},
+    'counters': {},
+    'originals': {},
+    'profile': None,
+    'metrics_path': None,
+    'profile_path': None
+}
+
+
+def new_timer() -> dict[str, any]:
+    """
+    :return: an empty timer: number of calls, total seconds and the calls count of every histogram bucket
+    """
+    return {'count': 0, 'sum': 0.0, 'buckets': [0] * (len(BUCKETS) + 1)}
+
+
+def timed(function, timer: dict[str, any]):
+    """
+    :param function: the measured function
+    :param timer: the function's timer
+    :return: a wrapper of the function that adds every call's duration to the timer
+    """
+    buckets = timer['buckets']
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds = perf_counter() - start
+            timer['count'] += 1
+            timer['sum'] += seconds
+            buckets[bisect_left(BUCKETS, seconds)] += 1
+    return wrapper
+
+
+def get_modules(module_name: str) -> list:
+    """
+    :param module_name: a module's name
+    :return: the module, and the __main__ module too if it's the same file run as a script
+    """
+    # the instrumentation's imports are deferred till it's enabled, so a game without it starts faster
+    import importlib
+    module = importlib.import_module(module_name)
+    main_module = sys.modules.get('__main__')
+    main_file = getattr(main_module, '__file__', None)
+    if main_file and main_module is not module and os.path.abspath(main_file) == os.path.abspath(module.__file__):
+        return [module, main_module]
+    return [module]
+
+
+def enable(targets: tuple[str, ...] = TARGETS, metrics_path: str = None, profile_path: str = None) -> None:
+    """
+    replace the target functions in their modules with timed wrappers, the callers look the functions up in the
+    modules so they call the wrappers, nothing is replaced or measured till the instrumentation is enabled
+    :param targets: the measured functions, by 'module.function'
+    :param metrics_path: a Prometheus text file to write by report(), None - don't write
+    :param profile_path: a cProfile/pstats file to dump by report(), None - don't profile
+    """
+    if _state['enabled']:
+        disable()
+    for target in targets:
+        module_name, function_name = target.rsplit('.', 1)
+        timer = _state['timers'].setdefault(target, new_timer())
+        for module in get_modules(module_name):
+            function = getattr(module, function_name)
+            _state['originals'][(module.__name__, target)] = (module, function_name, function)
+            setattr(module, function_name, timed(function, timer))
+    _state['metrics_path'], _state['profile_path'] = metrics_path, profile_path
+    if profile_path:
+        import cProfile
+        _state['profile'] = cProfile.Profile()
+        _state['profile'].enable()
+    _state['enabled'] = True
+
+
+def enable_from_environment() -> bool:
+    """
+    enable the instrumentation if GAMES_METRICS (a Prometheus text file, or 1 for the summary only)
+    or GAMES_PROFILE (a pstats file) is set
+    :return: True if the instrumentation was enabled
+    """
+    metrics_path = os.environ.get(METRICS_ENVIRONMENT)
+    profile_path = os.environ.get(PROFILE_ENVIRONMENT)
+    if not metrics_path and not profile_path:
+        return False
+    enable(metrics_path=None if metrics_path in (None, '', '1') else metrics_path, profile_path=profile_path or None)
+    return True
+
+
+def disable() -> None:
+    """
+    put back the original functions and stop the profiler, the collected metrics are kept
+    """
+    for module, function_name, function in _state['originals'].values():
+        setattr(module, function_name, function)
+    _state['originals'].clear()
+    if _state['profile'] is not None:
+        _state['profile'].disable()
+    _state['enabled'] = False
+
+
+def is_enabled() -> bool:
+    """
+    :return: True if the instrumentation is enabled
+    """
+    return _state['enabled']
+
+
+def increment(name: str, value: int = 1) -> None:
+    """
+    add to a counter, e.g. the number of played games, nothing is counted when the instrumentation is disabled
+    :param name: the counter's name
+    :param value: the added value
+    """
+    if _state['enabled']:
+        _state['counters'][name] = _state['counters'].get(name, 0) + value
+
+
+def reset() -> None:
+    """
+    clear all the collected metrics
+    """
+    for timer in _state['timers'].values():
+        timer.update(new_timer())
+    _state['counters'].clear()
+
+
+def format_prometheus() -> str:
+    """
+    :return: the timers and the counters in the Prometheus text exposition format
+    """
+    lines = ["# HELP game_function_seconds time spent in the game's functions",
+             "# TYPE game_function_seconds histogram"]
+    for target, timer in _state['timers'].items():
+        cumulative = 0
+        for bound, count in zip(BUCKETS + (float('inf'),), timer['buckets']):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'game_function_seconds_bucket{{function="{target}",le="{le}"}} {cumulative}')
+        lines.append(f'game_function_seconds_sum{{function="{target}"}} {timer["sum"]!r}')
+        lines.append(f'game_function_seconds_count{{function="{target}"}} {timer["count"]}')
+    for name, value in _state['counters'].items():
+        lines.append(f"# TYPE game_{name}_total counter")
+        lines.append(f"game_{name}_total {value}")
+    return '\n'.join(lines) + '\n'
+
+
+def format_summary() -> str:
+    """
+    :return: a table of every measured function: calls, total time, mean call time and time per game
+    """
+    games = _state['counters'].get('games', 0)
+    lines = [f"instrumentation summary, games: {games}",
+             f"{'function':34} {'calls':>8} {'total ms':>10} {'mean us':>10} {'ms/game':>9}"]
+    for target, timer in _state['timers'].items():
+        if not timer['count']:
+            continue
+        per_game = f"{timer['sum'] * 1000 / games:9.3f}" if games else f"{'-':>9}"
+        lines.append(f"{target:34} {timer['count']:8} {timer['sum'] * 1000:10.3f} "
+                     f"{timer['sum'] * 1e6 / timer['count']:10.2f} {per_game}")
+    return '\n'.join(lines)
+
+
+def report() -> None:
+    """
+    print the summary and write the Prometheus file and the profile, if the instrumentation is enabled
+    """
+    if not _state['enabled']:
+        return
+    print(format_summary())
+    if _state['metrics_path']:
+        with open(_state['metrics_path'], 'w') as metrics_file:
+            metrics_file.write(format_prometheus())
+    if _state['profile'] is not None:
+        _state['profile'].disable()
+        _state['profile'].dump_stats(_state['profile_path'])
+        _state['profile'].enable()
@@ -0,0 +1,203 @@
+# cumulative players' stats of the played games, in a local SQLite file:
+# every game is a row of games, with a row of results for every player,
+# and player_stats keeps the totals of every player by the game type, so the leaderboard never scans the results.
+# print a leaderboard by running: python leaderboard.py [tic_tac_toe|memory] [limit]
+import atexit
+import os
+import sqlite3
+import sys
+import time
+
+# the stats are kept in the current working directory, not next to the installed sources
+DEFAULT_PATH = 'leaderboard.db'
+# the leaderboard file's path, 0 - don't keep stats. the games check it before they import this module
+PATH_ENVIRONMENT = 'GAMES_LEADERBOARD'
+DISABLED = '0'
+WIN, DRAW, LOSS = 'win', 'draw', 'loss'
+RESULTS = (WIN, DRAW, LOSS)
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_LIMIT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    game_type TEXT NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    player TEXT NOT NULL,
+    result TEXT NOT NULL,
+    pairs INTEGER NOT NULL,
+    moves INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player_stats (
+    game_type TEXT NOT NULL,
+    player TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    draws INTEGER NOT NULL,
+    pairs INTEGER NOT NULL,
+    moves INTEGER NOT NULL,
+    PRIMARY KEY (game_type, player)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS player_stats_rank ON player_stats (game_type, wins DESC, draws DESC, games);
+"""
+INSERT_GAME = "INSERT INTO games (id, game_type, played_at) VALUES (?, ?, ?)"
+INSERT_RESULT = "INSERT INTO results (game_id, player, result, pairs, moves) VALUES (?, ?, ?, ?, ?)"
+UPDATE_STATS = """
+INSERT INTO player_stats (game_type, player, games, wins, draws, pairs, moves) VALUES (?, ?, 1, ?, ?, ?, ?)
+ON CONFLICT (game_type, player) DO UPDATE SET
+    games = games + 1, wins = wins + excluded.wins, draws = draws + excluded.draws,
+    pairs = pairs + excluded.pairs, moves = moves + excluded.moves
+"""
+STATS_COLUMNS = "player, games, wins, draws, pairs, moves * 1.0 / games"
+SELECT_TOP = f"""
+SELECT {STATS_COLUMNS} FROM player_stats WHERE game_type = ?
+ORDER BY wins DESC, draws DESC, games LIMIT ?
+"""
+SELECT_PLAYER = f"SELECT {STATS_COLUMNS} FROM player_stats WHERE game_type = ? AND player = ?"
+STATS_KEYS = ('player', 'games', 'wins', 'draws', 'pairs', 'average_moves')
+
+# the leaderboard of the played games, opened on the first finished game
+_shared: dict[str, any] = {'leaderboard': None}
+
+
+class Leaderboard:
+    """
+    a connection to the stats file, kept open for all the games. the games are buffered and
+    written in batches, every batch in one transaction, the reads write the buffered games first
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        :param path: the SQLite file's path, created with the tables if it doesn't exist
+        :param batch_size: number of buffered games that triggers a write
+        """
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.pending: list[tuple[str, float, list[tuple[str, str, int, int]]]] = []
+        self.batch_size = batch_size
+
+    def record_game(self, game_type: str, results: list[tuple[str, str, int, int]]) -> None:
+        """
+        :param game_type: the game's type, e.g. engine.TIC_TAC_TOE or engine.MEMORY
+        :param results: every player's (name, WIN/DRAW/LOSS, matched pairs, moves)
+        """
+        self.pending.append((game_type, time.time(), results))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        write the buffered games, their results and the players' totals in one transaction
+        """
+        if not self.pending:
+            return
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            game_id = cursor.execute("SELECT coalesce(max(id), 0) FROM games").fetchone()[0]
+            games, results, stats = [], [], []
+            for game_type, played_at, game_results in self.pending:
+                game_id += 1
+                games.append((game_id, game_type, played_at))
+                for player, result, pairs, moves in game_results:
+                    results.append((game_id, player, result, pairs, moves))
+                    stats.append((game_type, player, int(result == WIN), int(result == DRAW), pairs, moves))
+            cursor.executemany(INSERT_GAME, games)
+            cursor.executemany(INSERT_RESULT, results)
+            cursor.executemany(UPDATE_STATS, stats)
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        self.pending.clear()
+
+    def top(self, game_type: str, limit: int = DEFAULT_LIMIT) -> list[dict[str, any]]:
+        """
+        :param game_type: the game's type
+        :param limit: number of players
+        :return: the best players' stats, by the most wins, then the most draws, then the fewest games
+        """
+        self.flush()
+        rows = self.connection.execute(SELECT_TOP, (game_type, limit)).fetchall()
+        return [dict(zip(STATS_KEYS, row)) for row in rows]
+
+    def get_stats(self, game_type: str, player: str) -> dict[str, any] | None:
+        """
+        :param game_type: the game's type
+        :param player: the player's name
+        :return: the player's stats, None if the player has no recorded games
+        """
+        self.flush()
+        row = self.connection.execute(SELECT_PLAYER, (game_type, player)).fetchone()
+        return dict(zip(STATS_KEYS, row)) if row else None
+
+    def close(self) -> None:
+        """
+        write the buffered games and close the connection
+        """
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self) -> 'Leaderboard':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def get_leaderboard() -> Leaderboard | None:
+    """
+    :return: the shared leaderboard of the file in GAMES_LEADERBOARD (leaderboard.db in the current directory by
+    default), opened once and closed at exit, None if GAMES_LEADERBOARD is 0
+    """
+    if _shared['leaderboard'] is None:
+        path = os.environ.get(PATH_ENVIRONMENT) or DEFAULT_PATH
+        if path == DISABLED:
+            return None
+        _shared['leaderboard'] = Leaderboard(path)
+        atexit.register(_shared['leaderboard'].close)
+    return _shared['leaderboard']
+
+
+def get_results(scores: dict[str, int]) -> dict[str, str]:
+    """
+    :param scores: the players' scores by their names, e.g. 1 for the tic-tac-toe winner and 0 for the others
+    :return: the players' results: WIN for the only best score, DRAW for a shared best score, else LOSS
+    """
+    best = max(scores.values())
+    best_count = sum(1 for score in scores.values() if score == best)
+    return {player: LOSS if score != best else WIN if best_count == 1 else DRAW for player, score in scores.items()}
+
+
+def format_leaderboard(stats: list[dict[str, any]]) -> str:
+    """
+    :param stats: the players' stats from Leaderboard.top
+    :return: a table of the players' stats
+    """
+    lines = [f"{'#':>3} {'player':16} {'games':>7} {'wins':>7} {'draws':>7} {'pairs':>7} {'avg moves':>10}"]
+    for rank, player in enumerate(stats, start=1):
+        lines.append(f"{rank:3} {player['player']:16} {player['games']:7} {player['wins']:7} {player['draws']:7} "
+                     f"{player['pairs']:7} {player['average_moves']:10.1f}")
+    return '\n'.join(lines)
+
+
+def print_leaderboard(game_type: str, limit: int = DEFAULT_LIMIT) -> None:
+    """
+    print the game's leaderboard, nothing if the stats are not kept
+    :param game_type: the game's type
+    :param limit: number of players
+    """
+    leaderboard = get_leaderboard()
+    if leaderboard is not None:
+        print("LEADERBOARD:")
+        print(format_leaderboard(leaderboard.top(game_type, limit)))
+
+
+if __name__ == "__main__":
+    print_leaderboard(sys.argv[1] if len(sys.argv) > 1 else 'memory',
+                      int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LIMIT)
@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import random
+import time
+
+import engine
+from server import DEFAULT_SIZES, PROMPT, MOVE_PROMPT, REPLAY_PROMPT
+
+
+def parse_free_cells(lines: list[str]) -> list[str]:
+    """
+    find the hidden/empty cells in the last board frame of a response
+    :param lines: the response's lines
+    :return: a list of the free cells as 'row,col' (1 based)
+    """
+    free_cells = []
+    for line in lines:
+        if line.startswith('---'):
+            free_cells = []
+            continue
+        row, _, cells = line.partition(' ')
+        if row.isdigit():
+            free_cells.extend(f"{row},{col}" for col, cell in enumerate(cells.split(' '), start=1) if cell == '_')
+    return free_cells
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple[list[str], str]:
+    """
+    :param reader: the connection's reader
+    :return: a tuple of the response's lines and its prompt line
+    """
+    lines = []
+    while True:
+        line = (await reader.readline()).decode()
+        if not line:
+            raise ConnectionError("the server closed the connection")
+        if line.startswith(PROMPT):
+            return lines, line
+        lines.append(line.rstrip('\n'))
+
+
+async def play_client(host: str, port: int, game_line: str, games: int, latencies: list[float]) -> int:
+    """
+    play games on one connection with random moves, and measure every move's latency
+    :param host: the server's host
+    :param port: the server's port
+    :param game_line: answer to the game prompt, 'game_type [size] [strategy]'
+    :param games: number of games to play
+    :param latencies: list to add the moves' latencies (seconds) to
+    :return: number of played games
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await read_response(reader)
+        writer.write(f"{game_line}\n".encode())
+        lines, prompt = await read_response(reader)
+        played = 0
+        while True:
+            if prompt == REPLAY_PROMPT:
+                played += 1
+                writer.write(b"y\n" if played < games else b"n\n")
+                if played == games:
+                    return played
+                lines, prompt = await read_response(reader)
+                continue
+            if prompt != MOVE_PROMPT:
+                raise ValueError(f"unexpected prompt: {prompt}")
+            move = random.choice(parse_free_cells(lines))
+            start = time.perf_counter()
+            writer.write(f"{move}\n".encode())
+            lines, prompt = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    :param sorted_values: sorted list of values, not empty
+    :param fraction: the percentile as a fraction, 0.5 - the median
+    :return: the value at the percentile (nearest rank)
+    """
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run_load(host: str, port: int, clients: int, games: int, game_line: str) -> None:
+    """
+    run concurrent clients and print the moves' latency percentiles
+    :param host: the server's host
+    :param port: the server's port
+    :param clients: number of concurrent connections
+    :param games: number of games every client plays
+    :param game_line: answer to the game prompt, 'game_type [size] [strategy]'
+    """
+    latencies: list[float] = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*(play_client(host, port, game_line, games, latencies) for _ in range(clients)),
+                                   return_exceptions=True)
+    seconds = time.perf_counter() - start
+    failed = [result for result in results if isinstance(result, Exception)]
+    latencies.sort()
+    print(f"clients: {clients}, games: {sum(r for r in results if isinstance(r, int))}, failed clients: {len(failed)}")
+    if latencies:
+        print(f"moves: {len(latencies)}, moves per second: {len(latencies) / seconds:,.0f}")
+        print(f"move latency p50: {percentile(latencies, 0.5) * 1000:.2f}ms, "
+              f"p99: {percentile(latencies, 0.99) * 1000:.2f}ms")
+    if failed:
+        print(f"first failure: {failed[0]!r}")
+
+
+def main(arguments: list[str] = None) -> None:
+    """
+    run the load generator from the command line
+    :param arguments: the command line arguments, sys.argv by default
+    """
+    parser = argparse.ArgumentParser(description="play many concurrent random games against the game server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clients', type=int, default=100, help="number of concurrent connections")
+    parser.add_argument('--games', type=int, default=5, help="number of games every client plays")
+    parser.add_argument('--game', choices=engine.GAME_TYPES, default=engine.TIC_TAC_TOE)
+    parser.add_argument('--size', type=int, default=None)
+    parser.add_argument('--strategy', default='random', help="the computer's strategy")
+    options = parser.parse_args(arguments)
+    size = options.size or DEFAULT_SIZES[options.game]
+    game_line = f"{options.game} {size} {options.strategy}"
+    asyncio.run(run_load(options.host, options.port, options.clients, options.games, game_line))
+
+
+if __name__ == "__main__":
+    main()
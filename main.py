@@ -1,2 +1,126 @@
-import memory
-memory.play_memory_game()
\ No newline at end of file
+import sys
+import time
+
+START = time.perf_counter()
+
+GAMES = ('memory', 'tic_tac_toe')
+# the tools' modules by their command, every tool parses the rest of the arguments by its own main()
+TOOLS = {
+    'simulate': 'simulate',
+    'serve': 'server',
+    'load': 'load_client',
+    'benchmark': 'benchmark',
+    'replay': 'move_log',
+}
+# the number options of every game, a number option is a positive integer
+NUMBER_OPTIONS = {'memory': ('--rows', '--cols', '--pairs'), 'tic_tac_toe': ('--rows', '--cols', '--k')}
+RENDER_MODES = ('plain', 'ansi')
+USAGE = """usage: python main.py [memory|tic_tac_toe] [--rows N] [--cols N] [--k N] [--pairs N] [--render plain|ansi]
+                    [--startup-time]
+       python main.py simulate|serve|load|benchmark|replay [the tool's options]
+memory is the default game. --rows and --cols set the board, a square tic-tac-toe board by --rows only,
+--k (tic-tac-toe only) the cells in a row that win, --pairs (memory only) the number of the cards' pairs,
+the numbers are positive integers,
+--startup-time prints the time from the launch till the game starts"""
+
+
+def parse_options(game_name: str, arguments: list[str]) -> dict[str, int | str]:
+    """
+    parse the game's options without argparse, which imports re and gettext
+    :param game_name: one of GAMES
+    :param arguments: the arguments after the game
+    :return: the options' values by their names (without '--')
+    :raise ValueError: if an option is unknown, doesn't apply to the game, or its value is missing or invalid
+    """
+    options = {}
+    index = 0
+    while index < len(arguments):
+        argument = arguments[index]
+        value = arguments[index + 1] if index + 1 < len(arguments) else None
+        if argument == '--startup-time':
+            options['startup-time'] = ''
+        elif argument in NUMBER_OPTIONS[game_name]:
+            if value is None or not value.isdecimal() or int(value) < 1:
+                raise ValueError(f"{argument} needs a positive integer")
+            index += 1
+            options[argument[2:]] = int(value)
+        elif any(argument in game_options for game_options in NUMBER_OPTIONS.values()):
+            raise ValueError(f"{argument} doesn't apply to {game_name}")
+        elif argument == '--render':
+            if value not in RENDER_MODES:
+                raise ValueError(f"--render needs one of: {', '.join(RENDER_MODES)}")
+            index += 1
+            options['render'] = value
+        else:
+            raise ValueError(f"unknown option: {argument}")
+        index += 1
+    return options
+
+
+def report_startup() -> None:
+    """
+    print the time from the launcher's start, it includes importing the game's modules
+    """
+    print(f"started in {(time.perf_counter() - START) * 1000:.1f} ms", file=sys.stderr)
+
+
+def play(game_name: str, options: dict[str, int | str]) -> None:
+    """
+    import the selected game only, check its options and play it
+    :param game_name: one of GAMES
+    :param options: the game's parsed options
+    """
+    rows, cols, render_mode = options.get('rows'), options.get('cols'), options.get('render', 'plain')
+    import instrumentation
+    instrumentation.enable_from_environment()
+    if game_name == 'tic_tac_toe':
+        import tic_tac_toe
+        rows = 3 if rows is None else rows
+        try:
+            k = tic_tac_toe.validate_k(rows, cols, options.get('k'))
+        except ValueError as error:
+            print(error)
+            return
+        if 'startup-time' in options:
+            report_startup()
+        tic_tac_toe.play_tic_tac_toe(render_mode, rows, cols, k)
+    else:
+        import memory
+        labels = memory.generate_labels(options['pairs']) if 'pairs' in options else memory.DEFAULT_CARD_LABELS
+        rows = len(labels) if rows is None else rows
+        try:
+            memory.validate_layout(len(labels), rows, cols)
+        except ValueError as error:
+            print(error)
+            return
+        if 'startup-time' in options:
+            report_startup()
+        memory.play_memory_game(labels, rows, cols, render_mode)
+
+
+def main(arguments: list[str] = None) -> None:
+    """
+    launch a game or a tool by the command line, only the modules of the selected command are imported
+    :param arguments: the command line arguments, sys.argv by default
+    """
+    arguments = sys.argv[1:] if arguments is None else arguments
+    command = arguments[0] if arguments and not arguments[0].startswith('--') else 'memory'
+    rest = arguments[1:] if arguments and command == arguments[0] else arguments
+    if command in TOOLS:
+        import importlib
+        importlib.import_module(TOOLS[command]).main(rest)
+        return
+    if command not in GAMES:
+        print(USAGE)
+        return
+    try:
+        options = parse_options(command, rest)
+    except ValueError as error:
+        print(error)
+        print(USAGE)
+        return
+    play(command, options)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,31 @@
-import random
-import re
-from random import choice
-from typing import Any
+import os
+from array import array
+from random import Random
+
+import agents
+import instrumentation
+import memory_ai
+import move_parser
+import renderer
+import seeded_random
+from move_set import MoveSet, board_moves, own_moves
 
 RESTART_SENTINEL = 'R'
 REMATCH_SENTINEL = 'M'
-
-
-def init_game(game: dict[str, any], is_rematch: bool, cards_labels: tuple[str, str, str, str, str, str],
-              rows_dimension: int) -> dict[
+SAVE_SENTINEL = 'S'
+# the entered texts of the sentinels, in both cases, as str and as bytes
+SENTINEL_INPUTS = {text: sentinel for sentinel in (RESTART_SENTINEL, REMATCH_SENTINEL, SAVE_SENTINEL)
+                   for text in (sentinel, sentinel.lower(), sentinel.encode(), sentinel.lower().encode())}
+GAME_TYPE = 'memory'
+# the game saved by the save and quit sentinel, it's offered to resume on the next start
+SAVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'memory.sav')
+DEFAULT_CARD_LABELS = ('A', 'B', 'C', 'D', 'E', 'F')
+# string.ascii_uppercase, the string module imports re
+ASCII_UPPERCASE = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def init_game(game: dict[str, any], is_rematch: bool, cards_labels: tuple[str, ...],
+              rows_dimension: int, cols_dimension: int = None, rng: Random | int = None) -> dict[
     str, any]:
     """
     Initialize the game: shuffle the cards, reset the board and the possible moves.
@@ -16,34 +33,109 @@ def init_game(game: dict[str, any], is_rematch: bool, cards_labels: tuple[str, s
     else reset the players dictionary too
     :param game:dict type: includes all game's properties (board,players and other game's information)
     :param is_rematch: boolean type - indicate if it's a new game or repeat game with the same players
-    :param cards_labels: tuple contains 6 string, represent the display on the memory cards
+    :param cards_labels: tuple of strings, represent the display on the memory cards, 2 cards of each label
     :param rows_dimension: int type: number of row in the board
+    :param cols_dimension: int type: number of columns in the board, by default all the cards divided by the rows
+    :param rng: the game's random generator or its seed, by default the previous game's generator
     :return: dict type, a new game
+    :raise ValueError: if the board's layout doesn't hold exactly 2 cards of each label
     """
-    cards: list[dict[str, any]] = init_cards(cards_labels)
-    cols_dimension = int(len(cards) / rows_dimension)
+    cols_dimension = validate_layout(len(cards_labels), rows_dimension, cols_dimension)
+    rng = seeded_random.get_rng(rng if rng is not None else game.get('rng'))
+    cards = init_cards(cards_labels, rng)
     if not is_rematch:
-        return {
-            'board': init_board(cards, rows_dimension),
+        new_game = {
+            'board': init_board(cards, cards_labels),
             'turn': '1',
             'rows_dimension': rows_dimension,
             'cols_dimension': cols_dimension,
             'players': {},
             'computer_mode': False,
-            "moves": possible_moves(rows_dimension, cols_dimension)
+            'strategy': 'random',
+            'computer_memory': {},
+            'first_location': None,
+            "moves": possible_moves(rows_dimension, cols_dimension),
+            'rng': rng
 
         }
     else:
-        return {
-            'board': init_board(cards, rows_dimension),
+        new_game = {
+            'board': init_board(cards, cards_labels),
             'turn': '1',
             'rows_dimension': rows_dimension,
             'cols_dimension': cols_dimension,
             'players': reset_players_score(game['players']),
             'computer_mode': game['computer_mode'],
-            "moves": possible_moves(rows_dimension, cols_dimension)
+            'strategy': game['strategy'],
+            'computer_memory': {},
+            'first_location': None,
+            "moves": possible_moves(rows_dimension, cols_dimension),
+            'rng': rng
 
         }
+        if new_game['computer_mode']:
+            add_computer_memory(new_game, '2', new_game['strategy'])
+    return new_game
+
+
+def add_computer_memory(game: dict[str, any], turn: str, strategy: str) -> None:
+    """
+    give the computer player a memory of the seen cards, according to the strategy's level
+    :param game: dict type - represent the memory game will all its' properties
+    :param turn: the computer player's turn
+    :param strategy: 'random' - no memory, or one of the memory_ai.COMPUTER_LEVELS
+    """
+    if strategy in memory_ai.COMPUTER_LEVELS:
+        level = memory_ai.COMPUTER_LEVELS[strategy]
+        game['computer_memory'][turn] = memory_ai.init_computer_memory(game['moves'], rng=game['rng'], **level)
+
+
+def validate_layout(pairs: int, rows_dimension: int, cols_dimension: int = None) -> int:
+    """
+    check that the board's layout holds exactly 2 cards of each label
+    :param pairs: number of labels, each label has 2 cards
+    :param rows_dimension: int type: number of row in the board
+    :param cols_dimension: int type: number of columns in the board, by default all the cards divided by the rows
+    :return: the number of columns in the board
+    :raise ValueError: if the layout doesn't fit the cards
+    """
+    if pairs < 1 or rows_dimension < 1:
+        raise ValueError("the board must have at least 1 row and 1 pair of cards")
+    if cols_dimension is None:
+        cols_dimension = 2 * pairs // rows_dimension
+    if rows_dimension * cols_dimension != 2 * pairs:
+        raise ValueError(f"a board of {rows_dimension}x{cols_dimension} can't hold {2 * pairs} cards")
+    return cols_dimension
+
+
+def get_board_layout(pairs: int) -> tuple[int, int]:
+    """
+    find the most square layout for the cards
+    :param pairs: number of pairs of cards
+    :return: a tuple of (rows, columns), rows <= columns
+    """
+    cards_count = 2 * pairs
+    rows = int(cards_count ** 0.5)
+    while cards_count % rows:
+        rows -= 1
+    return rows, cards_count // rows
+
+
+def generate_labels(pairs: int) -> tuple[str, ...]:
+    """
+    generate distinct labels for the cards, like spreadsheet columns: A..Z, AA..AZ, BA..ZZ, AAA...
+    :param pairs: number of labels to generate
+    :return: a tuple of the labels
+    """
+    labels = []
+    for index in range(pairs):
+        label = ''
+        index += 1
+        while index:
+            index, letter = divmod(index - 1, len(ASCII_UPPERCASE))
+            label = ASCII_UPPERCASE[letter] + label
+        labels.append(label)
+    return tuple(labels)
 
 
 def reset_players_score(players:dict[str,dict[str,str|int]]):
@@ -76,6 +168,22 @@ def get_valid_boolean_response(message: str, options: list[str], true_option: st
     return answer == true_option
 
 
+def get_valid_option(message: str, options: tuple[str, ...]) -> str:
+    """
+    asks from the user the input message and expect that the answer will be 1 of the options,
+    if the answer is not one of the options, you will be asked again, till it is.
+    :param message:message to display in the input
+    :param options: tuple of options to answer from
+    :return: the selected option
+    """
+    while True:
+        answer = input(message).lower()
+        if not answer in options:
+            print(f"invalid answer, the possibilities are: {'/'.join(options)}")
+            continue
+        return answer
+
+
 def get_valid_number_of_players()->int:
     """
     asks from the user a number bigger than 2
@@ -102,7 +210,8 @@ def get_valid_player_name(message: str) -> str:
     """
     while True:
         name = input(message)
-        is_match = re.match("^(?!computer$)[a-zA-Z]+$", name)
+        # A-Z/a-z letters only, like the pattern ^(?!computer$)[a-zA-Z]+$, without importing re
+        is_match = name.isascii() and name.isalpha() and name != 'computer'
         if not is_match:
             print("invalid name,must contain letters only,try again")
             continue
@@ -140,129 +249,178 @@ def get_players(game: dict[str, any], is_rematch=False) -> None:
             name = get_valid_player_name("please enter your name:")
             players['1'] = {"name": name, "score": 0}
             players['2'] = {"name": 'computer', "score": 0}
+            levels = ('random',) + tuple(memory_ai.COMPUTER_LEVELS)
+            game['strategy'] = get_valid_option(f"select the computer's level ({'/'.join(levels)}):", levels)
+            add_computer_memory(game, '2', game['strategy'])
         game['players'] = players
         game['computer_mode'] = is_computer
         names = map(lambda player: player['name'], players.values())
         print("the players are: ", ' VS '.join(names))
 
 
-def init_cards(card_labels: tuple = ('A', 'B', 'C', 'D', 'E', 'F')) -> list[dict[str, any]]:
+def init_cards(card_labels: tuple = DEFAULT_CARD_LABELS, rng: Random | int = None) -> array:
     """
-    creates and shuffle cards objects with the card's properties:
-    display icon, is_flipped,is_matched,card id
+    creates and shuffle the cards ids, the id of a card is the index of its label in card_labels
     :param card_labels: tuple type,
     if not sent a required icons will Initialize with default tuple of 6 icons:('A', 'B', 'C', 'D', 'E', 'F')
-    :return: a shuffled list of flipped cards
-    """
-    cards = []
-    options_len = len(card_labels)
-    for i, label in enumerate(card_labels * 2):
-        # each card receive id= result of the card_index % length(card_labels), so you will have 2 of each icon
-        card = {
-            "id": i % options_len,
-            "icon": label,
-            "is_flipped": False,
-            "is_matched": False
-        }
-        cards.append(card)
-    random.shuffle(cards) #
+    :param rng: the random generator of the shuffle or its seed, the shared default generator by default
+    :return: a shuffled array of the cards ids, 2 cards of each label
+    """
+    # each card receive id= result of the card_index % length(card_labels), so you will have 2 of each icon
+    cards = array('I', range(len(card_labels))) * 2
+    seeded_random.get_rng(rng).shuffle(cards)
     return cards
 
 
-def possible_moves(rows_dimension: int, cols_dimension: int) -> set[tuple[int, int]]:
+def possible_moves(rows_dimension: int, cols_dimension: int) -> MoveSet:
     """
     create and initiate the memory possible moves
     :param rows_dimension: diameter for the game's row number
     :param cols_dimension: diameter for the game's column number
-    :return: a set of all possible moves by (row,col)
+    :return: a MoveSet of all possible moves by (row,col), a copy of the board's cached template
     """
-    moves: set[tuple[int, int]] = set()
-    for row in range(0, rows_dimension):
-        for col in range(0, cols_dimension):
-            moves.add((row, col))
-
-    return moves
+    return board_moves(rows_dimension, cols_dimension)
 
 
 def draw_board(game: dict[str, any]) -> None:
     """
     display the memory board
-    according to the game's cols_dimension and cols_dimension properties
+    according to the game's rows_dimension and cols_dimension properties,
+    with a single write of the whole frame by the game's renderer
     :param game: dictionary of the played game
 
     """
-    print("---------------------------")
-    print(' ', end=' ')
-    for i in range(1, game['cols_dimension'] + 1):
-        print(i, end=" ")
-    print()
-    board = game['board']
+    board_renderer = game.get('renderer')
+    if renderer.is_headless(board_renderer):
+        return
+    renderer.draw_frame(board_renderer, get_display_rows(game), game['cols_dimension'])
 
-    col_count = 1
-    for location, card in board.items():
-        if location[1] == 0:
-            print(col_count, end='')
-            col_count += 1
-        print(f" {'_' if not card['is_flipped'] and not card['is_matched'] else card['icon']}", end="")
-        if location[1] == game['cols_dimension'] - 1:
-            print()
+
+def get_display_rows(game: dict[str, any]) -> list[list[str]]:
+    """
+    :param game: dictionary of the played game
+    :return: the displayed cards, row by row: the label of a flipped or matched card, else '_'
+    """
+    board = game['board']
+    labels, ids, is_flipped, is_matched = board['labels'], board['ids'], board['is_flipped'], board['is_matched']
+    cols_dimension = game['cols_dimension']
+    rows = []
+    for row in range(game['rows_dimension']):
+        rows.append(['_' if not is_flipped[index] and not is_matched[index] else labels[ids[index]]
+                     for index in range(row * cols_dimension, (row + 1) * cols_dimension)])
+    return rows
 
 
 def input_card_location(game: dict[str, any]) -> tuple[int, int] | str:
     """
-    it's the computer's turn, the function will return a valid random location.
-    else,get from the user cell location and validate its values:
+    get from the user cell location and validate its values:
     check the location limit within the game
     check if the cell is occupied
     if the user enter the letter M or m (indicate he wants a reset with same players)
     if the user enter the letter R or r, (indicate he wants a reset with NEW players)
+    if the user enter the letter S or s, (indicate he wants to save the game and quit)
     the function will return the letter as is.
     :param game: dictionary of the played game
     :return: tuple of 2 values, of the next played cell in the board
     """
-    if game['computer_mode'] and game['turn'] == '2':
-        print("The computer turn NOW")
-        return get_random_location(game)
     while True:
         #display instructions to enter a value input of card location of reset game options
         print("enter row number,column number separated by ','")
         print(f"if you want to restart the game from scratch, press {RESTART_SENTINEL.lower()}/{RESTART_SENTINEL}")
         print(
             f"if you want to restart the game with the same players, press {REMATCH_SENTINEL.lower()}/{REMATCH_SENTINEL}")
+        print(f"if you want to save the game and quit, press {SAVE_SENTINEL.lower()}/{SAVE_SENTINEL}")
         location: str = input(
             f"player #{game['turn']}, {game['players'][game['turn']]['name']}, your turn:")
-        if location.upper() == RESTART_SENTINEL: # R value
-            return RESTART_SENTINEL
-        elif location.upper() == REMATCH_SENTINEL:# M value
-            return REMATCH_SENTINEL
-        location_list = location.split(',')
-        # change if enter 2 parameters for row, column
-        if len(location_list) < 2 or not all([x != '' for x in location_list]) or not all(
-                [x.isdigit() for x in location_list]):
-            print("try again,invalid input")
-            continue
-        #convert each value to int
-        location_list = [int(x) - 1 for x in location_list]
-        # check of the first parameter is within the row range and the second parameter is within the column range
-        if not 0 <= location_list[0] < game['rows_dimension'] or not 0 <= location_list[1] < game['rows_dimension']:
-            print("try again,out of range")
-            continue
-        # after checking valid values, get the card with this value and check if it's been flipped already
-        card = game['board'][tuple(location_list)]
-        if card['is_flipped']:
-            print("already flipped,try again")
+        card_location, error = parse_card_location(game, location)
+        if error:
+            print(error)
             continue
-        break
-    return tuple(location_list)
+        return card_location
+
+
+def parse_card_location(game: dict[str, any], location: str | bytes) -> tuple[tuple[int, int] | str | None, str | None]:
+    """
+    validate a card location entered as 'row,col' (1 based), or one of the restart/rematch letters
+    :param game: dictionary of the played game
+    :param location: the entered text, or a raw buffer of its bytes
+    :return: a tuple of (tuple of 2 values of the card or the sentinel letter, None),
+    or (None, the error message) if it's not valid
+    """
+    # R, M or S value
+    if isinstance(location, (str, bytes)) and location in SENTINEL_INPUTS:
+        return SENTINEL_INPUTS[location], None
+    # the row must be within the rows range and the column within the columns range
+    cols_dimension = game['cols_dimension']
+    index = move_parser.parse_cell(location, game['rows_dimension'], cols_dimension)
+    if index == move_parser.INVALID_INPUT:
+        return None, "try again,invalid input"
+    if index == move_parser.OUT_OF_RANGE:
+        return None, "try again,out of range"
+    # after checking valid values, check if the card has been flipped already
+    if game['board']['is_flipped'][index]:
+        return None, "already flipped,try again"
+    return divmod(index, cols_dimension), None
+
+
+def get_agents(game: dict[str, any]) -> dict[str, agents.Agent]:
+    """
+    :param game: dictionary of the game, after get_players
+    :return: the agent of every player by its turn: in computer mode the 2nd player is the computer,
+    the others enter their moves at the console
+    """
+    return {turn: agents.ComputerAgent(get_computer_location) if game['computer_mode'] and turn == '2'
+            else agents.HumanAgent(input_card_location) for turn in game['players']}
 
 
-def get_random_location(game: dict[str, any]):
+def get_location(players_agents: dict[str, agents.Agent], game: dict[str, any]) -> tuple[int, int] | str:
     """
-    using random.choice function, select a random tuple of card's location(row,col) from a set of tuples
+    :param players_agents: the agent of every player by its turn
     :param game: dictionary of the played game
+    :return: the current player's next card, or a sentinel entered by a human player
+    """
+    agent = players_agents[game['turn']]
+    if not agent.is_human:
+        print("The computer turn NOW")
+    return agents.get_move(agent, game)
+
+
+def get_computer_location(game: dict[str, any]) -> tuple[int, int]:
+    """
+    select the computer's next card: if the current player has a memory of the seen cards,
+    play a known pair or an unseen card, else a random available card
+    :param game: dictionary of the played game
+    :return: tuple of 2 values, of the next played cell in the board
+    """
+    computer_memory = game['computer_memory'].get(game['turn'])
+    if computer_memory is None:
+        return get_random_location(game)
+    first_location = game['first_location']
+    if first_location is None:
+        location = memory_ai.choose_first_location(computer_memory)
+    else:
+        card_id = game['board']['ids'][card_index(game, first_location)]
+        location = memory_ai.choose_second_location(computer_memory, first_location, card_id)
+    return location if location is not None else get_random_location(game)
+
+
+def get_random_location(game: dict[str, any], rng: Random = None):
+    """
+    select a random tuple of card's location(row,col) from the available moves, in O(1)
+    :param game: dictionary of the played game
+    :param rng: the random generator, the game's generator by default
     :return: a random available location
     """
-    return choice(list(game['moves']))
+    return game['moves'].random_move(rng if rng is not None else game['rng'])
+
+
+def card_index(game: dict[str, any], location: tuple[int, int] | list[int]) -> int:
+    """
+    :param game: dictionary of the played game
+    :param location: the card's location (row,col) on the board
+    :return: the card's index in the board's flat arrays
+    """
+    return location[0] * game['cols_dimension'] + location[1]
 
 
 def flip_card(game: dict[str, any], location) -> None:
@@ -271,14 +429,23 @@ def flip_card(game: dict[str, any], location) -> None:
     :param game:dictionary of the played game
     :param location: a list of 2 integers
     """
+    is_flipped = game['board']['is_flipped']
+    index = card_index(game, location)
     #convert the current card from flipped to un flipped and reverse according its current status
-    game['board'][location]['is_flipped'] = not game['board'][location]['is_flipped']
+    is_flipped[index] = not is_flipped[index]
     #if the card is flipped, it's location will be removed from the available moves
-    if game['board'][location]['is_flipped']:
-        game['moves'].discard(location)
+    if is_flipped[index]:
+        own_moves(game).discard(location)
+        if game['first_location'] is None:
+            game['first_location'] = location
+        # every computer player sees the flipped card
+        for computer_memory in game['computer_memory'].values():
+            memory_ai.remember_card(computer_memory, location, game['board']['ids'][index])
     else:
         # if the card is un flipped, it will return to the available moves
-        game['moves'].add(location)
+        own_moves(game).add(location)
+        if game['first_location'] == location:
+            game['first_location'] = None
 
 
 def check_match(game, location1: tuple[int, int], location2: tuple[int, int]) -> bool:
@@ -290,7 +457,8 @@ def check_match(game, location1: tuple[int, int], location2: tuple[int, int]) ->
     :return:True if there is a win, else return False
     """
 
-    return game['board'][location1]['id'] == game['board'][location2]['id']
+    ids = game['board']['ids']
+    return ids[card_index(game, location1)] == ids[card_index(game, location2)]
 
 
 def check_end_of_game(game: dict[str, any]) -> bool:
@@ -329,20 +497,20 @@ def get_winner(my_game:dict[str,any])->dict[str,str|int]:
     return maxp
 
 
-def init_board(cards: list[dict[str, any]], rows_num:int) -> dict[tuple[int, int], dict[str, any]]:
+def init_board(cards: array, card_labels: tuple[str, ...]) -> dict[str, any]:
     """
-    build the board with given cards
-    :param cards:  list of cards
-    :param rows_num: int type, number of rows in the board
-    :return: a dict of key=tuple(locations), value: dict type =card
+    build the board with given cards, the cards' properties are kept in flat arrays by the card's index:
+    row * cols_dimension + col
+    :param cards: array of the cards ids
+    :param card_labels: tuple of the labels, by the cards ids
+    :return: a dict of the cards' labels, ids, is_flipped and is_matched flags
     """
-    cols_num = len(cards) // rows_num
-    board = {}
-    for row in range(rows_num):
-        for col in range(cols_num):
-            board[(row, col)] = cards.pop();
-
-    return board
+    return {
+        'labels': card_labels,
+        'ids': cards,
+        'is_flipped': bytearray(len(cards)),
+        'is_matched': bytearray(len(cards))
+    }
 
 
 def set_match(my_game: dict[str, any], location1: tuple[int, int], location2: tuple[int, int]) -> None:
@@ -353,11 +521,17 @@ def set_match(my_game: dict[str, any], location1: tuple[int, int], location2: tu
     :param location2:tuple type, includes 2 int, represent the card's location in the board
     :return:None
     """
-    my_game['board'][location1]['is_matched'] = True
-    my_game['board'][location2]['is_matched'] = True
+    is_matched = my_game['board']['is_matched']
+    is_matched[card_index(my_game, location1)] = True
+    is_matched[card_index(my_game, location2)] = True
     my_game['players'][my_game['turn']]['score'] += 1
-    my_game['moves'].discard(location1)
-    my_game['moves'].discard(location2)
+    moves = own_moves(my_game)
+    moves.discard(location1)
+    moves.discard(location2)
+    my_game['first_location'] = None
+    for computer_memory in my_game['computer_memory'].values():
+        memory_ai.forget_card(computer_memory, location1, is_matched=True)
+        memory_ai.forget_card(computer_memory, location2, is_matched=True)
 
 
 def print_score_board(winner, my_game) -> None:
@@ -377,28 +551,98 @@ def print_score_board(winner, my_game) -> None:
         print(f"{player['name']} | {player['score']}")
 
 
-def play_memory_game() -> None:
+def save_stats(my_game: dict[str, any], moves: dict[str, int]) -> None:
+    """
+    add the finished game to the players' stats and print the leaderboard,
+    the leaderboard (and sqlite3) is imported when the first game is over, never if the stats are off
+    :param my_game: dictionary of the finished game
+    :param moves: the number of turns (2 flipped cards) of every player, by the players' turn
+    """
+    # GAMES_LEADERBOARD=0 (leaderboard.PATH_ENVIRONMENT), checked before the import
+    if os.environ.get('GAMES_LEADERBOARD') == '0':
+        return
+    from leaderboard import get_leaderboard, get_results, print_leaderboard
+    leaderboard = get_leaderboard()
+    if leaderboard is None:
+        return
+    players = my_game['players']
+    results = get_results({turn: player['score'] for turn, player in players.items()})
+    leaderboard.record_game(GAME_TYPE, [(player['name'], results[turn], player['score'], moves.get(turn, 0))
+                                        for turn, player in players.items()])
+    print_leaderboard(GAME_TYPE)
+
+
+def save_game(my_game: dict[str, any]) -> None:
+    """
+    save the game to SAVE_PATH, it's resumed on the next start, the snapshot module is imported only now
+    :param my_game: dictionary of the played game, between turns
+    """
+    from snapshot import save_game as save_snapshot
+    save_snapshot(my_game, SAVE_PATH)
+    print("the game is saved, it can be resumed on the next start")
+
+
+def load_saved_game() -> dict[str, any] | None:
+    """
+    if there is a saved game, ask the player to resume it, a resumed game's file is removed
+    :return: dictionary of the resumed game, or None to start a new game
+    """
+    if not os.path.exists(SAVE_PATH):
+        return None
+    if not get_valid_boolean_response("do you want to resume the saved game (y/n)?", ['y', 'n'], 'y'):
+        return None
+    from snapshot import load_game
+    try:
+        game = load_game(SAVE_PATH)
+    except ValueError as error:
+        print(f"the saved game can't be resumed: {error}")
+        game = None
+    os.remove(SAVE_PATH)
+    return game
+
+
+def play_memory_game(card_labels: tuple[str, ...] = DEFAULT_CARD_LABELS, rows_dimension: int = None,
+                     cols_dimension: int = None, render_mode: str = renderer.PLAIN) -> None:
     """
     Runs the main loop, creates the game handling create a new game or re-match,
     players' turns, guessing and score update
-
+    :param card_labels: tuple of strings, represent the display on the memory cards, see generate_labels
+    :param rows_dimension: int type: number of row in the board, by default the number of labels
+    :param cols_dimension: int type: number of columns in the board, by default all the cards divided by the rows
+    :param render_mode: how the board is drawn: renderer.PLAIN, renderer.ANSI or renderer.HEADLESS
     """
+    rows_dimension = rows_dimension or len(card_labels)
+    validate_layout(len(card_labels), rows_dimension, cols_dimension)
     new_game = True;
     is_rematch = None
     my_game: dict[str, any] = {}
+    board_renderer = renderer.init_renderer(render_mode)
+    resumed_game = load_saved_game()
 
-    while new_game or is_rematch:
+    while new_game or is_rematch or resumed_game:
         new_game = None
         print("Let play Memory game!!")
-
-        # Initialize the game configurations
-        card_labels = ('A', 'B', 'C', 'D', 'E', 'F')
-        my_game = init_game(my_game, is_rematch, card_labels, len(card_labels))
-        get_players(my_game, is_rematch)
+        instrumentation.increment('games')
+
+        if resumed_game is not None:
+            # continue the saved game, with its board and players
+            my_game, resumed_game = resumed_game, None
+            my_game['renderer'] = board_renderer
+            # a rematch is played on the saved game's board, not the launcher's
+            card_labels = tuple(my_game['board']['labels'])
+            rows_dimension, cols_dimension = my_game['rows_dimension'], my_game['cols_dimension']
+        else:
+            # Initialize the game configurations
+            my_game = init_game(my_game, is_rematch, card_labels, rows_dimension, cols_dimension)
+            my_game['renderer'] = board_renderer
+            get_players(my_game, is_rematch)
+        # the turns of every player, for the players' stats
+        moves = {}
+        players_agents = get_agents(my_game)
         # start the game flow
         while True:
             draw_board(my_game)
-            location1 = input_card_location(my_game)
+            location1 = get_location(players_agents, my_game)
             # handling case the user want to rematch the game
             if location1 == REMATCH_SENTINEL:# M value
                 is_rematch = True
@@ -407,11 +651,16 @@ def play_memory_game() -> None:
             elif location1 == RESTART_SENTINEL: # R value
                 new_game = True
                 break
+            # handling case the user want to save the game and quit
+            elif location1 == SAVE_SENTINEL: # S value
+                save_game(my_game)
+                new_game = is_rematch = False
+                break
             # after receiving a valid first card location
             flip_card(my_game, location1)
             # display the board after flipping first card
             draw_board(my_game)
-            location2 = input_card_location(my_game)
+            location2 = get_location(players_agents, my_game)
             # handling case the user want to rematch the game
             if location2 == REMATCH_SENTINEL:
                 is_rematch = True
@@ -420,8 +669,15 @@ def play_memory_game() -> None:
             elif location2 == RESTART_SENTINEL:
                 new_game = True
                 break
+            # handling case the user want to save the game and quit, the turn is saved from its start
+            elif location2 == SAVE_SENTINEL:
+                flip_card(my_game, location1)
+                save_game(my_game)
+                new_game = is_rematch = False
+                break
             #after receiving a valid second card location
             flip_card(my_game, location2)
+            moves[my_game['turn']] = moves.get(my_game['turn'], 0) + 1
             # display board after flipped second card
             draw_board(my_game)
             if check_match(my_game, location1, location2):
@@ -431,6 +687,7 @@ def play_memory_game() -> None:
                 if check_end_of_game(my_game):
                     winner = get_winner(my_game)
                     print_score_board(winner, my_game)
+                    save_stats(my_game, moves)
                     break;
             else: #2 cards are not equal
                 print("NO MATCH")
@@ -451,8 +708,11 @@ def play_memory_game() -> None:
                 new_game = get_valid_boolean_response("do you want to play a new game (y/n)?", ['y', 'n'], 'y')
     else:
         # handling neither rematch not new game use case, if the game over successfully
+        renderer.close_renderer(board_renderer)
+        instrumentation.report()
         print("goodbye!")
 
 
 if __name__ == "__main__":
+    instrumentation.enable_from_environment()
     play_memory_game()
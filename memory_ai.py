@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from random import Random
+
+import seeded_random
+from move_set import MoveSet
+
+# capacity - the maximum number of cards the computer remembers (None - no limit)
+# decay - the chance to forget the oldest remembered card whenever a card is seen
+COMPUTER_LEVELS = {
+    'easy': {'capacity': 4, 'decay': 0.5},
+    'medium': {'capacity': 12, 'decay': 0.1},
+    'hard': {'capacity': None, 'decay': 0.0},
+}
+
+
+def init_computer_memory(locations, capacity: int = None, decay: float = 0.0,
+                         rng: Random = None) -> dict[str, any]:
+    """
+    create the computer's memory of the seen cards
+    :param locations: iterable of all the cards' locations on the board, a MoveSet is copied at once
+    :param capacity: the maximum number of cards to remember, None - no limit
+    :param decay: the chance to forget the oldest remembered card whenever a card is seen
+    :param rng: the random generator of the computer's choices, usually the game's generator
+    :return: dict type, with the seen cards (location -> id, oldest first), the seen locations by card id,
+    the ids of the known pairs and the locations that were never seen
+    """
+    return {
+        'seen': OrderedDict(),
+        'by_id': {},
+        'known_pairs': MoveSet(),
+        'unseen': locations.copy() if isinstance(locations, MoveSet) else MoveSet(locations),
+        'capacity': capacity,
+        'decay': decay,
+        'rng': seeded_random.get_rng(rng)
+    }
+
+
+def remember_card(computer_memory: dict[str, any], location: tuple[int, int], card_id: int) -> None:
+    """
+    remember a flipped card, the oldest card is forgotten when the memory is full or by the decay chance
+    :param computer_memory: the computer's memory
+    :param location: the card's location (row,col)
+    :param card_id: the card's id
+    """
+    seen = computer_memory['seen']
+    if location in seen:
+        seen.move_to_end(location)
+        return
+    seen[location] = card_id
+    computer_memory['unseen'].discard(location)
+    locations = computer_memory['by_id'].setdefault(card_id, [])
+    locations.append(location)
+    if len(locations) == 2:
+        computer_memory['known_pairs'].add(card_id)
+    capacity = computer_memory['capacity']
+    if capacity is not None and len(seen) > capacity or computer_memory['rng'].random() < computer_memory['decay']:
+        forget_card(computer_memory, next(iter(seen)))
+
+
+def forget_card(computer_memory: dict[str, any], location: tuple[int, int], is_matched: bool = False) -> None:
+    """
+    remove a card from the memory
+    :param computer_memory: the computer's memory
+    :param location: the card's location (row,col)
+    :param is_matched: True if the card was matched and left the game, else it can be explored again
+    """
+    card_id = computer_memory['seen'].pop(location, None)
+    if card_id is not None:
+        locations = computer_memory['by_id'][card_id]
+        locations.remove(location)
+        computer_memory['known_pairs'].discard(card_id)
+    if is_matched:
+        computer_memory['unseen'].discard(location)
+    elif card_id is not None:
+        computer_memory['unseen'].add(location)
+
+
+def choose_first_location(computer_memory: dict[str, any]) -> tuple[int, int] | None:
+    """
+    :param computer_memory: the computer's memory
+    :return: a card of a known pair, else a card that was never seen, None if there is no such card
+    """
+    known_pairs = computer_memory['known_pairs']
+    if known_pairs:
+        return computer_memory['by_id'][known_pairs.random_move(computer_memory['rng'])][0]
+    unseen = computer_memory['unseen']
+    return unseen.random_move(computer_memory['rng']) if unseen else None
+
+
+def choose_second_location(computer_memory: dict[str, any], first_location: tuple[int, int],
+                           card_id: int) -> tuple[int, int] | None:
+    """
+    :param computer_memory: the computer's memory
+    :param first_location: the location of the card flipped first in the turn
+    :param card_id: the id of the first card
+    :return: the remembered matching card, else a card that was never seen, None if there is no such card
+    """
+    for location in computer_memory['by_id'].get(card_id, ()):
+        if location != first_location:
+            return location
+    unseen = computer_memory['unseen']
+    # a forgotten first card is back in the unseen cards, but it can't be flipped twice
+    is_first_unseen = first_location in unseen
+    unseen.discard(first_location)
+    location = unseen.random_move(computer_memory['rng']) if unseen else None
+    if is_first_unseen:
+        unseen.add(first_location)
+    return location
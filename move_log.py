@@ -0,0 +1,226 @@
+# append only binary log of played games.
+# the file starts with a header, followed by the games' records, every record is:
+# a game header (game type, number of players, rows, columns, k in a row to win, seed and number of moves),
+# memory games only - the cards ids by the cards' indexes (2 bytes each),
+# and the moves (2 bytes each): player index * MAX_CELLS + the cell's index (row * columns + col).
+# all the numbers are little endian.
+# scan a log file by running: python move_log.py <path>
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+import engine
+import memory
+
+LOG_MAGIC = b'GLOG'
+LOG_VERSION = 2
+FILE_HEADER = struct.Struct('<4sB')
+GAME_HEADER = struct.Struct('<BBHHHQI')
+GAME_CODES = {engine.TIC_TAC_TOE: 0, engine.MEMORY: 1}
+GAME_TYPES_BY_CODE = {code: game_type for game_type, code in GAME_CODES.items()}
+MAX_CELLS = 4096
+MAX_PLAYERS = 16
+SEED_MASK = (1 << 64) - 1
+DEFAULT_BATCH_SIZE = 1 << 20
+
+
+def to_little_endian(values: array) -> bytes:
+    """
+    :param values: array of 2 bytes values
+    :return: the values' bytes in little endian
+    """
+    if sys.byteorder == 'big':
+        values = array('H', values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_little_endian(data: bytes) -> array:
+    """
+    :param data: little endian bytes of 2 bytes values
+    :return: array of the values
+    """
+    values = array('H')
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def encode_game(game: dict[str, any], seed: int = 0) -> bytes:
+    """
+    :param game: dictionary of a headless game created with record=True
+    :param seed: the seed the game was played with
+    :return: the game's record
+    :raise ValueError: if the board or the number of players are too big for the log format
+    """
+    if game['type'] == engine.TIC_TAC_TOE:
+        rows, cols, k = len(game['board']), len(game['board'][0]), game['k']
+        turns = game['icons']
+        cards = b''
+    else:
+        rows, cols, k = game['rows_dimension'], game['cols_dimension'], 2
+        turns = tuple(game['players'])
+        cards = to_little_endian(array('H', game['board']['ids']))
+    if rows * cols > MAX_CELLS or len(turns) > MAX_PLAYERS:
+        raise ValueError("the game is too big for the move log")
+    players = {turn: index * MAX_CELLS for index, turn in enumerate(turns)}
+    moves = array('H', [players[turn] + row * cols + col for turn, (row, col) in game['history']])
+    header = GAME_HEADER.pack(GAME_CODES[game['type']], len(turns), rows, cols, k, seed & SEED_MASK, len(moves))
+    return header + cards + to_little_endian(moves)
+
+
+class MoveLogWriter:
+    """
+    append games' records to a log file, the records are buffered and written in batches
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        :param path: the log file's path, a new file is created with the log header
+        :param batch_size: number of buffered bytes that triggers a write
+        :raise ValueError: if the file exists and isn't a move log
+        """
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'rb') as log_file:
+                check_header(log_file.read(FILE_HEADER.size))
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(LOG_MAGIC, LOG_VERSION))
+        self.buffer = bytearray()
+        self.batch_size = batch_size
+
+    def write_game(self, game: dict[str, any], seed: int = 0) -> None:
+        """
+        :param game: dictionary of a headless game created with record=True
+        :param seed: the seed the game was played with
+        """
+        self.write_records(encode_game(game, seed))
+
+    def write_records(self, records: bytes) -> None:
+        """
+        :param records: encoded games' records, e.g. a chunk of games encoded in a worker process
+        """
+        self.buffer += records
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        write the buffered records to the file
+        """
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self) -> None:
+        """
+        write the buffered records and close the file
+        """
+        self.flush()
+        self.file.close()
+
+    def __enter__(self) -> 'MoveLogWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def check_header(data: bytes) -> None:
+    """
+    :param data: the first bytes of a log file
+    :raise ValueError: if it's not a move log of the supported version
+    """
+    if len(data) < FILE_HEADER.size or FILE_HEADER.unpack_from(data) != (LOG_MAGIC, LOG_VERSION):
+        raise ValueError("invalid move log file")
+
+
+def iter_games(path: str):
+    """
+    stream the games' records of a log file, the file is memory mapped so only the read records are loaded
+    :param path: the log file's path
+    :return: generator of the records: dict type, with the game's type, players, rows, cols, k, seed,
+    cards (memory games) and moves
+    :raise ValueError: if it's not a move log, or its last record is truncated
+    """
+    with open(path, 'rb') as log_file:
+        if os.fstat(log_file.fileno()).st_size < FILE_HEADER.size:
+            raise ValueError("invalid move log file")
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as log:
+            check_header(log[:FILE_HEADER.size])
+            offset, size = FILE_HEADER.size, len(log)
+            while offset < size:
+                if offset + GAME_HEADER.size > size:
+                    raise ValueError("truncated move log")
+                type_code, players, rows, cols, k, seed, moves = GAME_HEADER.unpack_from(log, offset)
+                offset += GAME_HEADER.size
+                cards_end = offset + 2 * rows * cols if type_code == GAME_CODES[engine.MEMORY] else offset
+                moves_end = cards_end + 2 * moves
+                if moves_end > size:
+                    raise ValueError("truncated move log")
+                yield {
+                    'type': GAME_TYPES_BY_CODE[type_code],
+                    'players': players,
+                    'rows': rows,
+                    'cols': cols,
+                    'k': k,
+                    'seed': seed,
+                    'cards': from_little_endian(log[offset:cards_end]) if cards_end > offset else None,
+                    'moves': from_little_endian(log[cards_end:moves_end])
+                }
+                offset = moves_end
+
+
+def replay_game(record: dict[str, any]) -> dict[str, any]:
+    """
+    rebuild a logged game by playing its moves again through set_square/flip_card
+    :param record: a game's record from iter_games
+    :return: dictionary of the headless game after its last move
+    """
+    rows, cols = record['rows'], record['cols']
+    strategies = (engine.HUMAN,) * record['players']
+    if record['type'] == engine.TIC_TAC_TOE:
+        game = engine.create_game(engine.TIC_TAC_TOE, rows, strategies, cols_dimension=cols, k=record['k'])
+        turns = game['icons']
+    else:
+        game = engine.create_game(engine.MEMORY, rows * cols // 2, strategies)
+        # the logged layout replaces the shuffled cards
+        game['board'] = memory.init_board(record['cards'], game['board']['labels'])
+        game['rows_dimension'], game['cols_dimension'] = rows, cols
+        game['moves'] = memory.possible_moves(rows, cols)
+        turns = tuple(game['players'])
+    for move in record['moves']:
+        player, cell = divmod(move, MAX_CELLS)
+        game['turn'] = turns[player]
+        engine.apply_move(game, divmod(cell, cols))
+    return game
+
+
+def main(arguments: list[str] = None) -> None:
+    """
+    scan a log file, replay all its games and print the totals
+    :param arguments: the command line arguments, sys.argv by default
+    """
+    arguments = sys.argv[1:] if arguments is None else arguments
+    if len(arguments) != 1:
+        print("usage: python move_log.py <path>")
+        return
+    start = time.perf_counter()
+    games, moves, statuses = 0, 0, {}
+    for record in iter_games(arguments[0]):
+        status = replay_game(record)['status']
+        statuses[status] = statuses.get(status, 0) + 1
+        games += 1
+        moves += len(record['moves'])
+    seconds = time.perf_counter() - start
+    print(f"games: {games}, moves: {moves}, results: {statuses}")
+    print(f"replayed games per second: {games / max(seconds, 1e-9):,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# the error codes of parse_cell, the cells' indexes are never negative
+INVALID_INPUT = -1
+OUT_OF_RANGE = -2
+# 'row,col' (1 based), any more numbers after them are allowed and ignored, like str.isdigit() they can be any digits
+MOVE_PATTERN = r'(\d+),(\d+)((?:,[^,]+)*)'
+BYTES_MOVE_PATTERN = rb'([0-9]+),([0-9]+)(?:,[0-9]+)*'
+# boards up to this number of cells get a table of all their moves' texts
+MAX_TABLE_CELLS = 4096
+
+# cache of the moves' tables by the board's (rows, cols)
+_tables_cache: dict[tuple[int, int], dict[str | bytes, int]] = {}
+# the compiled patterns by their type (str, bytes), compiled on the first move that isn't in a table
+_patterns_cache: dict[type, any] = {}
+
+
+def get_move_table(rows: int, cols: int) -> dict[str | bytes, int]:
+    """
+    :param rows: number of rows in the board
+    :param cols: number of columns in the board
+    :return: the cell's index (row * cols + col) of every move's text 'row,col' (1 based), as str and as bytes
+    """
+    if (rows, cols) not in _tables_cache:
+        table = {}
+        for row in range(rows):
+            for col in range(cols):
+                text = f"{row + 1},{col + 1}"
+                table[text] = table[text.encode()] = row * cols + col
+        _tables_cache[(rows, cols)] = table
+    return _tables_cache[(rows, cols)]
+
+
+def get_pattern(is_text: bool):
+    """
+    re is imported only when a move isn't in a table, so a plain game starts without it
+    :param is_text: True - the str pattern, False - the bytes pattern
+    :return: the compiled move's pattern
+    """
+    pattern_type = str if is_text else bytes
+    if pattern_type not in _patterns_cache:
+        import re
+        _patterns_cache[pattern_type] = re.compile(MOVE_PATTERN if is_text else BYTES_MOVE_PATTERN)
+    return _patterns_cache[pattern_type]
+
+
+def parse_cell(location: str | bytes | bytearray | memoryview, rows: int, cols: int) -> int:
+    """
+    parse a move entered as 'row,col' (1 based), the usual moves are looked up in the board's table of moves,
+    so nothing is allocated, any other text is matched by the precompiled pattern
+    :param location: the entered text, or a raw buffer of its bytes
+    :param rows: number of rows in the board
+    :param cols: number of columns in the board
+    :return: the cell's index (row * cols + col), or the error code: INVALID_INPUT or OUT_OF_RANGE
+    """
+    is_text = isinstance(location, str)
+    if (is_text or isinstance(location, bytes)) and rows * cols <= MAX_TABLE_CELLS:
+        cell = get_move_table(rows, cols).get(location)
+        if cell is not None:
+            return cell
+    match = get_pattern(is_text).fullmatch(location)
+    if match is None or is_text and match[3] and not match[3].replace(',', '').isdigit():
+        return INVALID_INPUT
+    row, col = int(match[1]) - 1, int(match[2]) - 1
+    if not 0 <= row < rows or not 0 <= col < cols:
+        return OUT_OF_RANGE
+    return row * cols + col
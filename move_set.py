@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from random import choice
+
+# number of boards whose full move sets are kept, the least recently used board's set is evicted first
+MAX_TEMPLATES = 16
+
+
+class MoveSet:
+    """
+    a set of the available moves with O(1) add, discard and random selection:
+    the moves are kept in a list, and every move's index in the list is kept in a dict,
+    a discarded move is replaced by the last move in the list.
+    a set can be shared copy-on-write by several games (snapshot.clone_game): every owner calls own() before a change
+    """
+    __slots__ = ('items', 'positions', 'shares')
+
+    def __init__(self, moves=()):
+        """
+        :param moves: iterable of the initial moves
+        """
+        self.items: list = []
+        self.positions: dict = {}
+        # number of the set's owners beside the first one
+        self.shares = 0
+        for move in moves:
+            self.add(move)
+
+    def add(self, move) -> None:
+        """
+        :param move: the move to add, nothing is changed if it's already in the set
+        """
+        if move not in self.positions:
+            self.positions[move] = len(self.items)
+            self.items.append(move)
+
+    def discard(self, move) -> None:
+        """
+        :param move: the move to remove, nothing is changed if it's not in the set
+        """
+        index = self.positions.pop(move, None)
+        if index is None:
+            return
+        last = self.items.pop()
+        if index < len(self.items):
+            self.items[index] = last
+            self.positions[last] = index
+
+    def random_move(self, rng=None):
+        """
+        :param rng: the random generator (random.Random), the random module's generator by default
+        :return: a uniform random move of the set, the set must not be empty
+        """
+        if rng is None:
+            return choice(self.items)
+        return rng.choice(self.items)
+
+    def copy(self) -> 'MoveSet':
+        """
+        :return: a new set with the same moves
+        """
+        moves = MoveSet.__new__(MoveSet)
+        moves.items = self.items[:]
+        moves.positions = self.positions.copy()
+        moves.shares = 0
+        return moves
+
+    def share(self) -> 'MoveSet':
+        """
+        add an owner of the set, e.g. a cloned game
+        :return: the set itself
+        """
+        self.shares += 1
+        return self
+
+    def own(self) -> 'MoveSet':
+        """
+        called by an owner before it changes the set
+        :return: the set itself if it has one owner, else a private copy and the set has one owner less
+        """
+        if not self.shares:
+            return self
+        self.shares -= 1
+        return self.copy()
+
+    def __contains__(self, move) -> bool:
+        return move in self.positions
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def own_moves(game: dict[str, any]) -> MoveSet:
+    """
+    :param game: dictionary of the played game, of any of the games
+    :return: the game's available moves, copied first if they are shared with a clone
+    """
+    moves = game['moves'] = game['moves'].own()
+    return moves
+
+
+# the full move sets of the recently played boards, by the board's (rows, cols), only copied, never changed
+_templates_cache: OrderedDict[tuple[int, int], MoveSet] = OrderedDict()
+
+
+def board_moves(rows: int, cols: int) -> MoveSet:
+    """
+    the moves of an empty board, copied from the board's template: a rematch or the next simulated game on the same
+    board copies a list and a dict instead of adding every move again
+    :param rows: number of rows in the board
+    :param cols: number of columns in the board
+    :return: a new set of all the board's moves by (row,col), in the rows' order
+    """
+    template = _templates_cache.get((rows, cols))
+    if template is None:
+        template = MoveSet((row, col) for row in range(rows) for col in range(cols))
+        _templates_cache[(rows, cols)] = template
+        if len(_templates_cache) > MAX_TEMPLATES:
+            _templates_cache.popitem(last=False)
+    else:
+        _templates_cache.move_to_end((rows, cols))
+    return template.copy()
@@ -0,0 +1,269 @@
+# solved positions book of the 3x3 Tic - Tac - Toe game.
+# every position is coded in base 3 (0 - empty cell, 1 - X, 2 - O), the book keeps one byte for every code:
+# the best cell of the position's canonical symmetry, or NO_MOVE for positions which are not in the book.
+# build and check the book file by running: python opening_book.py
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+
+from tic_tac_toe_ai import find_best_cell, get_symmetries, TranspositionTable
+from tic_tac_toe_state import TicTacToeState, EMPTY_CELL
+
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_book.bin')
+BOOK_MAGIC = b'TTTB'
+BOOK_VERSION = 1
+HEADER = struct.Struct('<4sBB')
+N = 3
+CELLS = N * N
+CODES = 3 ** CELLS
+# the header and one byte for every code
+BOOK_SIZE = HEADER.size + CODES
+NO_MOVE = 0xFF
+POWERS = tuple(3 ** cell for cell in range(CELLS))
+SYMMETRIES = get_symmetries(N)
+INVERSE_SYMMETRIES = tuple(tuple(sorted(range(CELLS), key=permutation.__getitem__)) for permutation in SYMMETRIES)
+WINNING_LINES = ((0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6))
+
+# the memory mapped book, opened once on the first lookup
+_book: mmap.mmap | None = None
+# the error of a book that failed its check, the computer searches without the book from then on
+_book_error: ValueError | None = None
+
+
+def canonical_code(cells: list[int]) -> tuple[int, int]:
+    """
+    :param cells: list of 9 values of the cells: 0 - empty cell, 1 - X, 2 - O
+    :return: a tuple of the smallest base 3 code of all the position's symmetries, and the index of its symmetry
+    """
+    best_code, best_symmetry = CODES, 0
+    for index, permutation in enumerate(SYMMETRIES):
+        code = 0
+        for cell, value in enumerate(cells):
+            if value:
+                code += value * POWERS[permutation[cell]]
+        if code < best_code:
+            best_code, best_symmetry = code, index
+    return best_code, best_symmetry
+
+
+def decode(code: int) -> list[int]:
+    """
+    :param code: base 3 code of a position
+    :return: list of 9 values of the cells
+    """
+    cells = []
+    for _ in range(CELLS):
+        code, value = divmod(code, 3)
+        cells.append(value)
+    return cells
+
+
+def is_win(cells: list[int], value: int) -> bool:
+    """
+    :param cells: list of 9 values of the cells
+    :param value: the player's value, 1 - X, 2 - O
+    :return: True if the player owns a full line, else return False
+    """
+    return any(cells[a] == cells[b] == cells[c] == value for a, b, c in WINNING_LINES)
+
+
+def to_move(cells: list[int]) -> int:
+    """
+    :param cells: list of 9 values of the cells
+    :return: the value of the player to move, X always starts
+    """
+    return 1 if cells.count(1) == cells.count(2) else 2
+
+
+def reachable_positions() -> list[int]:
+    """
+    walk all the games from the empty board, every position is kept once for all its symmetries
+    :return: a sorted list of the canonical codes of all the reachable positions which are not over
+    """
+    positions = set()
+    stack = [[0] * CELLS]
+    while stack:
+        cells = stack.pop()
+        code = canonical_code(cells)[0]
+        if code in positions:
+            continue
+        positions.add(code)
+        player = to_move(cells)
+        for cell in range(CELLS):
+            if not cells[cell]:
+                cells[cell] = player
+                if not is_win(cells, player) and 0 in cells:
+                    stack.append(cells[:])
+                cells[cell] = 0
+    return sorted(positions)
+
+
+def to_state(cells: list[int]) -> TicTacToeState:
+    """
+    :param cells: list of 9 values of the cells
+    :return: a TicTacToeState of the position
+    """
+    return TicTacToeState.from_cells(N, cells, to_move(cells) - 1)
+
+
+def build_book() -> bytes:
+    """
+    solve every reachable position with a full depth search
+    :return: the book's content, header and one byte for every base 3 code
+    """
+    table = bytearray([NO_MOVE]) * CODES
+    transpositions = TranspositionTable(capacity=CODES * 2)
+    for code in reachable_positions():
+        table[code] = find_best_cell(to_state(decode(code)), time_budget=float('inf'), table=transpositions)
+    return HEADER.pack(BOOK_MAGIC, BOOK_VERSION, N) + bytes(table)
+
+
+def exhaustive_values(cells: list[int], values: dict[int, int]) -> int:
+    """
+    plain minimax over all the continuations of the position, without pruning
+    :param cells: list of 9 values of the cells, the position is not over
+    :param values: already computed values by the position's code
+    :return: 1 if the player to move wins, -1 if he loses, 0 for a tie
+    """
+    code = sum(value * POWERS[cell] for cell, value in enumerate(cells))
+    if code not in values:
+        player = to_move(cells)
+        best = -1
+        for cell in range(CELLS):
+            if not cells[cell]:
+                best = max(best, move_value(cells, cell, player, values))
+        values[code] = best
+    return values[code]
+
+
+def move_value(cells: list[int], cell: int, player: int, values: dict[int, int]) -> int:
+    """
+    :param cells: list of 9 values of the cells
+    :param cell: the played cell, must be empty
+    :param player: the value of the player to move
+    :param values: already computed values by the position's code
+    :return: the value of playing the cell for the player: 1 - win, -1 - loss, 0 - tie
+    """
+    cells[cell] = player
+    if is_win(cells, player):
+        value = 1
+    elif 0 not in cells:
+        value = 0
+    else:
+        value = -exhaustive_values(cells, values)
+    cells[cell] = 0
+    return value
+
+
+def verify_book(book: bytes) -> int:
+    """
+    check every move of the book against an exhaustive search
+    :param book: the book's content
+    :return: number of checked positions
+    :raise ValueError: if the book has a wrong header or a move which is not the best
+    """
+    magic, version, n = HEADER.unpack_from(book)
+    if magic != BOOK_MAGIC or version != BOOK_VERSION or n != N or len(book) != BOOK_SIZE:
+        raise ValueError("invalid opening book file")
+    values: dict[int, int] = {}
+    positions = reachable_positions()
+    for code in positions:
+        cells = decode(code)
+        move = book[HEADER.size + code]
+        if move == NO_MOVE or cells[move]:
+            raise ValueError(f"missing move for position {code}")
+        if move_value(cells, move, to_move(cells), values) != exhaustive_values(cells, values):
+            raise ValueError(f"wrong move {move} for position {code}")
+    return len(positions)
+
+
+def write_book(book: bytes, path: str) -> None:
+    """
+    write the book to a temporary file in the same directory and rename it, so a process that opens the book
+    (e.g. a server connection or a simulation worker, while another process builds it) never reads a partial file
+    :param book: the book's content
+    :param path: the book file's path
+    """
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as book_file:
+            book_file.write(book)
+        # mkstemp creates the file readable by its owner only
+        os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def load_book(path: str = BOOK_PATH) -> mmap.mmap:
+    """
+    memory map the book file, the file is built and checked against an exhaustive search if it doesn't exist yet,
+    or if its size isn't a book's size (e.g. truncated)
+    :param path: the book file's path
+    :return: the memory mapped book
+    :raise ValueError: if the file isn't a book, or the built book failed its check, it's not written then
+    """
+    global _book, _book_error
+    if _book_error is not None:
+        raise _book_error
+    if _book is None:
+        if not os.path.exists(path) or os.path.getsize(path) != BOOK_SIZE:
+            book = build_book()
+            try:
+                verify_book(book)
+            except ValueError as error:
+                _book_error = error
+                raise
+            write_book(book, path)
+        with open(path, 'rb') as book_file:
+            book = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n = HEADER.unpack_from(book)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION or n != N or len(book) != BOOK_SIZE:
+            raise ValueError("invalid opening book file")
+        _book = book
+    return _book
+
+
+def get_book_location(game: dict[str, any]) -> list[int] | None:
+    """
+    look up the best cell of a 3x3 game with 3 in a row in the book
+    :param game: dictionary of the played game
+    :return: list of 2 values of the best cell, or None if the position is not in the book or the book is invalid
+    """
+    board = game['board']
+    if len(board) != N or len(board[0]) != N or game['k'] != N:
+        return None
+    x_icon, o_icon = game['icons']
+    cells = [0 if cell == EMPTY_CELL else 1 if cell == x_icon else 2 for row in board for cell in row]
+    if game['turn'] != (x_icon if to_move(cells) == 1 else o_icon):
+        return None
+    code, symmetry = canonical_code(cells)
+    try:
+        book = load_book()
+    except ValueError:
+        # a book that can't be trusted is never used, the computer searches the position
+        return None
+    move = book[HEADER.size + code]
+    if move == NO_MOVE:
+        return None
+    return list(divmod(INVERSE_SYMMETRIES[symmetry][move], N))
+
+
+def main() -> None:
+    """
+    build the book file and check it against an exhaustive search
+    """
+    path = sys.argv[1] if len(sys.argv) > 1 else BOOK_PATH
+    start = time.perf_counter()
+    book = build_book()
+    checked = verify_book(book)
+    write_book(book, path)
+    print(f"{checked} positions solved and checked in {time.perf_counter() - start:.2f}s, saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import sys
+
+PLAIN, ANSI, HEADLESS = 'plain', 'ansi', 'headless'
+RENDER_MODES = (PLAIN, ANSI, HEADLESS)
+SEPARATOR = "---------------------------"
+
+
+def init_renderer(mode: str = PLAIN, stream=None) -> dict[str, any]:
+    """
+    create a board renderer
+    :param mode: PLAIN - write every frame, ANSI - redraw only the changed cells in place, HEADLESS - don't write
+    :param stream: text stream to write to, sys.stdout by default
+    :return: dict type, with the mode, the stream and the last drawn frame
+    """
+    if mode not in RENDER_MODES:
+        raise ValueError(f"unknown render mode: {mode}")
+    return {'mode': mode, 'stream': stream, 'last_rows': None}
+
+
+def is_headless(board_renderer: dict[str, any] | None) -> bool:
+    """
+    :param board_renderer: a renderer from init_renderer, or None
+    :return: True if nothing should be drawn, so the frame doesn't need to be built
+    """
+    return board_renderer is not None and board_renderer['mode'] == HEADLESS
+
+
+def build_frame(rows: list[list[str]], cols_dimension: int) -> str:
+    """
+    build the whole board in a single string:
+    a separator line, the columns numbers line, and every row with its number
+    :param rows: the displayed cells, row by row
+    :param cols_dimension: number of columns in the board
+    :return: the frame's text
+    """
+    lines = [SEPARATOR, '  ' + ''.join(f"{col} " for col in range(1, cols_dimension + 1))]
+    for index, row in enumerate(rows):
+        lines.append(f"{index + 1} {' '.join(row)}")
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def build_diff(rows: list[list[str]], last_rows: list[list[str]]) -> str | None:
+    """
+    build the ANSI escape sequences that rewrite only the changed cells of a board drawn at the top of the screen
+    :param rows: the displayed cells, row by row
+    :param last_rows: the cells of the last drawn frame
+    :return: the escape sequences, or None if the board's shape or the cells' widths changed
+    """
+    if len(rows) != len(last_rows):
+        return None
+    parts = []
+    for index, (row, last_row) in enumerate(zip(rows, last_rows)):
+        if row == last_row:
+            continue
+        if len(row) != len(last_row):
+            return None
+        # the frame's 2 first lines are the separator and the columns numbers
+        column = len(str(index + 1)) + 2
+        for cell, last_cell in zip(row, last_row):
+            if len(cell) != len(last_cell):
+                return None
+            if cell != last_cell:
+                parts.append(f"\x1b[{index + 3};{column}H{cell}")
+            column += len(cell) + 1
+    # save the cursor, rewrite the cells and restore the cursor
+    return '\x1b7' + ''.join(parts) + '\x1b8' if parts else ''
+
+
+def draw_frame(board_renderer: dict[str, any] | None, rows: list[list[str]], cols_dimension: int) -> None:
+    """
+    write the board with a single write call
+    :param board_renderer: a renderer from init_renderer, None - PLAIN to sys.stdout
+    :param rows: the displayed cells, row by row
+    :param cols_dimension: number of columns in the board
+    """
+    mode = board_renderer['mode'] if board_renderer else PLAIN
+    if mode == HEADLESS:
+        return
+    stream = board_renderer and board_renderer['stream'] or sys.stdout
+    if mode == PLAIN:
+        stream.write(build_frame(rows, cols_dimension))
+        stream.flush()
+        return
+
+    last_rows = board_renderer['last_rows']
+    text = build_diff(rows, last_rows) if last_rows is not None else None
+    if text is None:
+        # clear the screen, draw the board at the top and keep the text below it scrolling under the board
+        text = f"\x1b[r\x1b[2J\x1b[H{build_frame(rows, cols_dimension)}\x1b[{len(rows) + 3}r\x1b[{len(rows) + 3};1H"
+    board_renderer['last_rows'] = [row[:] for row in rows]
+    stream.write(text)
+    stream.flush()
+
+
+def close_renderer(board_renderer: dict[str, any] | None) -> None:
+    """
+    release the screen's scrolling region of an ANSI renderer
+    :param board_renderer: a renderer from init_renderer, or None
+    """
+    if board_renderer and board_renderer['mode'] == ANSI and board_renderer['last_rows'] is not None:
+        (board_renderer['stream'] or sys.stdout).write('\x1b[r')
+        board_renderer['last_rows'] = None
@@ -0,0 +1,126 @@
+import os
+import random
+
+MERSENNE, COUNTER = 'mersenne', 'counter'
+RNG_KINDS = (MERSENNE, COUNTER)
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+# the generator of the games which are not given a generator or a seed
+default_rng = random.Random()
+if hasattr(os, 'register_at_fork'):
+    # like the random module, a forked worker process must not repeat its parent's numbers
+    os.register_at_fork(after_in_child=default_rng.seed)
+
+
+def mix64(value: int) -> int:
+    """
+    the splitmix64 finalizer, every bit of the value changes about half of the result's bits
+    :param value: 64 bit integer
+    :return: the mixed 64 bit integer
+    """
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+class CounterRandom(random.Random):
+    """
+    counter based generator: the i-th number is the hash of the seed's key and i (splitmix64),
+    so seeding costs O(1) and a generator can be created for every game of a bulk simulation,
+    seeding random.Random initializes its whole Mersenne Twister state
+    """
+
+    def __init__(self, seed: int = None):
+        """
+        :param seed: 64 bit seed, None - a seed from the OS
+        """
+        self.key = 0
+        self.counter = 0
+        super().__init__(seed)
+
+    def seed(self, a: int = None, version: int = 2) -> None:
+        """
+        :param a: 64 bit seed, None - a seed from the OS
+        :param version: ignored, for random.Random's compatibility
+        """
+        if a is None:
+            a = int.from_bytes(os.urandom(8), 'little')
+        if not isinstance(a, int):
+            raise TypeError("the seed of CounterRandom must be an integer")
+        self.key = mix64(a & MASK64)
+        self.counter = 0
+        self.gauss_next = None
+
+    def next64(self) -> int:
+        """
+        :return: the next 64 random bits
+        """
+        self.counter += 1
+        return mix64((self.key + self.counter * GOLDEN_GAMMA) & MASK64)
+
+    def _randbelow(self, n: int) -> int:
+        """
+        the base of choice, shuffle and randrange, inlined for speed
+        :param n: the exclusive upper bound, n < 2 ** 64
+        :return: random integer in [0, n), by the high bits of next64() * n
+        """
+        self.counter += 1
+        value = (self.key + self.counter * GOLDEN_GAMMA) & MASK64
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+        return ((value ^ (value >> 31)) * n) >> 64
+
+    def choice(self, seq):
+        """
+        :param seq: a non empty sequence
+        :return: a uniform random item of the sequence
+        """
+        return seq[self._randbelow(len(seq))]
+
+    def random(self) -> float:
+        """
+        :return: the next random float in [0.0, 1.0)
+        """
+        return (self.next64() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k: int) -> int:
+        """
+        :param k: number of bits
+        :return: non negative integer with k random bits
+        """
+        if k <= 64:
+            return self.next64() >> (64 - k)
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self.next64() << shift
+        return bits & ((1 << k) - 1)
+
+    def getstate(self) -> tuple[int, int, float | None]:
+        return self.key, self.counter, self.gauss_next
+
+    def setstate(self, state: tuple[int, int, float | None]) -> None:
+        self.key, self.counter, self.gauss_next = state
+
+
+def make_rng(seed: int = None, kind: str = MERSENNE) -> random.Random:
+    """
+    :param seed: the generator's seed, None - a seed from the OS
+    :param kind: MERSENNE - random.Random, COUNTER - CounterRandom
+    :return: a new generator
+    """
+    if kind not in RNG_KINDS:
+        raise ValueError(f"unknown generator kind: {kind}")
+    return CounterRandom(seed) if kind == COUNTER else random.Random(seed)
+
+
+def get_rng(rng: random.Random | int | None = None) -> random.Random:
+    """
+    :param rng: a generator, a seed of a new random.Random, or None - the shared default generator
+    :return: the generator to use
+    """
+    if rng is None:
+        return default_rng
+    if isinstance(rng, int):
+        return random.Random(rng)
+    return rng
@@ -0,0 +1,256 @@
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import engine
+import memory
+import renderer
+import tic_tac_toe
+
+# every prompt line starts with the PROMPT mark, the client answers every prompt with a single line
+PROMPT = '?'
+GAME_PROMPT = f"{PROMPT} game ({'/'.join(engine.GAME_TYPES)}) [size] [strategy]:\n"
+MOVE_PROMPT = f"{PROMPT} your move (row,col):\n"
+REPLAY_PROMPT = f"{PROMPT} play again (y/n):\n"
+DEFAULT_SIZES = {engine.TIC_TAC_TOE: 3, engine.MEMORY: 6}
+# strategies which search, their moves are computed in the process pool, the other strategies are O(1)
+SEARCH_STRATEGIES = ('ai', 'mcts')
+MAX_SIZE = 50
+LINE_TOO_LONG = "the line is too long, goodbye\n"
+SEARCH_FAILED = "the computer failed to select its move, goodbye\n"
+
+
+class Session:
+    """
+    one table of a human VS the computer, as a non blocking state machine:
+    the server feeds it the human's lines and the computer's moves, and sends back the returned text
+    """
+
+    def __init__(self, game_type: str, size: int, strategy: str):
+        """
+        :param game_type: engine.TIC_TAC_TOE or engine.MEMORY
+        :param size: tic-tac-toe - the board's diameter, memory - the number of pairs of cards
+        :param strategy: the computer's strategy
+        """
+        self.game_type = game_type
+        self.size = size
+        self.strategy = strategy
+        self.game = None
+        self.human_turn = None
+        self.restart()
+
+    def restart(self) -> None:
+        """
+        start a new game with the same options, the human plays first
+        """
+        self.game = engine.create_game(self.game_type, self.size, (engine.HUMAN, self.strategy))
+        self.human_turn = self.game['turn']
+
+    @classmethod
+    def from_line(cls, line: str) -> 'Session':
+        """
+        :param line: answer to GAME_PROMPT, 'game_type [size] [strategy]'
+        :return: a new session
+        :raise ValueError: if the game type, size or strategy are not valid
+        """
+        parts = line.split()
+        if not parts or parts[0] not in engine.GAME_TYPES:
+            raise ValueError("unknown game")
+        game_type = parts[0]
+        size = int(parts[1]) if len(parts) > 1 else DEFAULT_SIZES[game_type]
+        if not 1 <= size <= MAX_SIZE:
+            raise ValueError("invalid size")
+        strategy = parts[2] if len(parts) > 2 else 'random'
+        if strategy == engine.HUMAN:
+            raise ValueError("the computer can't play the human strategy")
+        return cls(game_type, size, strategy)
+
+    def board_text(self, revealed: tuple[tuple[int, int], ...] = ()) -> str:
+        """
+        :param revealed: memory cards locations to show although they are flipped back already
+        :return: the board's frame
+        """
+        game = self.game
+        if self.game_type == engine.TIC_TAC_TOE:
+            return renderer.build_frame(game['board'], len(game['board']))
+        rows = memory.get_display_rows(game)
+        labels, ids = game['board']['labels'], game['board']['ids']
+        for row, col in revealed:
+            rows[row][col] = labels[ids[memory.card_index(game, (row, col))]]
+        return renderer.build_frame(rows, game['cols_dimension'])
+
+    def is_computer_turn(self) -> bool:
+        """
+        :return: True if the game is not over and it's the computer's turn
+        """
+        return self.game['status'] == engine.PLAYING and self.game['turn'] != self.human_turn
+
+    def is_search_turn(self) -> bool:
+        """
+        :return: True if the computer's move needs a search, and should run in the process pool
+        """
+        return self.strategy in SEARCH_STRATEGIES and self.game_type == engine.TIC_TAC_TOE
+
+    def start_text(self) -> str:
+        """
+        :return: the board and the first prompt of a new game
+        """
+        return self.board_text() + self.prompt_text()
+
+    def prompt_text(self) -> str:
+        """
+        :return: the game's result and the replay prompt if the game is over, else the move prompt
+        """
+        game = self.game
+        if game['status'] == engine.PLAYING:
+            return MOVE_PROMPT
+        if game['status'] == engine.TIE:
+            return "game over, no one won\n" + REPLAY_PROMPT
+        winner = "you" if game['winner'] == self.human_turn else "the computer"
+        return f"the winner is: {winner}\n" + REPLAY_PROMPT
+
+    def play(self, location: tuple[int, int] | list[int]) -> str:
+        """
+        apply a validated move of the current player
+        :param location: the played cell
+        :return: the board after the move
+        """
+        first_location = self.game['first_location'] if self.game_type == engine.MEMORY else None
+        engine.apply_move(self.game, location)
+        if first_location is None:
+            return self.board_text()
+        # show the 2 cards of the turn, before they were flipped back
+        return self.board_text((first_location, tuple(location)))
+
+    def handle_line(self, line: str) -> str | None:
+        """
+        handle the human's answer to the last prompt
+        :param line: the received line
+        :return: the text to send back (without the prompt of the computer's turn), or None to close the session
+        """
+        line = line.strip()
+        if self.game['status'] != engine.PLAYING:
+            if line.lower() != 'y':
+                return None
+            self.restart()
+            return self.board_text()
+        if self.game_type == engine.TIC_TAC_TOE:
+            location, error = tic_tac_toe.parse_square(self.game, line)
+        else:
+            location, error = memory.parse_card_location(self.game, line)
+            if location == memory.SAVE_SENTINEL:
+                return "saving isn't available on the server\n"
+            if location in (memory.RESTART_SENTINEL, memory.REMATCH_SENTINEL):
+                self.restart()
+                return self.board_text()
+        if error:
+            return error + '\n'
+        return self.play(location)
+
+
+async def get_computer_move(session: Session, executor: ProcessPoolExecutor) -> tuple[int, int] | list[int]:
+    """
+    select the computer's move, searching moves run in the process pool so they never block the event loop
+    :param session: the played session
+    :param executor: pool of worker processes
+    :return: the computer's move
+    """
+    if session.is_search_turn():
+        return await asyncio.get_running_loop().run_in_executor(executor, engine.get_computer_move, session.game)
+    return engine.get_computer_move(session.game)
+
+
+async def read_line(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> str | None:
+    """
+    :param reader: the connection's reader
+    :param writer: the connection's writer
+    :return: the client's line, invalid UTF-8 bytes are replaced, None if the client closed the connection
+    or sent a line over the reader's limit, the client is told about it then
+    """
+    try:
+        line = await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        # the rest of an over long line can't be told apart from the next lines
+        writer.write(LINE_TOO_LONG.encode())
+        return None
+    return line.decode(errors='replace') if line else None
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        executor: ProcessPoolExecutor) -> None:
+    """
+    run one session for a connected client
+    :param reader: the connection's reader
+    :param writer: the connection's writer
+    :param executor: pool of worker processes for the computer's searches
+    """
+    try:
+        session = None
+        while session is None:
+            writer.write(GAME_PROMPT.encode())
+            line = await read_line(reader, writer)
+            if line is None:
+                return
+            try:
+                session = Session.from_line(line)
+            except ValueError as error:
+                writer.write(f"{error}\n".encode())
+        text = session.board_text()
+        while True:
+            while session.is_computer_turn():
+                try:
+                    location = await get_computer_move(session, executor)
+                except Exception:
+                    # e.g. a broken process pool, the session can't go on without the computer's move
+                    writer.write((text + SEARCH_FAILED).encode())
+                    await writer.drain()
+                    return
+                text += session.play(location)
+            writer.write((text + session.prompt_text()).encode())
+            await writer.drain()
+            line = await read_line(reader, writer)
+            if line is None:
+                return
+            text = session.handle_line(line)
+            if text is None:
+                return
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str, port: int, workers: int) -> None:
+    """
+    accept clients till the server is stopped
+    :param host: the host to listen on
+    :param port: the port to listen on
+    :param workers: number of worker processes for the computer's searches
+    """
+    with ProcessPoolExecutor(workers) as executor:
+        server = await asyncio.start_server(lambda reader, writer: handle_client(reader, writer, executor),
+                                            host, port, backlog=4096)
+        print(f"serving on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main(arguments: list[str] = None) -> None:
+    """
+    run the game server from the command line
+    :param arguments: the command line arguments, sys.argv by default
+    """
+    parser = argparse.ArgumentParser(description="host many concurrent games over TCP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="processes for the computer's searches")
+    options = parser.parse_args(arguments)
+    try:
+        asyncio.run(serve(options.host, options.port, options.workers))
+    except KeyboardInterrupt:
+        print("goodbye!")
+
+
+if __name__ == "__main__":
+    main()
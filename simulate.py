@@ -0,0 +1,236 @@
+import argparse
+import os
+import random
+import time
+from multiprocessing import Pool
+
+import engine
+import seeded_random
+from move_log import MoveLogWriter, encode_game
+
+DEFAULT_CHUNK_SIZE = 10_000
+SCALAR, BATCH = 'scalar', 'batch'
+
+
+def new_results() -> dict[str, any]:
+    """
+    :return: empty simulation results: number of games, wins by player, ties and moves
+    """
+    return {'games': 0, 'wins': {}, 'ties': 0, 'moves': 0}
+
+
+def merge_results(results: dict[str, any], other: dict[str, any]) -> dict[str, any]:
+    """
+    add the other results into the results
+    :param results: the results to update
+    :param other: results of another simulation run
+    :return: the updated results
+    """
+    results['games'] += other['games']
+    results['ties'] += other['ties']
+    results['moves'] += other['moves']
+    for player, wins in other['wins'].items():
+        results['wins'][player] = results['wins'].get(player, 0) + wins
+    return results
+
+
+def run_games(game_type: str, games: int, size: int, strategies: tuple[str, ...], seed: int = None,
+              rng_kind: str = seeded_random.MERSENNE, is_logged: bool = False) -> dict[str, any]:
+    """
+    play computer VS computer headless games
+    :param game_type: engine.TIC_TAC_TOE or engine.MEMORY
+    :param games: number of games to play
+    :param size: tic-tac-toe - the board's diameter, memory - the number of pairs of cards
+    :param strategies: the strategy of every player, by the players' turn order
+    :param seed: the games' seed, None - a seed from the OS
+    :param rng_kind: seeded_random.MERSENNE - the games share one generator,
+    seeded_random.COUNTER - the generator is seeded again for every game with seed + the game's index (O(1))
+    :param is_logged: record the games, their records are kept in results['log'],
+    every game is seeded with its own seed like with seeded_random.COUNTER
+    :return: the results of the games
+    """
+    results = new_results()
+    wins = results['wins']
+    records = []
+    is_seeded_per_game = seed is not None and (is_logged or rng_kind == seeded_random.COUNTER)
+    rng = seeded_random.make_rng(seed, rng_kind)
+    for index in range(games):
+        if is_seeded_per_game:
+            game_seed = seed + index
+            rng.seed(game_seed)
+        game = engine.create_game(game_type, size, strategies, record=is_logged, rng=rng)
+        results['moves'] += engine.play_game(game)
+        if is_logged:
+            records.append(encode_game(game, game_seed if is_seeded_per_game else 0))
+        if game['status'] == engine.WIN:
+            wins[game['winner']] = wins.get(game['winner'], 0) + 1
+        else:
+            results['ties'] += 1
+    results['games'] = games
+    if is_logged:
+        results['log'] = b''.join(records)
+    return results
+
+
+def run_batch(game_type: str, games: int, size: int, strategies: tuple[str, ...], seed: int) -> dict[str, any]:
+    """
+    play random VS random games on the NumPy batch engine
+    :param game_type: engine.TIC_TAC_TOE or engine.MEMORY
+    :param games: number of games to play
+    :param size: tic-tac-toe - the board's diameter, memory - the number of pairs of cards
+    :param strategies: the strategy of every player, must all be 'random'
+    :param seed: seed of the numpy random generator
+    :return: the results of the games
+    """
+    # NumPy is imported only when the batch engine is used
+    import numpy as np
+    import batch_engine
+    if any(strategy != 'random' for strategy in strategies):
+        raise ValueError("the batch engine plays only the 'random' strategy")
+    rng = np.random.default_rng(seed)
+    if game_type == engine.TIC_TAC_TOE:
+        return batch_engine.play_tic_tac_toe_batch(games, size, rng)
+    return batch_engine.play_memory_batch(games, size, len(strategies), rng)
+
+
+def derive_seed(master_seed: int, chunk_index: int) -> int:
+    """
+    :param master_seed: the seed of the whole simulation
+    :param chunk_index: the index of the chunk of games
+    :return: a deterministic 64 bit seed of the chunk, the same in every process
+    """
+    return random.Random(f"{master_seed}:{chunk_index}").getrandbits(64)
+
+
+def run_chunk(chunk: tuple[str, int, int, tuple[str, ...], int, str, str, bool]) -> dict[str, any]:
+    """
+    play a chunk of games with its own seed, runs inside a worker process
+    :param chunk: a tuple of (game_type, games, size, strategies, seed, engine_type, rng_kind, is_logged)
+    :return: the results of the chunk's games, with the games' records if the chunk is logged
+    """
+    game_type, games, size, strategies, seed, engine_type, rng_kind, is_logged = chunk
+    if engine_type == BATCH:
+        return run_batch(game_type, games, size, strategies, seed)
+    return run_games(game_type, games, size, strategies, seed, rng_kind, is_logged)
+
+
+def split_chunks(game_type: str, games: int, size: int, strategies: tuple[str, ...], master_seed: int,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, engine_type: str = SCALAR,
+                 rng_kind: str = seeded_random.MERSENNE,
+                 is_logged: bool = False) -> list[tuple[str, int, int, tuple[str, ...], int, str, str, bool]]:
+    """
+    split the simulation into chunks, the chunks don't depend on the number of workers,
+    so the same master seed gives the same results with any number of workers
+    :param game_type: engine.TIC_TAC_TOE or engine.MEMORY
+    :param games: number of games to play
+    :param size: tic-tac-toe - the board's diameter, memory - the number of pairs of cards
+    :param strategies: the strategy of every player, by the players' turn order
+    :param master_seed: the seed of the whole simulation
+    :param chunk_size: number of games in every chunk
+    :param engine_type: SCALAR - the game dictionaries engine, BATCH - the NumPy batch engine
+    :param rng_kind: the games' generator kind (SCALAR only), see run_games
+    :param is_logged: record the games for the move log (SCALAR only)
+    :return: a list of chunks for run_chunk
+    """
+    return [(game_type, min(chunk_size, games - start), size, strategies, derive_seed(master_seed, index),
+             engine_type, rng_kind, is_logged) for index, start in enumerate(range(0, games, chunk_size))]
+
+
+def run_parallel(chunks: list[tuple[str, int, int, tuple[str, ...], int, str, str, bool]], workers: int,
+                 log_writer: MoveLogWriter = None) -> dict[str, any]:
+    """
+    play the chunks on a pool of worker processes, every chunk's results are merged once it's done
+    :param chunks: a list of chunks from split_chunks
+    :param workers: number of worker processes, 1 plays in the current process
+    :param log_writer: writer of the logged chunks' records, the records are written by this process only
+    :return: the merged results of all the chunks
+    """
+    results = new_results()
+    if workers <= 1:
+        for chunk in chunks:
+            merge_chunk(results, run_chunk(chunk), log_writer)
+        return results
+    with Pool(workers) as pool:
+        for chunk_results in pool.imap_unordered(run_chunk, chunks):
+            merge_chunk(results, chunk_results, log_writer)
+    return results
+
+
+def merge_chunk(results: dict[str, any], chunk_results: dict[str, any], log_writer: MoveLogWriter = None) -> None:
+    """
+    add a chunk's results into the results, and write its games' records
+    :param results: the results to update
+    :param chunk_results: results of a chunk from run_chunk
+    :param log_writer: writer of the chunk's records, if the chunk is logged
+    """
+    records = chunk_results.pop('log', None)
+    if records is not None and log_writer is not None:
+        log_writer.write_records(records)
+    merge_results(results, chunk_results)
+
+
+def print_report(results: dict[str, any], players: dict[str, str], seconds: float) -> None:
+    """
+    print the wins and ties rates and the games per second
+    :param results: results of a simulation
+    :param players: the strategy of every player, by the player's turn
+    :param seconds: the simulation's duration
+    """
+    games = results['games'] or 1
+    print(f"games: {results['games']}, moves: {results['moves']}, time: {seconds:.2f}s")
+    for player, strategy in players.items():
+        print(f"player {player} ({strategy}) wins: {results['wins'].get(player, 0) / games:.2%}")
+    print(f"ties: {results['ties'] / games:.2%}")
+    print(f"games per second: {results['games'] / max(seconds, 1e-9):,.0f}")
+
+
+def parse_arguments(arguments: list[str] = None) -> argparse.Namespace:
+    """
+    :param arguments: the command line arguments, sys.argv by default
+    :return: the parsed simulation options
+    """
+    parser = argparse.ArgumentParser(description="play computer VS computer games without input/output")
+    parser.add_argument('--game', choices=engine.GAME_TYPES, default=engine.TIC_TAC_TOE)
+    parser.add_argument('--games', type=int, default=10_000, help="number of games to play")
+    parser.add_argument('--size', type=int, default=None,
+                        help="tic-tac-toe: the board's diameter (3), memory: number of pairs of cards (6)")
+    parser.add_argument('--strategies', default='random,random',
+                        help="comma separated strategy of every player, by the players' turn order")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument('--seed', type=int, default=None, help="master seed, a random one by default")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="number of games in every chunk")
+    parser.add_argument('--engine', choices=(SCALAR, BATCH), default=SCALAR,
+                        help="batch: play all the chunk's games together with NumPy (random strategies only)")
+    parser.add_argument('--rng', choices=seeded_random.RNG_KINDS, default=seeded_random.MERSENNE,
+                        help="counter: a cheap counter based generator for every game, mersenne: one per chunk")
+    parser.add_argument('--log', default=None, help="append every game's moves to this move log file (scalar only)")
+    options = parser.parse_args(arguments)
+    if options.log and options.engine == BATCH:
+        parser.error("the batch engine doesn't record the games' moves")
+    return options
+
+
+def main(arguments: list[str] = None) -> None:
+    """
+    run the simulation from the command line and print its report
+    :param arguments: the command line arguments, sys.argv by default
+    """
+    options = parse_arguments(arguments)
+    size = options.size or (3 if options.game == engine.TIC_TAC_TOE else 6)
+    strategies = tuple(options.strategies.split(','))
+    players = engine.create_game(options.game, size, strategies)['strategies']
+    master_seed = options.seed if options.seed is not None else random.getrandbits(64)
+    chunks = split_chunks(options.game, options.games, size, strategies, master_seed, options.chunk_size,
+                          options.engine, options.rng, options.log is not None)
+    start = time.perf_counter()
+    if options.log:
+        with MoveLogWriter(options.log) as log_writer:
+            results = run_parallel(chunks, min(options.workers, len(chunks)), log_writer)
+    else:
+        results = run_parallel(chunks, min(options.workers, len(chunks)))
+    print(f"seed: {master_seed}, workers: {min(options.workers, len(chunks))}")
+    print_report(results, players, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# cloning, snapshots and save files of both games.
+# a snapshot holds only immutable values (str, int, tuples), so it's shared instead of copied, and a game is
+# rebuilt from it by restore_game. a save file is the snapshot as compressed JSON, after a magic and a version:
+# 'GSAV', version (1 byte), zlib(JSON)
+import copy
+import json
+import os
+import zlib
+from array import array
+from random import Random
+
+import memory
+import memory_ai
+import seeded_random
+import tic_tac_toe
+import zobrist
+from move_set import MoveSet
+
+SAVE_MAGIC = b'GSAV'
+SAVE_VERSION = 1
+# the properties of headless engine games, kept when they are in the game
+ENGINE_KEYS = ('type', 'status', 'winner', 'strategies')
+
+
+def get_game_type(game: dict[str, any]) -> str:
+    """
+    :param game: dictionary of a game, interactive or headless
+    :return: tic_tac_toe.GAME_TYPE or memory.GAME_TYPE
+    """
+    return game.get('type') or (tic_tac_toe.GAME_TYPE if 'icons' in game else memory.GAME_TYPE)
+
+
+def copy_computer_memory(computer_memory: dict[str, any], rng: Random) -> dict[str, any]:
+    """
+    :param computer_memory: a computer's memory of the seen cards
+    :param rng: the copy's random generator
+    :return: an independent copy of the memory
+    """
+    return {
+        'seen': computer_memory['seen'].copy(),
+        'by_id': {card_id: locations[:] for card_id, locations in computer_memory['by_id'].items()},
+        'known_pairs': computer_memory['known_pairs'].copy(),
+        'unseen': computer_memory['unseen'].copy(),
+        'capacity': computer_memory['capacity'],
+        'decay': computer_memory['decay'],
+        'rng': rng
+    }
+
+
+def clone_game(game: dict[str, any], rng: Random | int = None) -> dict[str, any]:
+    """
+    an independent copy of a game, e.g. for a lookahead search. the tic-tac-toe clone costs O(rows + cols), not
+    O(cells): the board's rows and the available moves are shared copy-on-write, every shared object counts its owners
+    and the game that changes it first (the clone or the game) copies it, so only the changed rows are copied.
+    the memory's cards' flags are copied with one memcpy each, the cards' ids and labels never change so they are shared
+    :param game: dictionary of the played game
+    :param rng: the clone's generator or its seed, by default a copy of the game's generator in its current state
+    :return: dictionary of the cloned game
+    """
+    rng = seeded_random.get_rng(rng) if rng is not None else copy.copy(game['rng'])
+    clone = dict(game)
+    clone['rng'] = rng
+    clone['moves'] = game['moves'].share()
+    if 'history' in game:
+        clone['history'] = game['history'][:]
+    if get_game_type(game) == tic_tac_toe.GAME_TYPE:
+        board = clone['board'] = game['board'][:]
+        for index, row in enumerate(board):
+            if isinstance(row, tic_tac_toe.BoardRow):
+                row.shares += 1
+            else:
+                board[index] = tic_tac_toe.BoardRow(row)
+        clone['counters'] = {icon: {'rows': counters['rows'][:], 'columns': counters['columns'][:],
+                                    'diagonal': counters['diagonal'], 'anti_diagonal': counters['anti_diagonal'],
+                                    'is_win': counters['is_win']}
+                             for icon, counters in game['counters'].items()}
+        # the search tree is changed by the searches, it's not shared
+        clone.pop('mcts_tree', None)
+    else:
+        board = game['board']
+        clone['board'] = {'labels': board['labels'], 'ids': board['ids'],
+                          'is_flipped': board['is_flipped'][:], 'is_matched': board['is_matched'][:]}
+        clone['players'] = {turn: dict(player) for turn, player in game['players'].items()}
+        clone['computer_memory'] = {turn: copy_computer_memory(computer_memory, rng)
+                                    for turn, computer_memory in game['computer_memory'].items()}
+    return clone
+
+
+def take_snapshot(game: dict[str, any]) -> dict[str, any]:
+    """
+    :param game: dictionary of the played game
+    :return: the game's state in immutable values: str, int, float, bool, None and tuples.
+    the renderer, the generator and the computer's search tree are not kept
+    """
+    game_type = get_game_type(game)
+    snapshot = {key: game[key] for key in ENGINE_KEYS if key in game}
+    snapshot.update({
+        'type': game_type,
+        'turn': game['turn'],
+        'computer_mode': game['computer_mode'],
+        'strategy': game['strategy'],
+    })
+    if 'history' in game:
+        snapshot['history'] = tuple((turn, tuple(location)) for turn, location in game['history'])
+    # the available moves in their set's order, a random move is picked by its index in the set
+    snapshot['moves'] = tuple(tuple(location) for location in game['moves'])
+    if game_type == tic_tac_toe.GAME_TYPE:
+        board = game['board']
+        snapshot.update({
+            'rows': len(board),
+            'cols': len(board[0]),
+            'k': game['k'],
+            'icons': game['icons'],
+            'players': tuple(game['players'].items()),
+            'cells': ''.join(''.join(row) for row in board),
+            'is_win': tuple(game['counters'][icon]['is_win'] for icon in game['icons'])
+        })
+    else:
+        board = game['board']
+        snapshot.update({
+            'rows': game['rows_dimension'],
+            'cols': game['cols_dimension'],
+            'labels': tuple(board['labels']),
+            'ids': tuple(board['ids']),
+            'is_flipped': bytes(board['is_flipped']).hex(),
+            'is_matched': bytes(board['is_matched']).hex(),
+            'players': tuple((turn, player['name'], player['score']) for turn, player in game['players'].items()),
+            'first_location': tuple(game['first_location']) if game['first_location'] is not None else None,
+            'computer_memory': tuple((turn, {
+                'seen': tuple((location, card_id) for location, card_id in computer_memory['seen'].items()),
+                'by_id': tuple((card_id, tuple(locations)) for card_id, locations in computer_memory['by_id'].items()),
+                'known_pairs': tuple(computer_memory['known_pairs']),
+                'unseen': tuple(computer_memory['unseen']),
+                'capacity': computer_memory['capacity'],
+                'decay': computer_memory['decay']
+            }) for turn, computer_memory in game['computer_memory'].items())
+        })
+    return snapshot
+
+
+def restore_tic_tac_toe(snapshot: dict[str, any], rng: Random) -> dict[str, any]:
+    """
+    :param snapshot: a tic-tac-toe game's snapshot
+    :param rng: the game's generator
+    :return: dictionary of the restored game
+    """
+    rows, cols = snapshot['rows'], snapshot['cols']
+    game = tic_tac_toe.init_game(rows, {}, False, rng, cols, snapshot['k'])
+    board, counters = game['board'], game['counters']
+    cells = snapshot['cells']
+    for row in range(rows):
+        for col in range(cols):
+            icon = cells[row * cols + col]
+            if icon != '_':
+                board[row][col] = icon
+                game['moves'].discard((row, col))
+                counters[icon]['rows'][row] += 1
+                counters[icon]['columns'][col] += 1
+                counters[icon]['diagonal'] += row == col
+                counters[icon]['anti_diagonal'] += row == rows - 1 - col
+    for icon, is_win in zip(game['icons'], snapshot['is_win']):
+        counters[icon]['is_win'] = is_win
+    game['zobrist'] = zobrist.hash_board(board, game['icons'])
+    game['players'] = dict(snapshot['players'])
+    return game
+
+
+def restore_memory(snapshot: dict[str, any], rng: Random) -> dict[str, any]:
+    """
+    :param snapshot: a memory game's snapshot
+    :param rng: the game's generator
+    :return: dictionary of the restored game
+    """
+    labels = tuple(snapshot['labels'])
+    # init_game shuffles its cards, a spare generator shuffles them so the game's generator keeps its state
+    game = memory.init_game({}, False, labels, snapshot['rows'], snapshot['cols'], Random(0))
+    game['rng'] = rng
+    game['board'] = memory.init_board(array('H', snapshot['ids']), labels)
+    game['board']['is_flipped'][:] = bytes.fromhex(snapshot['is_flipped'])
+    game['board']['is_matched'][:] = bytes.fromhex(snapshot['is_matched'])
+    # the flipped cards, matched or flipped in this turn, are not available
+    is_flipped, cols = game['board']['is_flipped'], snapshot['cols']
+    game['moves'] = MoveSet(location for location in game['moves'] if not is_flipped[location[0] * cols + location[1]])
+    game['players'] = {turn: {'name': name, 'score': score} for turn, name, score in snapshot['players']}
+    first_location = snapshot['first_location']
+    game['first_location'] = tuple(first_location) if first_location is not None else None
+    for turn, saved in snapshot['computer_memory']:
+        computer_memory = memory_ai.init_computer_memory((), saved['capacity'], saved['decay'], rng)
+        for location, card_id in saved['seen']:
+            computer_memory['seen'][tuple(location)] = card_id
+        computer_memory['by_id'] = {card_id: [tuple(location) for location in locations]
+                                    for card_id, locations in saved['by_id']}
+        computer_memory['known_pairs'] = MoveSet(saved['known_pairs'])
+        computer_memory['unseen'] = MoveSet(tuple(location) for location in saved['unseen'])
+        game['computer_memory'][turn] = computer_memory
+    return game
+
+
+def restore_game(snapshot: dict[str, any], rng: Random | int = None) -> dict[str, any]:
+    """
+    rebuild a playable game from a snapshot, the snapshot isn't changed. with a generator in the original game's
+    state (e.g. copy.copy(game['rng'])) the restored game continues exactly like the original
+    :param snapshot: a game's snapshot, from take_snapshot or deserialize
+    :param rng: the game's random generator or its seed, the shared default generator by default
+    :return: dictionary of the restored game, without a renderer
+    """
+    rng = seeded_random.get_rng(rng)
+    if snapshot['type'] == tic_tac_toe.GAME_TYPE:
+        game = restore_tic_tac_toe(snapshot, rng)
+    else:
+        game = restore_memory(snapshot, rng)
+    game.update({key: snapshot[key] for key in ENGINE_KEYS if key in snapshot})
+    if isinstance(game.get('strategies'), (list, tuple)):
+        game['strategies'] = dict(game['strategies'])
+    game['turn'] = snapshot['turn']
+    game['computer_mode'] = snapshot['computer_mode']
+    game['strategy'] = snapshot['strategy']
+    if 'history' in snapshot:
+        game['history'] = [(turn, tuple(location)) for turn, location in snapshot['history']]
+    if 'moves' in snapshot:
+        # the moves are restored in the saved order, so the same generator picks the same moves
+        game['moves'] = MoveSet(tuple(location) for location in snapshot['moves'])
+    return game
+
+
+def serialize(game: dict[str, any]) -> bytes:
+    """
+    :param game: dictionary of the played game
+    :return: the game's snapshot as compressed JSON, after the save header
+    """
+    data = json.dumps(take_snapshot(game), separators=(',', ':')).encode()
+    return SAVE_MAGIC + bytes((SAVE_VERSION,)) + zlib.compress(data)
+
+
+def deserialize(data: bytes) -> dict[str, any]:
+    """
+    :param data: a serialized game
+    :return: the game's snapshot, the JSON arrays are lists instead of tuples
+    :raise ValueError: if it's not a saved game of the supported version
+    """
+    if data[:len(SAVE_MAGIC)] != SAVE_MAGIC or data[len(SAVE_MAGIC):len(SAVE_MAGIC) + 1] != bytes((SAVE_VERSION,)):
+        raise ValueError("invalid saved game")
+    try:
+        return json.loads(zlib.decompress(data[len(SAVE_MAGIC) + 1:]))
+    except (zlib.error, ValueError):
+        raise ValueError("invalid saved game")
+
+
+def save_game(game: dict[str, any], path: str) -> None:
+    """
+    :param game: dictionary of the played game
+    :param path: the save file's path, written through a temporary file so a failed save keeps the previous one
+    """
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as save_file:
+        save_file.write(serialize(game))
+    os.replace(temporary_path, path)
+
+
+def load_game(path: str, rng: Random | int = None) -> dict[str, any]:
+    """
+    :param path: the save file's path
+    :param rng: the game's random generator or its seed, the shared default generator by default
+    :return: dictionary of the restored game
+    :raise ValueError: if the file isn't a saved game of the supported version, or its game is malformed
+    """
+    with open(path, 'rb') as save_file:
+        saved = deserialize(save_file.read())
+    try:
+        return restore_game(saved, rng)
+    except (KeyError, TypeError, IndexError, AttributeError) as error:
+        # valid JSON of a wrong shape: a missing property or a value of a wrong type
+        raise ValueError("invalid saved game") from error
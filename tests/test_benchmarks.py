@@ -0,0 +1,21 @@
+# the hot paths' benchmarks under pytest-benchmark, e.g.:
+# python -m pytest tests/test_benchmarks.py --benchmark-only --benchmark-autosave
+# python -m pytest tests/test_benchmarks.py --benchmark-only --benchmark-compare --benchmark-compare-fail=min:25%
+import pytest
+
+import benchmark as benchmarks
+
+pytest.importorskip('pytest_benchmark')
+
+SIZES = (3, 25)
+RESET_ROUNDS = 2000
+
+
+@pytest.mark.parametrize('size', SIZES)
+@pytest.mark.parametrize('name', benchmarks.BENCHMARKS)
+def test_benchmark(benchmark, name: str, size: int):
+    function, reset = benchmarks.split_benchmark(benchmarks.BENCHMARKS[name](size))
+    if reset is None:
+        benchmark(function)
+    else:
+        benchmark.pedantic(function, setup=reset, rounds=RESET_ROUNDS)
@@ -0,0 +1,67 @@
+import pytest
+
+import agents
+import engine
+
+
+def test_apply_move_rejects_an_occupied_cell():
+    game = engine.create_game(engine.TIC_TAC_TOE, 3, record=True, rng=1)
+    engine.apply_move(game, (1, 1))
+    counters = {icon: dict(counters, rows=counters['rows'][:]) for icon, counters in game['counters'].items()}
+    with pytest.raises(ValueError):
+        engine.apply_move(game, [1, 1])
+    with pytest.raises(ValueError):
+        engine.apply_move(game, (3, 0))
+    assert game['history'] == [('X', (1, 1))]
+    assert game['turn'] == 'O' and len(game['moves']) == 8
+    assert {icon: dict(counters, rows=counters['rows'][:]) for icon, counters in game['counters'].items()} == counters
+
+
+def test_apply_move_rejects_a_flipped_or_matched_card():
+    game = engine.create_game(engine.MEMORY, 2, record=True, rng=1)
+    ids, cols = game['board']['ids'], game['cols_dimension']
+    first = divmod(0, cols)
+    engine.apply_move(game, first)
+    with pytest.raises(ValueError):
+        engine.apply_move(game, first)
+    pair = divmod(next(index for index in range(1, len(ids)) if ids[index] == ids[0]), cols)
+    engine.apply_move(game, pair)
+    score = game['players'][game['turn']]['score']
+    with pytest.raises(ValueError):
+        engine.apply_move(game, pair)
+    assert game['players'][game['turn']]['score'] == score == 1
+    assert game['history'] == [('1', first), ('1', pair)]
+
+
+def test_apply_move_rejects_a_move_after_the_game_is_over():
+    game = engine.create_game(engine.TIC_TAC_TOE, 3, rng=1)
+    engine.play_game(game)
+    location = next(iter(game['moves']), (0, 0))
+    with pytest.raises(ValueError):
+        engine.apply_move(game, location)
+
+
+class IllegalAgent(agents.Agent):
+    def request_move(self, game, answer):
+        answer((-1, -1))
+
+
+def test_illegal_move_forfeits_only_its_game():
+    bad = engine.create_game(engine.TIC_TAC_TOE, 3, rng=1)
+    good = engine.create_game(engine.TIC_TAC_TOE, 3, rng=2)
+    loop = engine.EventLoop()
+    loop.add_game(bad, {'X': IllegalAgent()})
+    loop.add_game(good)
+    loop.run()
+    assert bad['status'] == engine.FORFEIT and bad['winner'] == 'O' and 'isn\'t available' in bad['error']
+    assert good['status'] in (engine.WIN, engine.TIE)
+    assert loop.waiting == 0
+
+
+def test_agents():
+    with pytest.raises(TypeError):
+        agents.Agent()
+    game = engine.create_game(engine.TIC_TAC_TOE, 3, rng=1)
+    remote = agents.RemoteAgent()
+    assert agents.get_move(remote, game) is None
+    assert id(game) in remote.waiting
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+import leaderboard
+
+PLAY_GAMES = ("import engine, memory, sys, tic_tac_toe\n"
+              "game = engine.create_game(engine.TIC_TAC_TOE, 3, rng=1)\n"
+              "engine.play_game(game)\n"
+              "tic_tac_toe.save_stats(game, game['status'] == engine.TIE)\n"
+              "game = engine.create_game(engine.MEMORY, 3, rng=1)\n"
+              "engine.play_game(game)\n"
+              "memory.save_stats(game, {})\n")
+
+
+def play_games(directory, environment: dict[str, str], code: str = '') -> None:
+    environment = dict(environment, PYTHONPATH=os.path.dirname(os.path.abspath(leaderboard.__file__)))
+    subprocess.run([sys.executable, '-c', PLAY_GAMES + code], check=True, cwd=directory, env=environment,
+                   stdout=subprocess.DEVNULL)
+
+
+def test_disabled_stats_import_no_sqlite(tmp_path):
+    play_games(tmp_path, {'GAMES_LEADERBOARD': '0'}, "assert 'sqlite3' not in sys.modules\n")
+    assert not list(tmp_path.iterdir())
+
+
+def test_stats_are_kept_in_the_current_directory(tmp_path):
+    play_games(tmp_path, {})
+    with leaderboard.Leaderboard(str(tmp_path / leaderboard.DEFAULT_PATH)) as stats:
+        # both players of every game are named computer
+        assert stats.get_stats('tic_tac_toe', 'computer')['games'] == stats.get_stats('memory', 'computer')['games'] == 2
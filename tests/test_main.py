@@ -0,0 +1,29 @@
+import pytest
+
+import main
+
+
+def test_parse_options():
+    assert main.parse_options('tic_tac_toe', ['--rows', '15', '--k', '5', '--render', 'ansi']) == {
+        'rows': 15, 'k': 5, 'render': 'ansi'}
+    assert main.parse_options('memory', ['--pairs', '8', '--startup-time']) == {'pairs': 8, 'startup-time': ''}
+
+
+@pytest.mark.parametrize('game_name, arguments', [
+    ('tic_tac_toe', ['--rows', '0']),
+    ('memory', ['--cols', '0']),
+    ('memory', ['--pairs']),
+    ('tic_tac_toe', ['--rows', '-3']),
+    ('tic_tac_toe', ['--pairs', '4']),
+    ('memory', ['--k', '3']),
+    ('memory', ['--render', 'html']),
+    ('memory', ['--size', '3']),
+])
+def test_invalid_options_are_rejected(game_name, arguments):
+    with pytest.raises(ValueError):
+        main.parse_options(game_name, arguments)
+
+
+def test_main_prints_the_usage_error(capsys):
+    main.main(['tic_tac_toe', '--pairs', '4'])
+    assert "--pairs doesn't apply to tic_tac_toe" in capsys.readouterr().out
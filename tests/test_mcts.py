@@ -0,0 +1,25 @@
+import pytest
+
+import seeded_random
+import tic_tac_toe_mcts
+from tic_tac_toe_state import TicTacToeState
+
+
+def test_search_needs_a_budget():
+    state = TicTacToeState(10, k=5)
+    with pytest.raises(ValueError):
+        tic_tac_toe_mcts.find_best_cell(state, time_budget=None, iterations=None, workers=1)
+
+
+def test_parallel_search_searches_the_position():
+    state = TicTacToeState(10, k=5)
+    for cell in (44, 45, 54, 55, 64):
+        state.place(cell)
+    cell, _ = tic_tac_toe_mcts.find_best_cell(state, time_budget=None, iterations=200, workers=2,
+                                              rng=seeded_random.make_rng(1))
+    assert not state.occupied >> cell & 1
+    cells = [0] * 100
+    for index, cell in enumerate((44, 45, 54, 55, 64)):
+        cells[cell] = index % 2 + 1
+    visits = tic_tac_toe_mcts.search_worker(tuple(cells), state.player, (10, 10, 5), None, 200, 1)
+    assert visits and not any(state.occupied >> cell & 1 for cell in visits)
@@ -0,0 +1,46 @@
+import pytest
+
+import opening_book
+import tic_tac_toe
+from tic_tac_toe_state import TicTacToeState
+
+
+def test_built_book_is_verified():
+    book = opening_book.build_book()
+    assert opening_book.verify_book(book) == len(opening_book.reachable_positions())
+
+
+def test_built_states_have_the_hashes_of_their_masks():
+    game = tic_tac_toe.init_game(3, {}, False, 1)
+    for location in ([0, 0], [1, 1], [2, 1]):
+        tic_tac_toe.set_square(game, location)
+        tic_tac_toe.switch_player(game)
+    state = TicTacToeState.from_game(game)
+    assert state.has_valid_hashes()
+    assert state.hashes == game['zobrist']
+    assert opening_book.to_state([1, 0, 0, 0, 2, 0, 0, 1, 0]).has_valid_hashes()
+
+
+def test_book_that_fails_its_check_is_not_written(tmp_path, monkeypatch):
+    book = bytearray(opening_book.build_book())
+    book[opening_book.HEADER.size + opening_book.reachable_positions()[-1]] = opening_book.NO_MOVE
+    monkeypatch.setattr(opening_book, 'build_book', lambda: bytes(book))
+    monkeypatch.setattr(opening_book, '_book', None)
+    monkeypatch.setattr(opening_book, '_book_error', None)
+    path = tmp_path / 'book.bin'
+    with pytest.raises(ValueError):
+        opening_book.load_book(str(path))
+    assert not path.exists()
+    # the computer searches without the book
+    assert opening_book.get_book_location(tic_tac_toe.init_game(3, {}, False, 1)) is None
+
+
+def test_truncated_book_is_rebuilt(tmp_path, monkeypatch):
+    monkeypatch.setattr(opening_book, '_book', None)
+    monkeypatch.setattr(opening_book, '_book_error', None)
+    path = tmp_path / 'book.bin'
+    path.write_bytes(opening_book.build_book()[:opening_book.BOOK_SIZE // 2])
+    book = opening_book.load_book(str(path))
+    assert len(book) == opening_book.BOOK_SIZE
+    assert opening_book.verify_book(bytes(book)) == len(opening_book.reachable_positions())
+    assert [entry.name for entry in tmp_path.iterdir()] == ['book.bin']
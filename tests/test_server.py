@@ -0,0 +1,47 @@
+import asyncio
+from concurrent.futures import Executor
+
+import server
+
+
+class FailingExecutor(Executor):
+    """
+    a pool whose workers are gone
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        raise RuntimeError("the pool is broken")
+
+
+async def talk(lines: list[bytes], executor: Executor = None) -> bytes:
+    """
+    :param lines: the client's lines, sent one after the other, then the client stops sending
+    :param executor: the server's pool for the computer's searches
+    :return: everything the server sent till it closed the connection
+    """
+    host = await asyncio.start_server(lambda reader, writer: server.handle_client(reader, writer, executor),
+                                      '127.0.0.1', 0, limit=1024)
+    async with host:
+        reader, writer = await asyncio.open_connection(*host.sockets[0].getsockname()[:2])
+        for line in lines:
+            writer.write(line)
+        writer.write_eof()
+        await writer.drain()
+        received = await asyncio.wait_for(reader.read(), 10)
+        writer.close()
+    return received
+
+
+def test_over_long_line_is_reported():
+    received = asyncio.run(talk([b'x' * 4096 + b'\n']))
+    assert received.endswith(server.LINE_TOO_LONG.encode())
+
+
+def test_invalid_utf8_is_an_invalid_answer():
+    received = asyncio.run(talk([b'\xff\xfe\n', b'tic_tac_toe 3\n']))
+    assert b"unknown game" in received and server.MOVE_PROMPT.encode() in received
+
+
+def test_search_failure_is_reported():
+    received = asyncio.run(talk([b'tic_tac_toe 3 ai\n', b'1,1\n'], FailingExecutor()))
+    assert received.endswith(server.SEARCH_FAILED.encode())
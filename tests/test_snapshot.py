@@ -0,0 +1,61 @@
+import copy
+import json
+import zlib
+
+import pytest
+
+import engine
+import snapshot
+
+
+def play_moves(game: dict[str, any], moves: int) -> None:
+    for _ in range(moves):
+        if game['status'] != engine.PLAYING:
+            return
+        engine.apply_move(game, engine.get_computer_move(game))
+
+
+def test_restored_seeded_games_continue_identically():
+    for game_type, size, strategies in ((engine.MEMORY, 10, ('hard', 'random')),
+                                        (engine.MEMORY, 8, ('easy', 'medium')),
+                                        (engine.TIC_TAC_TOE, 7, ('random', 'random'))):
+        for seed in range(20):
+            game = engine.create_game(game_type, size, strategies, record=True, rng=seed)
+            play_moves(game, 9)
+            saved = snapshot.deserialize(snapshot.serialize(game))
+            restored = snapshot.restore_game(saved, copy.copy(game['rng']))
+            play_moves(game, 1000)
+            play_moves(restored, 1000)
+            assert restored['history'] == game['history']
+            assert restored['status'] == game['status'] and restored['winner'] == game['winner']
+
+
+def test_clones_and_their_game_change_apart():
+    for game_type, size in ((engine.TIC_TAC_TOE, 5), (engine.MEMORY, 6)):
+        game = engine.create_game(game_type, size, ('random', 'random'), rng=3)
+        play_moves(game, 2)
+        keys = set(game)
+        before = snapshot.take_snapshot(game)
+        clone = snapshot.clone_game(game)
+        assert set(game) == keys
+        play_moves(clone, 1000)
+        assert snapshot.take_snapshot(game) == before
+        other = snapshot.clone_game(game)
+        play_moves(game, 1000)
+        assert snapshot.take_snapshot(other) == before
+
+
+def test_malformed_save_is_invalid(tmp_path):
+    game = engine.create_game(engine.MEMORY, 4, ('random', 'random'), rng=1)
+    path = tmp_path / 'game.sav'
+    # a value of a wrong type, or a missing property (...)
+    for key, value in (('players', None), ('ids', 7), ('labels', None), ('rows', 'x'), ('turn', ...)):
+        saved = snapshot.deserialize(snapshot.serialize(game))
+        if value is ...:
+            del saved[key]
+        else:
+            saved[key] = value
+        path.write_bytes(snapshot.SAVE_MAGIC + bytes((snapshot.SAVE_VERSION,))
+                         + zlib.compress(json.dumps(saved).encode()))
+        with pytest.raises(ValueError, match='invalid saved game'):
+            snapshot.load_game(str(path))
@@ -1,40 +1,103 @@
-import re
-from random import choice
+import os
+from random import Random
 
+import agents
+import instrumentation
+import move_parser
+import renderer
+import seeded_random
+import zobrist
+from move_set import MoveSet, board_moves, own_moves
+from tic_tac_toe_state import DIRECTIONS, TicTacToeState
 
-def init_game(n: int, game: dict[str, any], is_rematch: bool) -> dict[str, any]:
+GAME_TYPE = 'tic_tac_toe'
+# the strong computer searches by Monte Carlo tree search on boards of this number of cells and bigger
+MCTS_MIN_CELLS = 100
+
+
+class BoardRow(list):
+    """
+    a row of the board's icons, shared copy-on-write by a game and its clones (snapshot.clone_game)
+    """
+    __slots__ = ('shares',)
+
+    def __init__(self, cells=()):
+        """
+        :param cells: iterable of the row's icons
+        """
+        super().__init__(cells)
+        # number of the row's owners beside the first one
+        self.shares = 0
+
+
+def validate_k(n: int, cols_dimension: int = None, k: int = None) -> int:
+    """
+    check that k cells in a row fit in the board
+    :param n: number of rows in the board
+    :param cols_dimension: number of columns in the board, n by default
+    :param k: number of cells in a row that win, by default the board's diameter (a whole line)
+    :return: the number of cells in a row that win
+    :raise ValueError: if k doesn't fit in the board
+    """
+    cols_dimension = cols_dimension or n
+    k = k or min(n, cols_dimension)
+    if not 1 <= k <= max(n, cols_dimension):
+        raise ValueError(f"{k} in a row doesn't fit in a {n}x{cols_dimension} board")
+    return k
+
+
+def init_game(n: int, game: dict[str, any], is_rematch: bool, rng: Random | int = None,
+              cols_dimension: int = None, k: int = None) -> dict[str, any]:
     """
-    initiate the Tic- Tac-toe game
-    :param n: diameter for the game nxn
+    initiate the Tic- Tac-toe game, an m,n,k-game: the first player with k cells in a row, a column or a diagonal wins
+    :param n: diameter for the game nxn, the number of rows if cols_dimension is given
     :param game: dictionary of the previous played game
     :param is_rematch: a boolean flag, to indict a re-match game or a not one.
+    :param rng: the game's random generator or its seed, by default the previous game's generator
+    :param cols_dimension: number of columns in the board, n by default
+    :param k: number of cells in a row that win, by default the board's diameter (a whole line)
     :return:a dictionary of the new game
+    :raise ValueError: if k doesn't fit in the board
     """
+    rng = seeded_random.get_rng(rng if rng is not None else game.get('rng'))
+    cols_dimension = cols_dimension or n
+    k = validate_k(n, cols_dimension, k)
     if not is_rematch:
         return {
-            'board': init_board(n),
+            'board': init_board(n, cols_dimension),
             'turn': 'X',
             'players': {},
             "icons": ('X', 'O'),
-            "moves": possible_moves(n),
-            "computer_mode": False
+            "k": k,
+            "moves": possible_moves(n, cols_dimension),
+            "counters": init_counters(n, ('X', 'O'), cols_dimension),
+            "zobrist": zobrist.empty_hashes(n, cols_dimension),
+            "computer_mode": False,
+            "strategy": 'random',
+            "rng": rng
 
         }
     return {
-        'board': init_board(n),
+        'board': init_board(n, cols_dimension),
         'turn': 'X',
         'players': game['players'],
         "icons": ('X', 'O'),
-        "moves": possible_moves(n),
-        "computer_mode": True
+        "k": k,
+        "moves": possible_moves(n, cols_dimension),
+        "counters": init_counters(n, ('X', 'O'), cols_dimension),
+        "zobrist": zobrist.empty_hashes(n, cols_dimension),
+        "computer_mode": True,
+        "strategy": game['strategy'],
+        "rng": rng
     }
 
 
-def get_player_icon(icons: tuple[str,str],selected_icon:str=None) -> str:
+def get_player_icon(icons: tuple[str,str],selected_icon:str=None, rng: Random | int = None) -> str:
     """
     according to the user selection, we return the player's symbol for the game
     :param icons: a tuple of possible icons
     :param selected_icon: if selected icon before
+    :param rng: the random generator or its seed, for a symbol that isn't selected
     :return: the value of the selected icon
     """
     icons_list=list(icons)
@@ -49,7 +112,7 @@ def get_player_icon(icons: tuple[str,str],selected_icon:str=None) -> str:
                     continue
                 break
         else:
-            icon = choice(icons_list)
+            icon = seeded_random.get_rng(rng).choice(icons_list)
 
     else:
         icon = icons[1] if selected_icon ==icons[0] else icons[0]
@@ -81,7 +144,8 @@ def get_valid_player_name(message: str) -> str:
     """
     while True:
         name = input(message)
-        is_match = re.match("^(?!computer$)[a-zA-Z]+$", name)
+        # A-Z/a-z letters only, like the pattern ^(?!computer$)[a-zA-Z]+$, without importing re
+        is_match = name.isascii() and name.isalpha() and name != 'computer'
         if not is_match:
             print("Invalid name,must contain letters only,try again")
             continue
@@ -105,56 +169,90 @@ def get_players(game: dict[str, any], is_rematch=False) -> None:
             icon=None
             while count < 3:
                 name = get_valid_player_name(f"Player #{count}, please enter your name:")
-                icon = get_player_icon(icons,icon)
+                icon = get_player_icon(icons,icon,game['rng'])
                 print(f"You will play the {icon} symbol in this game")
                 players[f'{icon}'] = name
                 count += 1
         else:
             name = get_valid_player_name("Please enter your name:")
-            icon = get_player_icon(icons)
+            icon = get_player_icon(icons, rng=game['rng'])
             print(f"You will play the '{icon}' symbol in this game")
             players[f'{icon}'] = name
             icon = get_player_icon(icons,icon)
             players[f'{icon}'] = 'computer'
+            is_strong = get_valid_boolean_response("Do you want a strong computer opponent (y/n)?", ('y', 'n'), 'y')
+            game['strategy'] = get_strong_strategy(game) if is_strong else 'random'
         game['players'] = players
         game['computer_mode'] = is_computer
 
 
-def init_board(n: int) -> list[list[str]]:
+def init_board(n: int, cols_dimension: int = None) -> list[list[str]]:
     """
     build and initiate the Tic - Tac - Toe board
-    :param n: diameter for the game's size nxn
+    :param n: diameter for the game's size nxn, the number of rows if cols_dimension is given
+    :param cols_dimension: number of columns in the board, n by default
     :return: a nested list of string in size of nxn
     """
-    return [['_'] * n for _ in range(1, n + 1)]
+    row = ['_'] * (cols_dimension or n)
+    return [BoardRow(row) for _ in range(1, n + 1)]
 
 
-def possible_moves(n: int) -> set[tuple[int, int]]:
+def own_row(board: list[list[str]], row: int) -> list[str]:
+    """
+    :param board: the game's board
+    :param row: index of the row about to be changed
+    :return: the row, copied first if it's shared with a clone
+    """
+    cells = board[row]
+    if getattr(cells, 'shares', 0):
+        cells.shares -= 1
+        cells = board[row] = BoardRow(cells)
+    return cells
+
+
+def possible_moves(n: int, cols_dimension: int = None) -> MoveSet:
     """
     build and initiate the Tic - Tac - Toe possible moves
-    :param n: diameter for the game's size nxn
-    :return: a set of all possible moves by (row,col)
+    :param n: diameter for the game's size nxn, the number of rows if cols_dimension is given
+    :param cols_dimension: number of columns in the board, n by default
+    :return: a MoveSet of all possible moves by (row,col), a copy of the board's cached template
     """
-    moves: set[tuple[int, int]] = set()
-    for row in range(0, n):
-        for col in range(0, n):
-            moves.add((row, col))
+    return board_moves(n, cols_dimension or n)
 
-    return moves
+
+def init_counters(n: int, icons: tuple[str, str], cols_dimension: int = None) -> dict[str, dict[str, any]]:
+    """
+    build the per-player line counters, every counter holds how many cells the player owns in that line,
+    so a win is found once a counter reaches n, without scanning the board again
+    :param n: diameter for the game's size nxn, the number of rows if cols_dimension is given
+    :param icons: a tuple of the players' icons
+    :param cols_dimension: number of columns in the board, n by default
+    :return: a dict of key=icon, value: dict type with the rows, columns and diagonals counters
+    """
+    return {
+        icon: {
+            'rows': [0] * n,
+            'columns': [0] * (cols_dimension or n),
+            'diagonal': 0,
+            'anti_diagonal': 0,
+            'is_win': False
+        }
+        for icon in icons
+    }
 
 
-def draw_board(game: dict[str, any]) -> None:
+def draw_board(game: dict[str, any] | TicTacToeState) -> None:
     """
-    :param game: dictionary of the played game
-    print the Tic Tac toe board
+    :param game: dictionary of the played game, or its compact state
+    print the Tic Tac toe board, with a single write of the whole frame by the game's renderer
     """
-    print("---------------------------")
-    print(' ', end=' ')
-    for i in range(1, len(game['board']) + 1):
-        print(i, end=" ")
-    print()
-    for index, row in enumerate(game['board']):
-        print(index + 1, ' '.join(row))
+    if isinstance(game, TicTacToeState):
+        board, board_renderer = game.rows(), None
+    else:
+        board, board_renderer = game['board'], game.get('renderer')
+        if renderer.is_headless(board_renderer):
+            return
+    renderer.draw_frame(board_renderer, board, len(board[0]))
 
 
 def input_square(game: dict[str, any]) -> list[int]:
@@ -165,54 +263,208 @@ def input_square(game: dict[str, any]) -> list[int]:
     :param game: dictionary of the played game
     :return: list of 2 values, of the next played cell in the game
     """
-    if game['computer_mode'] and game['players'][game['turn']] == 'computer':
-        print("The computer will play his turn now:")
-        return get_random_location(game)
     while True:
         location: str = input(
             f"Enter row number,column number for {game['players'][game['turn']]}({game['turn']}) separated by ',':")
-        location_list = location.split(',')
-        if len(location_list) < 2 or not all([x != '' for x in location_list]) or not all(
-                [x.isdigit() for x in location_list]):
-            print("Try again,invalid input")
-            continue
-        location_list = [int(x) - 1 for x in location_list]
-        if not 0 <= location_list[0] < len(game['board']) or not 0 <= location_list[1] < len(game['board']):
-            print("try again,out of range")
-            continue
-        if game['board'][location_list[0]][location_list[1]] != '_':  # o(1)
-            print("Occupied,try again")
+        location_list, error = parse_square(game, location)
+        if error:
+            print(error)
             continue
         break
 
     return location_list
 
 
-def get_random_location(game: dict[str, any]):
+def get_agents(game: dict[str, any]) -> dict[str, agents.Agent]:
     """
+    :param game: dictionary of the game, after get_players
+    :return: the agent of every player by its icon: the computer plays by the game's strategy,
+    the others enter their moves at the console
+    """
+    return {icon: agents.ComputerAgent(get_computer_location) if game['computer_mode'] and player == 'computer'
+            else agents.HumanAgent(input_square) for icon, player in game['players'].items()}
+
+
+def parse_square(game: dict[str, any], location: str | bytes) -> tuple[list[int] | None, str | None]:
+    """
+    validate a cell location entered as 'row,col' (1 based)
     :param game: dictionary of the played game
+    :param location: the entered text, or a raw buffer of its bytes
+    :return: a tuple of (list of 2 values of the cell, None), or (None, the error message) if it's not valid
+    """
+    board = game['board']
+    cols_dimension = len(board[0])
+    cell = move_parser.parse_cell(location, len(board), cols_dimension)
+    if cell == move_parser.INVALID_INPUT:
+        return None, "Try again,invalid input"
+    if cell == move_parser.OUT_OF_RANGE:
+        return None, "try again,out of range"
+    row, col = divmod(cell, cols_dimension)
+    if board[row][col] != '_':  # o(1)
+        return None, "Occupied,try again"
+    return [row, col], None
+
+
+def get_strong_strategy(game: dict[str, any]) -> str:
+    """
+    :param game: dictionary of the game
+    :return: the strong computer's strategy for the game's board, 'mcts' from MCTS_MIN_CELLS cells, else 'ai'
+    """
+    return 'mcts' if len(game['board']) * len(game['board'][0]) >= MCTS_MIN_CELLS else 'ai'
+
+
+def get_computer_location(game: dict[str, any], strategy: str = None) -> list[int]:
+    """
+    select the computer's next cell according to the strategy:
+    'ai' - the best cell from the 3x3 opening book or by a search,
+    'mcts' - the most visited cell of a Monte Carlo tree search, 'random' - a random available cell
+    :param game: dictionary of the played game
+    :param strategy: the computer's strategy, the game's strategy by default
+    :return: list of 2 values, of the next played cell in the game
+    """
+    strategy = strategy or game['strategy']
+    if strategy == 'mcts':
+        from tic_tac_toe_mcts import get_mcts_location
+        return get_mcts_location(game)
+    if strategy == 'ai':
+        # the book and the search are imported only when a strong computer is played
+        from opening_book import get_book_location
+        location = get_book_location(game)
+        if location is not None:
+            return location
+        from tic_tac_toe_ai import get_best_location
+        return get_best_location(game)
+    return list(get_random_location(game))
+
+
+def get_random_location(game: dict[str, any], rng: Random = None):
+    """
+    :param game: dictionary of the played game
+    :param rng: the random generator, the game's generator by default
     :return: a random available location
     """
-    return choice(list(game['moves']))
+    return game['moves'].random_move(rng if rng is not None else game['rng'])
 
 
-def set_square(game: dict[str, any], location: list[int]) -> None:
+def set_square(game: dict[str, any] | TicTacToeState, location: list[int]) -> None:
     """
     update the board with the received list and the current symbol turn
-    :param game:dictionary of the played game
+    :param game:dictionary of the played game, or its compact state
     :param location: a list of 2 integers
     """
-    game['board'][location[0]][location[1]] = game['turn']
-    game['moves'].discard(tuple(location))
+    if isinstance(game, TicTacToeState):
+        game.place(location[0] * game.cols + location[1])
+        return
+    row, col = location[0], location[1]
+    board = game['board']
+    own_row(board, row)[col] = game['turn']
+    own_moves(game).discard((row, col))
+    update_hash(game, game['turn'], row, col)
+    if game['k'] == len(board) == len(board[0]):
+        update_counters(game, row, col)
+    elif has_k_in_a_row(game, row, col):
+        game['counters'][game['turn']]['is_win'] = True
+
+
+def undo_square(game: dict[str, any], location: list[int]) -> None:
+    """
+    take back a played cell: empty it, make it available again and remove it from its player's line counters
+    and from the position's hash, the turn is not changed
+    :param game: dictionary of the played game
+    :param location: a list of 2 integers, of an occupied cell
+    """
+    row, col = location[0], location[1]
+    board = game['board']
+    cells = own_row(board, row)
+    icon = cells[col]
+    cells[col] = '_'
+    own_moves(game).add((row, col))
+    update_hash(game, icon, row, col)
+    counters = game['counters'][icon]
+    n = len(board)
+    if game['k'] == n == len(board[0]):
+        counters['rows'][row] -= 1
+        counters['columns'][col] -= 1
+        counters['diagonal'] -= row == col
+        counters['anti_diagonal'] -= row == n - 1 - col
+        if counters['is_win']:
+            counters['is_win'] = (n in counters['rows'] or n in counters['columns']
+                                  or n in (counters['diagonal'], counters['anti_diagonal']))
+    elif counters['is_win']:
+        # the taken back cell may be the only winning line, the player's other cells are checked again
+        counters['is_win'] = any(has_k_in_a_row(game, cell_row, cell_col, icon)
+                                 for cell_row, cells in enumerate(board)
+                                 for cell_col, cell in enumerate(cells) if cell == icon)
+
+
+def update_hash(game: dict[str, any], icon: str, row: int, col: int) -> None:
+    """
+    add the player's cell to the position's Zobrist hashes, or remove it
+    :param game: dictionary of the played game
+    :param icon: the icon of the cell's player
+    :param row: the row index of the cell
+    :param col: the column index of the cell
+    """
+    cols = len(game['board'][0])
+    keys = zobrist.get_zobrist_keys(len(game['board']), cols)[game['icons'].index(icon)]
+    game['zobrist'] = zobrist.toggle(game['zobrist'], keys[row * cols + col])
 
 
-def check_win(game: dict[str, any]) -> bool:
+def update_counters(game: dict[str, any], row: int, col: int) -> None:
     """
-    check the current board for win
-    :param game: dictionary of the  played game
+    add the played cell to the current player's line counters and mark a win when one of the lines is full
+    :param game:dictionary of the played game
+    :param row: the row index of the played cell
+    :param col: the column index of the played cell
+    """
+    n = len(game['board'])
+    counters = game['counters'][game['turn']]
+    counters['rows'][row] += 1
+    counters['columns'][col] += 1
+    is_win = counters['rows'][row] == n or counters['columns'][col] == n
+    if row == col:
+        counters['diagonal'] += 1
+        is_win = is_win or counters['diagonal'] == n
+    if row == n - 1 - col:
+        counters['anti_diagonal'] += 1
+        is_win = is_win or counters['anti_diagonal'] == n
+    if is_win:
+        counters['is_win'] = True
+
+
+def has_k_in_a_row(game: dict[str, any], row: int, col: int, icon: str = None) -> bool:
+    """
+    check only the lines through the played cell: count the player's cells next to it in the 4 directions,
+    up to k - 1 cells each way, so a move costs O(k) on any board
+    :param game: dictionary of the played game
+    :param row: the row index of the played cell
+    :param col: the column index of the played cell
+    :param icon: the cell's player, the current player by default
+    :return: True if the cell completes k cells in a row of the player, else return False
+    """
+    board, icon, k = game['board'], icon or game['turn'], game['k']
+    rows, cols = len(board), len(board[0])
+    for d_row, d_col in DIRECTIONS:
+        count = 1
+        for sign in (1, -1):
+            r, c = row + sign * d_row, col + sign * d_col
+            while count < k and 0 <= r < rows and 0 <= c < cols and board[r][c] == icon:
+                count += 1
+                r, c = r + sign * d_row, c + sign * d_col
+        if count >= k:
+            return True
+    return False
+
+
+def check_win(game: dict[str, any] | TicTacToeState) -> bool:
+    """
+    check the current board for win, using the win flag updated by set_square
+    :param game: dictionary of the  played game, or its compact state
     :return:True if there is a win, else return False
     """
-    return check_win_rows(game) or check_win_columns(game) or check_win_diagonals(game)
+    if isinstance(game, TicTacToeState):
+        return game.is_win()
+    return game['counters'][game['turn']]['is_win']
 
 
 def check_win_rows(game: dict[str, any]) -> bool:
@@ -257,45 +509,84 @@ def check_win_diagonals(game: dict[str, any]) -> bool:
     return d1 or d2
 
 
-def check_tie(game: dict[str, any]) -> bool:
+def check_tie(game: dict[str, any] | TicTacToeState) -> bool:
     """
-    :param game:dictionary of the played game
+    :param game:dictionary of the played game, or its compact state
     :return:True if there is a tie and the game is over, else return False
     """
+    if isinstance(game, TicTacToeState):
+        return game.is_tie()
     return len(game['moves']) == 0
 
 
-def switch_player(game: dict[str, any]) -> None:
+def switch_player(game: dict[str, any] | TicTacToeState) -> None:
     """
     switch the current player and update the game
-    :param game:dictionary of the played game
+    :param game:dictionary of the played game, or its compact state
     """
+    if isinstance(game, TicTacToeState):
+        game.switch_player()
+        return
     game['turn'] = 'O' if game['turn'] == 'X' else 'X'
 
 
-def play_tic_tac_toe() -> None:
+def save_stats(game: dict[str, any], is_tie: bool) -> None:
+    """
+    add the finished game to the players' stats and print the leaderboard,
+    the leaderboard (and sqlite3) is imported when the first game is over, never if the stats are off
+    :param game: dictionary of the finished game
+    :param is_tie: True if no one won, else the current player won
+    """
+    # GAMES_LEADERBOARD=0 (leaderboard.PATH_ENVIRONMENT), checked before the import
+    if os.environ.get('GAMES_LEADERBOARD') == '0':
+        return
+    from leaderboard import get_leaderboard, get_results, print_leaderboard
+    leaderboard = get_leaderboard()
+    if leaderboard is None:
+        return
+    results = get_results({icon: int(not is_tie and icon == game['turn']) for icon in game['icons']})
+    leaderboard.record_game(GAME_TYPE, [(game['players'][icon], results[icon], 0,
+                                         sum(row.count(icon) for row in game['board'])) for icon in game['icons']])
+    print_leaderboard(GAME_TYPE)
+
+
+def play_tic_tac_toe(render_mode: str = renderer.PLAIN, n: int = 3, cols_dimension: int = None,
+                     k: int = None) -> None:
     """
     manage the tic-tac-toe game flow
+    :param render_mode: how the board is drawn: renderer.PLAIN, renderer.ANSI or renderer.HEADLESS
+    :param n: diameter for the game nxn, the number of rows if cols_dimension is given
+    :param cols_dimension: number of columns in the board, n by default
+    :param k: number of cells in a row that win, by default the board's diameter, e.g. 15x15 with k=5 is gomoku
     """
     new_game = True;
     is_rematch = False
     my_game: dict[str, any] = {}
+    board_renderer = renderer.init_renderer(render_mode)
 
     while new_game or is_rematch:
         print("Let play Tic - Tac - Toe!!")
-        my_game = init_game(3, my_game, is_rematch)
+        instrumentation.increment('games')
+        my_game = init_game(n, my_game, is_rematch, cols_dimension=cols_dimension, k=k)
+        my_game['renderer'] = board_renderer
         get_players(my_game, is_rematch)
         print(f"The {my_game['turn']} starts first move")
         draw_board(my_game)
+        players_agents = get_agents(my_game)
         while True:
-            location = input_square(my_game)
+            agent = players_agents[my_game['turn']]
+            if not agent.is_human:
+                print("The computer will play his turn now:")
+            location = agents.get_move(agent, my_game)
             set_square(my_game, location)
             draw_board(my_game)
             if check_win(my_game):
                 print(f"The winner is:{my_game['players'][my_game['turn']]}!")
+                save_stats(my_game, is_tie=False)
                 break
             if check_tie(my_game):
                 print("Game over, no one won")
+                save_stats(my_game, is_tie=True)
                 break
             switch_player(my_game)
         is_rematch = get_valid_boolean_response("Do you want a rematch (y/n) ?", ('y', 'n'), 'y')
@@ -306,8 +597,11 @@ def play_tic_tac_toe() -> None:
         else:
             new_game = get_valid_boolean_response("Do you want to play a new game (y/n)?", ('y', 'n'), 'y')
     else:
+        renderer.close_renderer(board_renderer)
+        instrumentation.report()
         print("goodbye!")
 
 
 if __name__ == "__main__":
+    instrumentation.enable_from_environment()
     play_tic_tac_toe()
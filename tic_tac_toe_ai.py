@@ -0,0 +1,221 @@
+import time
+from collections import OrderedDict
+
+from tic_tac_toe_state import TicTacToeState
+from zobrist import get_symmetries
+
+WIN_SCORE = 1000
+# any score above this bound is a forced win/loss, the distance to the end of the game is kept in the score
+MATE_BOUND = WIN_SCORE // 2
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+DEFAULT_TIME_BUDGET = 1.0
+DEFAULT_TABLE_CAPACITY = 200_000
+
+class SearchTimeout(Exception):
+    """
+    raised inside the search when the time budget is over
+    """
+
+
+class TranspositionTable:
+    """
+    size capped table of searched positions, the least recently used position is evicted first
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TABLE_CAPACITY):
+        """
+        :param capacity: the maximum number of positions kept in the table
+        """
+        self.capacity = capacity
+        self.entries: OrderedDict[int, tuple[int, int, int, int]] = OrderedDict()
+
+    def get(self, key: int) -> tuple[int, int, int, int] | None:
+        """
+        :param key: the canonical Zobrist key of the position
+        :return: a tuple of (depth, value, flag, move) or None if the position is not in the table
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: int, depth: int, value: int, flag: int, move: int) -> None:
+        """
+        store the searched position, evict the least recently used position if the table is full
+        :param key: the canonical Zobrist key of the position
+        :param depth: the searched depth
+        :param value: the value of the position for the player to move
+        :param flag: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param move: the best move found, in the canonical cells numbering
+        """
+        self.entries[key] = (depth, value, flag, move)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+# a table for every board (rows, cols, k), shared between the computer's turns
+_tables: dict[tuple[int, int, int], TranspositionTable] = {}
+
+
+def evaluate(state: TicTacToeState) -> int:
+    """
+    heuristic value of a non final position for the player to move:
+    every line that is still open for only one player counts by the square of its stones
+    :param state: the game state
+    :return: the position's value, always smaller than a forced win
+    """
+    mine, theirs = state.masks[state.player], state.masks[state.player ^ 1]
+    score = 0
+    for line in state.lines:
+        if not line & theirs:
+            score += (mine & line).bit_count() ** 2
+        elif not line & mine:
+            score -= (theirs & line).bit_count() ** 2
+    return max(-MATE_BOUND + 1, min(MATE_BOUND - 1, score))
+
+
+class Search:
+    """
+    negamax search with alpha-beta pruning over a TicTacToeState, with a transposition table
+    """
+
+    def __init__(self, state: TicTacToeState, table: TranspositionTable, deadline: float):
+        """
+        :param state: the game state to search, it is restored when the search is over
+        :param table: transposition table of the board
+        :param deadline: time.perf_counter() value to stop the search at
+        """
+        # the table is keyed by the state's hashes, wrong hashes would mix the positions of the shared table
+        assert state.has_valid_hashes(), "the state's Zobrist hashes don't match its masks"
+        self.state = state
+        self.table = table
+        self.deadline = deadline
+        self.symmetries = get_symmetries(state.n, state.cols)
+        self.inverse_symmetries = [tuple(sorted(range(len(permutation)), key=permutation.__getitem__))
+                                   for permutation in self.symmetries]
+        # cells crossed by more lines are tried first
+        self.cells_order = sorted(range(state.n * state.cols), key=lambda cell: -len(state.cell_lines[cell]))
+        self.nodes = 0
+
+    def ordered_moves(self, table_move: int) -> list[int]:
+        """
+        :param table_move: the best move from the transposition table, or -1
+        :return: the available cells, the table's move first
+        """
+        occupied = self.state.occupied
+        moves = [cell for cell in self.cells_order if not occupied >> cell & 1]
+        if table_move in moves:
+            moves.remove(table_move)
+            moves.insert(0, table_move)
+        return moves
+
+    def negamax(self, depth: int, alpha: int, beta: int, ply: int) -> tuple[int, int]:
+        """
+        :param depth: remaining depth to search
+        :param alpha: lower bound of the wanted value
+        :param beta: upper bound of the wanted value
+        :param ply: distance from the root of the search
+        :return: a tuple of the position's value for the player to move, and the best move (-1 if none)
+        """
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        state = self.state
+        if depth == 0:
+            return evaluate(state), -1
+
+        key, symmetry = state.canonical_key()
+        permutation = self.symmetries[symmetry]
+        inverse = self.inverse_symmetries[symmetry]
+        table_move = -1
+        entry = self.table.get(key)
+        original_alpha = alpha
+        if entry is not None:
+            entry_depth, value, flag, canonical_move = entry
+            table_move = inverse[canonical_move] if canonical_move >= 0 else -1
+            if entry_depth >= depth:
+                value = value - ply if value > MATE_BOUND else value + ply if value < -MATE_BOUND else value
+                if flag == EXACT:
+                    return value, table_move
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, value)
+                elif flag == UPPER_BOUND:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value, table_move
+
+        player = state.player
+        best_value, best_move = -WIN_SCORE - 1, -1
+        for cell in self.ordered_moves(table_move):
+            state.place(cell)
+            if state.wins[player]:
+                value = WIN_SCORE - ply
+            elif state.is_tie():
+                value = 0
+            else:
+                state.switch_player()
+                try:
+                    value = -self.negamax(depth - 1, -beta, -alpha, ply + 1)[0]
+                finally:
+                    state.switch_player()
+            state.undo()
+            if value > best_value:
+                best_value, best_move = value, cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        flag = UPPER_BOUND if best_value <= original_alpha else LOWER_BOUND if best_value >= beta else EXACT
+        stored = best_value + ply if best_value > MATE_BOUND else best_value - ply if best_value < -MATE_BOUND else best_value
+        self.table.put(key, depth, stored, flag, permutation[best_move] if best_move >= 0 else -1)
+        return best_value, best_move
+
+
+def get_table(n: int, cols: int = None, k: int = None) -> TranspositionTable:
+    """
+    :param n: number of rows in the board
+    :param cols: number of columns in the board, n by default
+    :param k: number of cells in a row that win, the board's diameter by default
+    :return: the shared transposition table of the board
+    """
+    board = (n, cols or n, k or n)
+    if board not in _tables:
+        _tables[board] = TranspositionTable()
+    return _tables[board]
+
+
+def find_best_cell(state: TicTacToeState, time_budget: float = DEFAULT_TIME_BUDGET,
+                   table: TranspositionTable = None) -> int:
+    """
+    search deeper and deeper until the whole game is searched or the time budget is over
+    :param state: the game state, not changed by the search
+    :param time_budget: seconds to search for
+    :param table: transposition table to use, the shared table of the board by default
+    :return: the best cell index found
+    """
+    search = Search(state.copy(), table or get_table(state.n, state.cols, state.k), time.perf_counter() + time_budget)
+    empty_cells = state.n * state.cols - state.occupied.bit_count()
+    best_cell = search.ordered_moves(-1)[0]
+    for depth in range(1, empty_cells + 1):
+        try:
+            value, cell = search.negamax(depth, -WIN_SCORE - 1, WIN_SCORE + 1, 0)
+        except SearchTimeout:
+            break
+        best_cell = cell
+        if abs(value) > MATE_BOUND:
+            break
+    return best_cell
+
+
+def get_best_location(game: dict[str, any], time_budget: float = DEFAULT_TIME_BUDGET) -> list[int]:
+    """
+    :param game: dictionary of the played game
+    :param time_budget: seconds to search for
+    :return: list of 2 values, the best found cell for the current player
+    """
+    state = TicTacToeState.from_game(game)
+    return list(divmod(find_best_cell(state, time_budget), state.cols))
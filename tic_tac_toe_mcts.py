@@ -0,0 +1,422 @@
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+
+import seeded_random
+from tic_tac_toe_state import TicTacToeState
+
+DEFAULT_TIME_BUDGET = 1.0
+DEFAULT_WORKERS = 1
+EXPLORATION = math.sqrt(2)
+# the tree grows only with cells up to this distance from the placed cells, the rollouts play them first
+NEIGHBOURHOOD_RADIUS = 1
+TIE = -1
+
+# cache of the cells' neighbourhood masks by the board's (rows, cols)
+_neighbourhoods_cache: dict[tuple[int, int], tuple[int, ...]] = {}
+# the worker processes of the parallel searches, created on the first parallel search
+_executor: ProcessPoolExecutor | None = None
+# the number of the executor's worker processes
+_executor_workers = 0
+
+
+def get_neighbourhoods(n: int, cols: int, radius: int = NEIGHBOURHOOD_RADIUS) -> tuple[int, ...]:
+    """
+    :param n: number of rows in the board
+    :param cols: number of columns in the board
+    :param radius: the neighbourhood's distance in every direction
+    :return: a bit mask for every cell, of the cells up to radius rows and columns away from it
+    """
+    if (n, cols) not in _neighbourhoods_cache:
+        neighbourhoods = []
+        for row in range(n):
+            for col in range(cols):
+                neighbourhoods.append(sum(1 << (r * cols + c)
+                                          for r in range(max(0, row - radius), min(n, row + radius + 1))
+                                          for c in range(max(0, col - radius), min(cols, col + radius + 1))))
+        _neighbourhoods_cache[(n, cols)] = tuple(neighbourhoods)
+    return _neighbourhoods_cache[(n, cols)]
+
+
+def mask_cells(mask: int) -> list[int]:
+    """
+    :param mask: a bit mask of cells
+    :return: a list of the cells indexes in the mask
+    """
+    cells = []
+    while mask:
+        bit = mask & -mask
+        cells.append(bit.bit_length() - 1)
+        mask ^= bit
+    return cells
+
+
+class Node:
+    """
+    a node of the search tree: the position after the player placed the move,
+    wins are counted for that player, a tie counts as half a win
+    """
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'near', 'threats', 'visits', 'wins', 'winner')
+
+    def __init__(self, move: int, player: int, parent: 'Node | None', near: int, threats: int, winner: int | None):
+        """
+        :param move: the placed cell, -1 for a root
+        :param player: the index of the player that placed the move
+        :param parent: the parent node, None for a root
+        :param near: bit mask of the cells near the placed cells
+        :param threats: bit mask of the cells that complete a line of the player, some may be occupied since
+        :param winner: the player that won by this move, TIE if the board is full, None if the game isn't over
+        """
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children: list[Node] = []
+        self.untried: list[int] | None = None
+        self.near = near
+        self.threats = threats
+        self.visits = 0
+        self.wins = 0.0
+        self.winner = winner
+
+
+class MonteCarloSearch:
+    """
+    Monte Carlo tree search with UCT selection and random rollouts over the bit masks of a TicTacToeState
+    """
+
+    def __init__(self, state: TicTacToeState, rng: Random, root: Node = None):
+        """
+        :param state: the game state to search, it's not changed
+        :param rng: the random generator of the expansions and the rollouts
+        :param root: a tree of the same position from an earlier search, None - a new tree
+        """
+        self.masks = tuple(state.masks)
+        self.full_mask = state.full_mask
+        self.cell_lines = state.cell_lines
+        self.neighbourhoods = get_neighbourhoods(state.n, state.cols)
+        self.center = state.n // 2 * state.cols + state.cols // 2
+        self.rng = rng
+        # the root's threats of both players, the tree's nodes add the threats of their moves
+        self.root_threats = [get_threats(state.masks[player], state.masks[player ^ 1], state.lines)
+                             for player in (0, 1)]
+        if root is None:
+            near = 0
+            for cell in mask_cells(state.occupied):
+                near |= self.neighbourhoods[cell]
+            root = Node(-1, state.player ^ 1, None, near, self.root_threats[state.player ^ 1], None)
+        self.root = root
+        self.iterations = 0
+
+    def previous_threats(self, node: Node) -> int:
+        """
+        :param node: a node of the tree
+        :return: bit mask of the cells that complete a line of the player to move in the node's position
+        """
+        return node.parent.threats if node.parent is not None else self.root_threats[node.player ^ 1]
+
+    def candidates(self, node: Node, occupied: int) -> list[int]:
+        """
+        the moves are forced: a winning cell if there is one, else a cell that blocks the opponent's line
+        :param node: an expanded node
+        :param occupied: bit mask of the occupied cells in the node's position
+        :return: the empty cells near the placed cells, all the empty cells if there are none, the center if empty
+        """
+        free = self.full_mask & ~occupied
+        if not occupied:
+            return [self.center]
+        forced = self.previous_threats(node) & free or node.threats & free
+        if forced:
+            # the first blocking cell is as good as any other when the opponent has several
+            return mask_cells(forced & -forced)
+        return mask_cells(free & node.near or free)
+
+    def is_winning(self, mask: int, cell: int) -> bool:
+        """
+        :param mask: the player's cells, with the cell
+        :param cell: the last placed cell
+        :return: True if one of the lines through the cell is full
+        """
+        for line in self.cell_lines[cell]:
+            if mask & line == line:
+                return True
+        return False
+
+    def iterate(self) -> None:
+        """
+        one iteration: select a leaf by UCT, expand one untried cell, play a random rollout and update the path
+        """
+        node = self.root
+        masks = list(self.masks)
+        # selection
+        while node.winner is None:
+            if node.untried is None:
+                node.untried = self.candidates(node, masks[0] | masks[1])
+            if node.untried or not node.children:
+                break
+            node = self.select_child(node)
+            masks[node.player] |= 1 << node.move
+        # expansion
+        if node.winner is None and node.untried:
+            untried = node.untried
+            index = self.rng.randrange(len(untried))
+            untried[index], untried[-1] = untried[-1], untried[index]
+            move = untried.pop()
+            player = node.player ^ 1
+            mask = masks[player] | 1 << move
+            masks[player] = mask
+            if self.is_winning(mask, move):
+                winner = player
+            elif masks[0] | masks[1] == self.full_mask:
+                winner = TIE
+            else:
+                winner = None
+            threats = self.previous_threats(node)
+            for line in self.cell_lines[move]:
+                if not line & masks[player ^ 1]:
+                    rest = line & ~mask
+                    if rest and not rest & (rest - 1):
+                        threats |= rest
+            child = Node(move, player, node, node.near | self.neighbourhoods[move], threats, winner)
+            node.children.append(child)
+            node = child
+        # rollout
+        winner = node.winner if node.winner is not None else self.rollout(masks, node)
+        # backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner == node.player:
+                node.wins += 1
+            elif winner == TIE:
+                node.wins += 0.5
+            node = node.parent
+        self.iterations += 1
+
+    def select_child(self, node: Node) -> Node:
+        """
+        :param node: a fully expanded node
+        :return: the child with the best upper confidence bound (UCT)
+        """
+        log_visits = math.log(node.visits)
+        best, best_value = None, -1.0
+        for child in node.children:
+            value = child.wins / child.visits + EXPLORATION * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+    def rollout(self, masks: list[int], node: Node) -> int:
+        """
+        play till the game is over: a winning cell if there is one, else a cell that blocks the opponent's line,
+        else a random cell, the cells near the placed cells first
+        :param masks: the players' cells in the node's position, changed by the rollout
+        :param node: the rollout's node
+        :return: the winner's index, or TIE
+        """
+        player = node.player ^ 1
+        threats = [0, 0]
+        threats[player], threats[player ^ 1] = self.previous_threats(node), node.threats
+        occupied = masks[0] | masks[1]
+        free = self.full_mask & ~occupied
+        cells = mask_cells(free & node.near)
+        others = mask_cells(free & ~node.near)
+        self.rng.shuffle(cells)
+        self.rng.shuffle(others)
+        cells += others
+        cell_lines = self.cell_lines
+        index = 0
+        while occupied != self.full_mask:
+            if threats[player] & ~occupied:
+                return player
+            forced = threats[player ^ 1] & ~occupied
+            if forced:
+                cell = (forced & -forced).bit_length() - 1
+            else:
+                cell = cells[index]
+                while occupied >> cell & 1:
+                    index += 1
+                    cell = cells[index]
+            mask = masks[player] | 1 << cell
+            masks[player] = mask
+            occupied |= 1 << cell
+            opponent_mask = masks[player ^ 1]
+            for line in cell_lines[cell]:
+                if not line & opponent_mask:
+                    rest = line & ~mask
+                    if rest and not rest & (rest - 1):
+                        threats[player] |= rest
+            player ^= 1
+        return TIE
+
+    def run(self, time_budget: float = None, iterations: int = None) -> None:
+        """
+        :param time_budget: seconds to search for, None - no time limit
+        :param iterations: number of iterations, None - no iterations limit
+        :raise ValueError: if neither budget is given
+        """
+        validate_budget(time_budget, iterations)
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        for iteration in range(iterations) if iterations is not None else iter(int, 1):
+            # the clock is read once every 16 iterations
+            if deadline is not None and iteration & 15 == 0 and time.perf_counter() >= deadline:
+                break
+            self.iterate()
+
+    def root_visits(self) -> dict[int, int]:
+        """
+        :return: the number of visits of every searched cell
+        """
+        return {child.move: child.visits for child in self.root.children}
+
+
+def validate_budget(time_budget: float | None, iterations: int | None) -> None:
+    """
+    :param time_budget: seconds to search for, None - no time limit
+    :param iterations: number of iterations, None - no iterations limit
+    :raise ValueError: if neither budget is given, the search would never end
+    """
+    if time_budget is None and iterations is None:
+        raise ValueError("a search needs a time budget or an iterations budget")
+
+
+def get_threats(mask: int, opponent_mask: int, lines: tuple[int, ...]) -> int:
+    """
+    :param mask: the player's cells
+    :param opponent_mask: the opponent's cells
+    :param lines: the bit masks of the board's lines
+    :return: bit mask of the empty cells that complete a line of the player
+    """
+    threats = 0
+    for line in lines:
+        if not line & opponent_mask:
+            rest = line & ~mask
+            if rest and not rest & (rest - 1):
+                threats |= rest
+    return threats
+
+
+def find_immediate_cell(state: TicTacToeState) -> int | None:
+    """
+    :param state: the game state
+    :return: a cell that wins right away, else a cell that blocks the opponent's immediate win, else None
+    """
+    for player in (state.player, state.player ^ 1):
+        threats = get_threats(state.masks[player], state.masks[player ^ 1], state.lines)
+        if threats:
+            return (threats & -threats).bit_length() - 1
+    return None
+
+
+def search_worker(cells: tuple[int, ...], player: int, board: tuple[int, int, int], time_budget: float | None,
+                  iterations: int | None, seed: int) -> dict[int, int]:
+    """
+    run an independent search in a worker process
+    :param cells: the value of every cell, see TicTacToeState.from_cells
+    :param player: the index of the player to move
+    :param board: the board's (rows, cols, k)
+    :param time_budget: seconds to search for
+    :param iterations: number of iterations
+    :param seed: seed of the worker's random generator
+    :return: the number of visits of every searched cell
+    """
+    state = TicTacToeState.from_cells(board[0], cells, player, cols=board[1], k=board[2])
+    search = MonteCarloSearch(state, seeded_random.make_rng(seed))
+    search.run(time_budget, iterations)
+    return search.root_visits()
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    :param workers: number of worker processes
+    :return: the shared pool of worker processes, created again if the number of workers changed
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = ProcessPoolExecutor(workers)
+        _executor_workers = workers
+    return _executor
+
+
+def find_best_cell(state: TicTacToeState, time_budget: float | None = DEFAULT_TIME_BUDGET,
+                   iterations: int = None, workers: int = DEFAULT_WORKERS, rng: Random = None,
+                   root: Node = None) -> tuple[int, Node]:
+    """
+    search the state with the time and/or iterations budget, the most visited cell is the best.
+    with several workers, every worker process searches its own tree and the cells' visits are summed
+    :param state: the game state, not changed by the search
+    :param time_budget: seconds to search for, None - only the iterations budget
+    :param iterations: number of iterations of every worker, None - only the time budget
+    :param workers: number of searching processes, 1 - search in this process only
+    :param rng: the random generator of the search, the shared default generator by default
+    :param root: a tree of the same position from an earlier search, None - a new tree
+    :return: a tuple of the best cell and the searched tree
+    :raise ValueError: if neither budget is given
+    """
+    validate_budget(time_budget, iterations)
+    rng = seeded_random.get_rng(rng)
+    futures = []
+    if workers > 1:
+        executor = get_executor(workers - 1)
+        board = (state.n, state.cols, state.k)
+        first, second = state.masks
+        cells = tuple((first >> cell & 1) | (second >> cell & 1) << 1 for cell in range(state.n * state.cols))
+        futures = [executor.submit(search_worker, cells, state.player, board, time_budget, iterations,
+                                   rng.getrandbits(64)) for _ in range(workers - 1)]
+    search = MonteCarloSearch(state, rng, root)
+    search.run(time_budget, iterations)
+    visits = search.root_visits()
+    for future in futures:
+        for cell, cell_visits in future.result().items():
+            visits[cell] = visits.get(cell, 0) + cell_visits
+    if not visits:
+        return search.candidates(search.root, state.occupied)[0], search.root
+    return max(visits, key=visits.get), search.root
+
+
+def reuse_tree(game: dict[str, any], state: TicTacToeState) -> Node | None:
+    """
+    find the node of the current position in the tree kept from the computer's last turn,
+    by following the cells placed since then
+    :param game: dictionary of the played game
+    :param state: the current game state
+    :return: the node of the current position, or None if it's not in the tree
+    """
+    tree = game.get('mcts_tree')
+    if tree is None:
+        return None
+    node, masks = tree
+    if masks[0] & ~state.masks[0] or masks[1] & ~state.masks[1]:
+        return None
+    placed = [state.masks[0] & ~masks[0], state.masks[1] & ~masks[1]]
+    while placed[0] | placed[1]:
+        node = next((child for child in node.children if placed[child.player] >> child.move & 1), None)
+        if node is None:
+            return None
+        placed[node.player] &= ~(1 << node.move)
+    if node.player != state.player ^ 1:
+        return None
+    node.parent = None
+    return node
+
+
+def get_mcts_location(game: dict[str, any], time_budget: float | None = DEFAULT_TIME_BUDGET,
+                      iterations: int = None, workers: int = DEFAULT_WORKERS) -> list[int]:
+    """
+    select the computer's cell by a Monte Carlo tree search, the searched tree is kept in the game for the next turn
+    :param game: dictionary of the played game
+    :param time_budget: seconds to search for, None - only the iterations budget
+    :param iterations: number of iterations, None - only the time budget
+    :param workers: number of searching processes
+    :return: list of 2 values, the best found cell for the current player
+    :raise ValueError: if neither budget is given
+    """
+    state = TicTacToeState.from_game(game)
+    cell = find_immediate_cell(state)
+    if cell is None:
+        cell, root = find_best_cell(state, time_budget, iterations, workers, game.get('rng'), reuse_tree(game, state))
+        chosen = next((child for child in root.children if child.move == cell), None)
+        state.place(cell)
+        game['mcts_tree'] = (chosen, tuple(state.masks)) if chosen is not None else None
+    return list(divmod(cell, state.cols))
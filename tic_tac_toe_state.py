@@ -0,0 +1,228 @@
+import zobrist
+
+EMPTY_CELL = '_'
+# the directions of the winning lines: row, column, diagonal and anti diagonal
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# cache of the precomputed line masks by the board's (rows, cols, k)
+_line_masks_cache: dict[tuple[int, int, int], tuple[tuple[int, ...], tuple[tuple[int, ...], ...]]] = {}
+
+
+def get_line_masks(n: int, cols: int = None, k: int = None) -> tuple[tuple[int, ...], tuple[tuple[int, ...], ...]]:
+    """
+    build (once for every board) the bit masks of all the winning lines on a n x cols board:
+    every k cells in a row, a column or a diagonal, cell (row,col) is the bit number row * cols + col.
+    on a nxn board with k = n the lines are every row, every column and both diagonals
+    :param n: number of rows in the board
+    :param cols: number of columns in the board, n by default
+    :param k: number of cells in a row that win, the board's diameter by default
+    :return: a tuple of all the line masks, and a tuple of the line masks passing through each cell
+    """
+    cols = cols or n
+    k = k or n
+    if (n, cols, k) not in _line_masks_cache:
+        lines = []
+        for d_row, d_col in DIRECTIONS:
+            for row in range(n):
+                for col in range(cols):
+                    end_row, end_col = row + d_row * (k - 1), col + d_col * (k - 1)
+                    if end_row < n and 0 <= end_col < cols:
+                        lines.append(sum(1 << ((row + d_row * i) * cols + col + d_col * i) for i in range(k)))
+        lines = tuple(lines)
+        cell_lines = tuple(tuple(line for line in lines if line >> cell & 1) for cell in range(n * cols))
+        _line_masks_cache[(n, cols, k)] = (lines, cell_lines)
+    return _line_masks_cache[(n, cols, k)]
+
+
+class TicTacToeState:
+    """
+    compact Tic - Tac - Toe game state: every player's cells are kept as an integer bit mask,
+    wins are checked against the precomputed line masks of the played cell,
+    the Zobrist hashes of the board's symmetries are updated by every placed and taken back cell
+    """
+    __slots__ = ('n', 'cols', 'k', 'icons', 'masks', 'player', 'full_mask', 'lines', 'cell_lines', 'history',
+                 'wins', 'zobrist_keys', 'hashes')
+
+    def __init__(self, n: int, icons: tuple[str, str] = ('X', 'O'), cols: int = None, k: int = None):
+        """
+        :param n: number of rows in the board
+        :param icons: a tuple of the players' icons, the first one starts the game
+        :param cols: number of columns in the board, n by default
+        :param k: number of cells in a row that win, the board's diameter by default
+        """
+        self.n = n
+        self.cols = cols or n
+        self.k = k or n
+        self.icons = icons
+        self.masks = [0, 0]
+        self.player = 0
+        self.full_mask = (1 << (n * self.cols)) - 1
+        self.lines, self.cell_lines = get_line_masks(n, self.cols, self.k)
+        self.history: list[int] = []
+        self.wins = [False, False]
+        self.zobrist_keys = zobrist.get_zobrist_keys(n, self.cols)
+        self.hashes = zobrist.empty_hashes(n, self.cols)
+
+    @classmethod
+    def from_cells(cls, n: int, cells: list[int], player: int, icons: tuple[str, str] = ('X', 'O'), cols: int = None,
+                   k: int = None) -> 'TicTacToeState':
+        """
+        build a state from the cells' values, the masks, the wins and the Zobrist hashes are all derived from them
+        :param n: number of rows in the board
+        :param cells: the value of every cell by its index (row * cols + col): 0 - empty cell, 1 - the first player,
+        2 - the second player
+        :param player: the index of the player to move
+        :param icons: a tuple of the players' icons
+        :param cols: number of columns in the board, n by default
+        :param k: number of cells in a row that win, the board's diameter by default
+        :return: a new state of the position
+        """
+        state = cls(n, icons, cols, k)
+        for cell, value in enumerate(cells):
+            if value:
+                state.masks[value - 1] |= 1 << cell
+                state.history.append(cell)
+        state.hashes = zobrist.hash_masks(state.masks, n, state.cols)
+        state.wins = [state.has_line(0), state.has_line(1)]
+        state.player = player
+        return state
+
+    @classmethod
+    def from_game(cls, game: dict[str, any]) -> 'TicTacToeState':
+        """
+        build a state from a dictionary of a played game
+        :param game: dictionary of the played game
+        :return: a new state with the same board and turn
+        """
+        board = game['board']
+        icons = game['icons']
+        cells = [0 if cell == EMPTY_CELL else icons.index(cell) + 1 for row in board for cell in row]
+        return cls.from_cells(len(board), cells, icons.index(game['turn']), icons, len(board[0]), game['k'])
+
+    @property
+    def turn(self) -> str:
+        """
+        :return: the icon of the current player
+        """
+        return self.icons[self.player]
+
+    @property
+    def occupied(self) -> int:
+        """
+        :return: a bit mask of all the occupied cells
+        """
+        return self.masks[0] | self.masks[1]
+
+    def copy(self) -> 'TicTacToeState':
+        """
+        :return: a new state with the same board, turn and history
+        """
+        state = TicTacToeState.__new__(TicTacToeState)
+        state.n = self.n
+        state.cols = self.cols
+        state.k = self.k
+        state.icons = self.icons
+        state.masks = self.masks[:]
+        state.player = self.player
+        state.full_mask = self.full_mask
+        state.lines = self.lines
+        state.cell_lines = self.cell_lines
+        state.history = self.history[:]
+        state.wins = self.wins[:]
+        state.zobrist_keys = self.zobrist_keys
+        state.hashes = self.hashes
+        return state
+
+    def place(self, cell: int) -> None:
+        """
+        put the current player's icon in the cell, and check only the lines passing through it for a win
+        :param cell: the cell index, row * cols + col
+        """
+        mask = self.masks[self.player] | 1 << cell
+        self.masks[self.player] = mask
+        self.history.append(cell)
+        self.hashes = zobrist.toggle(self.hashes, self.zobrist_keys[self.player][cell])
+        if not self.wins[self.player]:
+            for line in self.cell_lines[cell]:
+                if mask & line == line:
+                    self.wins[self.player] = True
+                    break
+
+    def undo(self) -> None:
+        """
+        take back the last placed cell, the turn is not changed
+        """
+        cell = self.history.pop()
+        bit = 1 << cell
+        player = 0 if self.masks[0] & bit else 1
+        self.masks[player] &= ~bit
+        self.hashes = zobrist.toggle(self.hashes, self.zobrist_keys[player][cell])
+        if self.wins[player]:
+            self.wins[player] = self.has_line(player)
+
+    def canonical_key(self) -> tuple[int, int]:
+        """
+        :return: the Zobrist key of the position and the player to move, the same for all its rotations and
+        reflections, and the index of the symmetry that gives it, see zobrist.canonical_hash
+        """
+        return zobrist.canonical_hash(self.hashes, self.player)
+
+    def has_valid_hashes(self) -> bool:
+        """
+        :return: True if the Zobrist hashes are the hashes of the masks, a state whose masks were set without place()
+        has wrong hashes, and its positions would be mixed with other positions in a transposition table
+        """
+        return self.hashes == zobrist.hash_masks(self.masks, self.n, self.cols)
+
+    def has_line(self, player: int) -> bool:
+        """
+        :param player: the player's index in icons
+        :return: True if the player owns one of the full lines, else return False
+        """
+        mask = self.masks[player]
+        return any(mask & line == line for line in self.lines)
+
+    def is_win(self) -> bool:
+        """
+        :return:True if the current player has a full line, else return False
+        """
+        return self.wins[self.player]
+
+    def is_tie(self) -> bool:
+        """
+        :return:True if there are no available cells left, else return False
+        """
+        return self.occupied == self.full_mask
+
+    def switch_player(self) -> None:
+        """
+        switch the current player
+        """
+        self.player ^= 1
+
+    def legal_cells(self) -> list[int]:
+        """
+        :return: a list of the available cells indexes
+        """
+        free = self.full_mask & ~self.occupied
+        cells = []
+        while free:
+            bit = free & -free
+            cells.append(bit.bit_length() - 1)
+            free ^= bit
+        return cells
+
+    def rows(self) -> list[list[str]]:
+        """
+        :return: the board as a nested list of strings in size of n x cols, like the board of the game dictionary
+        """
+        x_mask, o_mask = self.masks
+        x_icon, o_icon = self.icons
+        board = []
+        for row in range(self.n):
+            cells = []
+            for col in range(self.cols):
+                bit = 1 << (row * self.cols + col)
+                cells.append(x_icon if x_mask & bit else o_icon if o_mask & bit else EMPTY_CELL)
+            board.append(cells)
+        return board
@@ -0,0 +1,146 @@
+# Zobrist hashing of tic-tac-toe positions: every (player, cell) has a fixed random 64 bit key and a position's hash is
+# the XOR of the keys of its placed cells, so placing or taking back a cell updates it by one XOR.
+# a position keeps a hash for every symmetry of the board (the 8 rotations and reflections of a square board,
+# 4 of a rectangular board): hashes[s] is the hash of the position moved by get_symmetries()[s],
+# so the canonical hash, the same for all the symmetric positions, is the smallest of them, without moving any cell
+from operator import xor
+from random import Random
+
+KEY_BITS = 64
+# the keys are the same in every run, so the hashes can be stored, e.g. in a position database
+ZOBRIST_SEED = 'tic_tac_toe zobrist'
+
+# cache of the cells' permutations by the board's (rows, cols)
+_symmetries_cache: dict[tuple[int, int], tuple[tuple[int, ...], ...]] = {}
+# cache of the cells' keys by the board's (rows, cols)
+_keys_cache: dict[tuple[int, int], tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, ...], ...]]] = {}
+# the key of the second player's turn, the first player's turn has no key
+SIDE_KEY = Random(f"{ZOBRIST_SEED} side").getrandbits(KEY_BITS)
+
+
+def get_symmetries(n: int, cols: int = None) -> tuple[tuple[int, ...], ...]:
+    """
+    build (once for every board) the 8 rotations and reflections of a nxn board,
+    a rectangular board keeps only the 4 symmetries that don't swap the rows and the columns
+    :param n: number of rows in the board
+    :param cols: number of columns in the board, n by default
+    :return: a tuple of the permutations, permutation[cell] is the cell's index after the symmetry
+    """
+    cols = cols or n
+    if (n, cols) not in _symmetries_cache:
+        transforms = (
+            lambda r, c: (r, c),
+            lambda r, c: (c, n - 1 - r),
+            lambda r, c: (n - 1 - r, cols - 1 - c),
+            lambda r, c: (n - 1 - c, r),
+            lambda r, c: (r, cols - 1 - c),
+            lambda r, c: (n - 1 - r, c),
+            lambda r, c: (c, r),
+            lambda r, c: (n - 1 - c, n - 1 - r),
+        )
+        if n != cols:
+            # the rotations by 90 degrees and the transpositions swap the rows and the columns
+            transforms = (transforms[0], transforms[2], transforms[4], transforms[5])
+        permutations = []
+        for transform in transforms:
+            permutation = []
+            for cell in range(n * cols):
+                row, col = transform(*divmod(cell, cols))
+                permutation.append(row * cols + col)
+            permutations.append(tuple(permutation))
+        _symmetries_cache[(n, cols)] = tuple(permutations)
+    return _symmetries_cache[(n, cols)]
+
+
+def get_zobrist_keys(rows: int, cols: int = None) -> tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, ...], ...]]:
+    """
+    build (once for every board) the keys of the players' cells
+    :param rows: number of rows in the board
+    :param cols: number of columns in the board, rows by default
+    :return: keys[player][cell], the player's index in the icons and cell = row * cols + col,
+    a tuple of the cell's key in every symmetry, to XOR into the hashes of the symmetries
+    """
+    cols = cols or rows
+    if (rows, cols) not in _keys_cache:
+        rng = Random(f"{ZOBRIST_SEED} {rows}x{cols}")
+        size = rows * cols
+        keys = [[rng.getrandbits(KEY_BITS) for _ in range(size)] for _ in range(2)]
+        symmetries = get_symmetries(rows, cols)
+        _keys_cache[(rows, cols)] = tuple(
+            tuple(tuple(player_keys[permutation[cell]] for permutation in symmetries) for cell in range(size))
+            for player_keys in keys)
+    return _keys_cache[(rows, cols)]
+
+
+def empty_hashes(rows: int, cols: int = None) -> tuple[int, ...]:
+    """
+    :param rows: number of rows in the board
+    :param cols: number of columns in the board, rows by default
+    :return: the hashes of the empty board, one for every symmetry
+    """
+    return (0,) * len(get_symmetries(rows, cols or rows))
+
+
+def toggle(hashes: tuple[int, ...], cell_keys: tuple[int, ...]) -> tuple[int, ...]:
+    """
+    place a cell, or take it back: XOR is its own inverse
+    :param hashes: the position's hashes
+    :param cell_keys: the player's cell's keys, get_zobrist_keys(rows, cols)[player][cell]
+    :return: the hashes of the position with the cell placed/removed
+    """
+    return tuple(map(xor, hashes, cell_keys))
+
+
+def hash_board(board: list[list[str]], icons: tuple[str, str]) -> tuple[int, ...]:
+    """
+    hash a whole board from scratch, e.g. a restored game
+    :param board: nested list of the cells' icons, '_' for an empty cell
+    :param icons: the players' icons, by their index
+    :return: the board's hashes, one for every symmetry
+    """
+    rows, cols = len(board), len(board[0])
+    keys = get_zobrist_keys(rows, cols)
+    hashes = empty_hashes(rows, cols)
+    for row_index, row in enumerate(board):
+        for col_index, icon in enumerate(row):
+            if icon in icons:
+                hashes = toggle(hashes, keys[icons.index(icon)][row_index * cols + col_index])
+    return hashes
+
+
+def hash_masks(masks: list[int], rows: int, cols: int = None) -> tuple[int, ...]:
+    """
+    hash the players' bit masks from scratch, e.g. to build or check a TicTacToeState
+    :param masks: the bit mask of every player's cells, by the player's index, cell = row * cols + col
+    :param rows: number of rows in the board
+    :param cols: number of columns in the board, rows by default
+    :return: the position's hashes, one for every symmetry
+    """
+    keys = get_zobrist_keys(rows, cols)
+    hashes = empty_hashes(rows, cols)
+    for player, mask in enumerate(masks):
+        while mask:
+            bit = mask & -mask
+            hashes = toggle(hashes, keys[player][bit.bit_length() - 1])
+            mask ^= bit
+    return hashes
+
+
+def canonical_hash(hashes: tuple[int, ...], player: int = 0) -> tuple[int, int]:
+    """
+    :param hashes: the position's hashes
+    :param player: the index of the player to move
+    :return: the position's key, the same for all its symmetries, and the index of the symmetry that gives it:
+    a cell is numbered permutation[cell] in the canonical position, permutation = get_symmetries(rows, cols)[index]
+    """
+    key = min(hashes)
+    return key ^ SIDE_KEY if player else key, hashes.index(key)
+
+
+def get_position_key(game: dict[str, any]) -> int:
+    """
+    :param game: dictionary of the played tic-tac-toe game
+    :return: one integer for the position and the player to move, the same for all its rotations and reflections,
+    a key of caches and position databases
+    """
+    return canonical_hash(game['zobrist'], game['icons'].index(game['turn']))[0]